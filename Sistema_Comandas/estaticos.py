@@ -0,0 +1,74 @@
+"""
+Archivos estáticos.
+
+- WhiteNoiseAsyncMiddleware: WhiteNoiseMiddleware solo es sincrónico; bajo
+  ASGI Django lo envuelve en un hilo y cada petición (también las vistas
+  asíncronas) ocupa ese hilo hasta terminar. Esta subclase atiende los
+  estáticos igual que WhiteNoise y deja pasar el resto de las peticiones sin
+  salir del event loop.
+- EstaticosMinificados: el almacenamiento de collectstatic. Minifica el JS
+  propio del proyecto y luego hace lo mismo que
+  CompressedManifestStaticFilesStorage: nombres con hash del contenido (que
+  WhiteNoise sirve como inmutables) y variantes comprimidas .gz/.br.
+"""
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.core.files.base import ContentFile
+from whitenoise.middleware import WhiteNoiseMiddleware
+from whitenoise.storage import CompressedManifestStaticFilesStorage
+
+try:
+    import rjsmin
+except ImportError:  # Dependencia opcional: sin ella el JS se publica sin minificar
+    rjsmin = None
+
+# Carpetas con el JS del proyecto (el de terceros y el admin ya viene minificado)
+CARPETAS_JS = ('cocina/js/', 'garzon/js/', 'gerencia/js/')
+
+
+class WhiteNoiseAsyncMiddleware(WhiteNoiseMiddleware):
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response=None, **kwargs):
+        super().__init__(get_response, **kwargs)
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        return super().__call__(request)
+
+    async def __acall__(self, request):
+        if self.autorefresh:
+            static_file = await sync_to_async(self.find_file)(request.path_info)
+        else:
+            static_file = self.files.get(request.path_info)
+        if static_file is not None:
+            return await sync_to_async(self.serve)(static_file, request)
+        return await self.get_response(request)
+
+
+def debe_minificar(nombre):
+    return nombre.startswith(CARPETAS_JS) and nombre.endswith('.js') and not nombre.endswith('.min.js')
+
+
+class EstaticosMinificados(CompressedManifestStaticFilesStorage):
+    def post_process(self, paths, dry_run=False, **options):
+        # Se minifica la copia ya recolectada antes de calcular el hash, y el
+        # hash se calcula desde esa copia (no desde el original de la app)
+        if not dry_run and rjsmin is not None:
+            paths = dict(paths)
+            for nombre in paths:
+                if debe_minificar(nombre):
+                    self.minificar(nombre)
+                    paths[nombre] = (self, nombre)
+        yield from super().post_process(paths, dry_run=dry_run, **options)
+
+    def minificar(self, nombre):
+        with self.open(nombre) as archivo:
+            original = archivo.read().decode('utf-8')
+        minificado = rjsmin.jsmin(original)
+        if minificado != original:
+            self.delete(nombre)
+            self._save(nombre, ContentFile(minificado.encode('utf-8')))
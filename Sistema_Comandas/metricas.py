@@ -0,0 +1,198 @@
+"""
+Métricas por vista (latencia, tiempo en base de datos y cantidad de consultas).
+
+MetricasMiddleware acumula histogramas en memoria del proceso y la vista
+`metricas` los expone en formato de texto compatible con Prometheus. Cada
+proceso del servidor lleva sus propios contadores.
+"""
+import threading
+import time
+from bisect import bisect_left
+from contextlib import ExitStack
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.db import connections
+from django.http import HttpResponse, HttpResponseForbidden
+
+# Límites superiores de cada bucket
+BUCKETS_SEGUNDOS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+BUCKETS_CONSULTAS = (0, 1, 2, 5, 10, 20, 50, 100, 200, 500)
+
+
+class Histograma:
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.conteos = [0] * (len(buckets) + 1)  # El último es +Inf
+        self.suma = 0.0
+        self.total = 0
+
+    def observar(self, valor):
+        self.conteos[bisect_left(self.buckets, valor)] += 1
+        self.suma += valor
+        self.total += 1
+
+
+class RegistroMetricas:
+    """
+    Contadores e histogramas por vista, protegidos por un lock
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._duracion = {}
+        self._db = {}
+        self._consultas = {}
+        self._peticiones = {}
+
+    def observar(self, vista, metodo, estado, duracion, tiempo_db, consultas):
+        clave = (vista, metodo)
+        with self._lock:
+            if clave not in self._duracion:
+                self._duracion[clave] = Histograma(BUCKETS_SEGUNDOS)
+                self._db[clave] = Histograma(BUCKETS_SEGUNDOS)
+                self._consultas[clave] = Histograma(BUCKETS_CONSULTAS)
+            self._duracion[clave].observar(duracion)
+            self._db[clave].observar(tiempo_db)
+            self._consultas[clave].observar(consultas)
+            clave_estado = (vista, metodo, f'{estado // 100}xx')
+            self._peticiones[clave_estado] = self._peticiones.get(clave_estado, 0) + 1
+
+    def reiniciar(self):
+        with self._lock:
+            self._duracion.clear()
+            self._db.clear()
+            self._consultas.clear()
+            self._peticiones.clear()
+
+    def exportar(self):
+        """
+        Texto en formato de exposición de Prometheus
+        """
+        with self._lock:
+            lineas = []
+            self._exportar_contador(lineas)
+            self._exportar_histograma(
+                lineas, 'comandas_http_request_duration_seconds',
+                'Duración de las peticiones por vista', self._duracion
+            )
+            self._exportar_histograma(
+                lineas, 'comandas_http_request_db_seconds',
+                'Tiempo en base de datos por petición', self._db
+            )
+            self._exportar_histograma(
+                lineas, 'comandas_http_request_queries',
+                'Consultas SQL por petición', self._consultas
+            )
+        return '\n'.join(lineas) + '\n'
+
+    def _exportar_contador(self, lineas):
+        nombre = 'comandas_http_requests_total'
+        lineas.append(f'# HELP {nombre} Peticiones atendidas por vista')
+        lineas.append(f'# TYPE {nombre} counter')
+        for (vista, metodo, estado), valor in sorted(self._peticiones.items()):
+            lineas.append(f'{nombre}{{{_etiquetas(vista=vista, metodo=metodo, estado=estado)}}} {valor}')
+
+    def _exportar_histograma(self, lineas, nombre, ayuda, histogramas):
+        lineas.append(f'# HELP {nombre} {ayuda}')
+        lineas.append(f'# TYPE {nombre} histogram')
+        for (vista, metodo), histograma in sorted(histogramas.items()):
+            etiquetas = _etiquetas(vista=vista, metodo=metodo)
+            acumulado = 0
+            for limite, conteo in zip(histograma.buckets, histograma.conteos):
+                acumulado += conteo
+                lineas.append(f'{nombre}_bucket{{{etiquetas},le="{limite}"}} {acumulado}')
+            lineas.append(f'{nombre}_bucket{{{etiquetas},le="+Inf"}} {histograma.total}')
+            lineas.append(f'{nombre}_sum{{{etiquetas}}} {histograma.suma}')
+            lineas.append(f'{nombre}_count{{{etiquetas}}} {histograma.total}')
+
+
+def _etiquetas(**valores):
+    def escapar(valor):
+        return str(valor).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+    return ','.join(f'{clave}="{escapar(valor)}"' for clave, valor in valores.items())
+
+
+registro = RegistroMetricas()
+
+
+class _MedidorDB:
+    """
+    execute_wrapper que cuenta las consultas y el tiempo que pasan en la base de datos
+    """
+
+    def __init__(self):
+        self.consultas = 0
+        self.tiempo = 0.0
+
+    def __call__(self, execute, sql, params, many, context):
+        inicio = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.tiempo += time.perf_counter() - inicio
+            self.consultas += 1
+
+
+class MetricasMiddleware:
+    """
+    Registra por vista resuelta (ej. 'garzon:garzon_home') la duración,
+    el tiempo en base de datos y la cantidad de consultas de cada petición.
+    Funciona tanto bajo WSGI como bajo ASGI con vistas asíncronas.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+
+        medidor = _MedidorDB()
+        inicio = time.perf_counter()
+        with ExitStack() as stack:
+            _medir_conexiones(stack, medidor)
+            response = self.get_response(request)
+        self._registrar(request, response, inicio, medidor)
+        return response
+
+    async def __acall__(self, request):
+        medidor = _MedidorDB()
+        inicio = time.perf_counter()
+        with ExitStack() as stack:
+            # El ORM asíncrono ejecuta las consultas en el hilo sincrónico de la
+            # petición; las conexiones se envuelven en ese mismo hilo
+            await sync_to_async(_medir_conexiones)(stack, medidor)
+            try:
+                response = await self.get_response(request)
+            finally:
+                await sync_to_async(stack.close)()
+        self._registrar(request, response, inicio, medidor)
+        return response
+
+    def _registrar(self, request, response, inicio, medidor):
+        duracion = time.perf_counter() - inicio
+        match = getattr(request, 'resolver_match', None)
+        vista = match.view_name if match else 'sin_ruta'
+        registro.observar(vista, request.method, response.status_code, duracion, medidor.tiempo, medidor.consultas)
+
+
+def _medir_conexiones(stack, medidor):
+    for alias in connections:
+        stack.enter_context(connections[alias].execute_wrapper(medidor))
+
+
+def metricas(request):
+    """
+    Exposición de métricas para Prometheus. Solo para staff, o con
+    'Authorization: Bearer <METRICAS_TOKEN>' si el token está configurado.
+    """
+    token = getattr(settings, 'METRICAS_TOKEN', '')
+    autorizado_por_token = token and request.headers.get('Authorization') == f'Bearer {token}'
+    if not autorizado_por_token and not request.user.is_staff:
+        return HttpResponseForbidden()
+    return HttpResponse(registro.exportar(), content_type='text/plain; version=0.0.4; charset=utf-8')
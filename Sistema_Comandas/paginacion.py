@@ -0,0 +1,114 @@
+"""
+Paginación por cursor (keyset) para listados que crecen sin límite.
+
+En vez de OFFSET, cada página continúa desde los valores de orden de la
+última fila vista (ej. fecha_cambio e id), así el costo de una página
+depende de su tamaño y no de cuántas filas hay antes. El orden debe
+terminar en un campo único (id) y estar respaldado por un índice.
+"""
+import base64
+import json
+from functools import reduce
+from operator import or_
+
+from django.core.exceptions import ValidationError
+from django.db.models import Q
+
+TAMANO_PAGINA = 50
+
+
+class Pagina:
+    """
+    Filas de una página y cursores para la siguiente y la anterior
+    """
+
+    def __init__(self, objetos, cursor_siguiente=None, cursor_anterior=None):
+        self.objetos = objetos
+        self.cursor_siguiente = cursor_siguiente
+        self.cursor_anterior = cursor_anterior
+
+    def __iter__(self):
+        return iter(self.objetos)
+
+    def __len__(self):
+        return len(self.objetos)
+
+    def __bool__(self):
+        return bool(self.objetos)
+
+
+def codificar_cursor(valores):
+    texto = json.dumps([v.isoformat() if hasattr(v, 'isoformat') else v for v in valores])
+    return base64.urlsafe_b64encode(texto.encode()).decode().rstrip('=')
+
+
+def decodificar_cursor(cursor, modelo, campos):
+    """
+    Valores del cursor convertidos al tipo de cada campo; None si no es válido
+    """
+    try:
+        texto = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4)).decode()
+        valores = json.loads(texto)
+        if not isinstance(valores, list) or len(valores) != len(campos):
+            return None
+        return [modelo._meta.get_field(campo).to_python(valor) for campo, valor in zip(campos, valores)]
+    except (ValueError, TypeError, ValidationError):
+        return None
+
+
+def _posteriores(campos, valores, descendente):
+    """
+    Condición "viene después de (valores)" en el orden dado, ej. para
+    (fecha, id) descendente: fecha < f OR (fecha = f AND id < i)
+    """
+    comparador = 'lt' if descendente else 'gt'
+    condiciones = []
+    for i, campo in enumerate(campos):
+        iguales = {campos[j]: valores[j] for j in range(i)}
+        condiciones.append(Q(**iguales, **{f'{campo}__{comparador}': valores[i]}))
+    return reduce(or_, condiciones)
+
+
+def _valores_de(objeto, campos):
+    if isinstance(objeto, dict):
+        return [objeto[campo] for campo in campos]
+    return [getattr(objeto, campo) for campo in campos]
+
+
+def paginar(queryset, orden, despues=None, antes=None, tamano=TAMANO_PAGINA):
+    """
+    Devuelve una Pagina de queryset ordenado por `orden`, ej.
+    ('-fecha_cambio', '-id'). `despues`/`antes` son cursores de una página
+    anterior; un cursor inválido se trata como la primera página.
+    """
+    descendente = orden[0].startswith('-')
+    campos = [campo.lstrip('-') for campo in orden]
+    modelo = queryset.model
+
+    valores_despues = decodificar_cursor(despues, modelo, campos) if despues else None
+    valores_antes = decodificar_cursor(antes, modelo, campos) if antes else None
+
+    if valores_antes is not None:
+        # Hacia atrás: se recorre en orden inverso y se da vuelta el resultado
+        inverso = [campo[1:] if campo.startswith('-') else f'-{campo}' for campo in orden]
+        filas = list(
+            queryset.filter(_posteriores(campos, valores_antes, not descendente)).order_by(*inverso)[:tamano + 1]
+        )
+        hay_mas = len(filas) > tamano
+        filas = filas[:tamano][::-1]
+        return Pagina(
+            filas,
+            cursor_siguiente=codificar_cursor(_valores_de(filas[-1], campos)) if filas else None,
+            cursor_anterior=codificar_cursor(_valores_de(filas[0], campos)) if filas and hay_mas else None,
+        )
+
+    if valores_despues is not None:
+        queryset = queryset.filter(_posteriores(campos, valores_despues, descendente))
+    filas = list(queryset.order_by(*orden)[:tamano + 1])
+    hay_mas = len(filas) > tamano
+    filas = filas[:tamano]
+    return Pagina(
+        filas,
+        cursor_siguiente=codificar_cursor(_valores_de(filas[-1], campos)) if hay_mas else None,
+        cursor_anterior=codificar_cursor(_valores_de(filas[0], campos)) if filas and valores_despues is not None else None,
+    )
@@ -0,0 +1,130 @@
+"""
+Réplica de lectura para los reportes de gerencia.
+
+Las vistas marcadas con @lecturas_de_reportes leen de la base 'reports'
+(réplica de la primaria); todo lo demás, y cualquier escritura, va a
+'default'. Así los agregados pesados de gerencia no compiten con garzones
+y cocina.
+
+- Leer lo propio: tras una escritura en la misma petición, las lecturas
+  vuelven a la primaria. LecturaPropiaMiddleware además marca con una
+  cookie a quien acaba de escribir (POST, etc.) para que sus reportes lean
+  de la primaria durante LECTURA_PROPIA_SEGUNDOS, mientras la réplica se
+  pone al día.
+- Sin réplica: si 'reports' no está configurada o no responde, se lee de
+  la primaria; tras un fallo no se vuelve a intentar durante
+  PAUSA_TRAS_FALLO segundos.
+"""
+import logging
+import threading
+import time
+from contextvars import ContextVar
+from functools import wraps
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, DatabaseError, connections
+
+logger = logging.getLogger(__name__)
+
+ALIAS_REPORTES = 'reports'
+COOKIE_LECTURA_PROPIA = 'leer_primaria'
+LECTURA_PROPIA_SEGUNDOS = 10
+PAUSA_TRAS_FALLO = 30  # segundos
+METODOS_SEGUROS = ('GET', 'HEAD', 'OPTIONS', 'TRACE')
+
+# Base de lectura de la petición en curso (None: la de siempre)
+_lectura = ContextVar('lectura_reportes', default=None)
+
+_lock = threading.Lock()
+_caida_hasta = 0.0
+
+
+def replica_disponible():
+    """
+    True si la réplica está configurada y acepta conexiones
+    """
+    global _caida_hasta
+    if ALIAS_REPORTES not in settings.DATABASES:
+        return False
+    if time.monotonic() < _caida_hasta:
+        return False
+    try:
+        connections[ALIAS_REPORTES].ensure_connection()
+    except DatabaseError:
+        with _lock:
+            _caida_hasta = time.monotonic() + PAUSA_TRAS_FALLO
+        logger.warning("Réplica de reportes no disponible; se lee de la primaria", exc_info=True)
+        return False
+    return True
+
+
+def base_de_lectura(request):
+    if request.COOKIES.get(COOKIE_LECTURA_PROPIA):
+        return DEFAULT_DB_ALIAS
+    return ALIAS_REPORTES if replica_disponible() else DEFAULT_DB_ALIAS
+
+
+def lecturas_de_reportes(vista):
+    """
+    Decorador para vistas sincrónicas de reportes: sus consultas leen de la
+    réplica. La respuesta debe quedar armada dentro de la vista (render),
+    no en un generador que se consuma después.
+    """
+    @wraps(vista)
+    def envoltura(request, *args, **kwargs):
+        token = _lectura.set(base_de_lectura(request))
+        try:
+            return vista(request, *args, **kwargs)
+        finally:
+            _lectura.reset(token)
+    return envoltura
+
+
+class EnrutadorReportes:
+    def db_for_read(self, model, **hints):
+        return _lectura.get()
+
+    def db_for_write(self, model, **hints):
+        # Lo que se lea después en esta petición ya debe incluir esta escritura
+        if _lectura.get() is not None:
+            _lectura.set(DEFAULT_DB_ALIAS)
+        # Explícito: sin esto, un objeto leído de la réplica se guardaría en ella
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Primaria y réplica tienen los mismos datos
+        bases = {DEFAULT_DB_ALIAS, ALIAS_REPORTES}
+        if obj1._state.db in bases and obj2._state.db in bases:
+            return True
+        return None
+
+
+class LecturaPropiaMiddleware:
+    """
+    Marca con una cookie corta a quien hizo una petición que puede escribir
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        return self._marcar(request, self.get_response(request))
+
+    async def __acall__(self, request):
+        return self._marcar(request, await self.get_response(request))
+
+    def _marcar(self, request, response):
+        if request.method not in METODOS_SEGUROS:
+            response.set_cookie(
+                COOKIE_LECTURA_PROPIA, '1',
+                max_age=LECTURA_PROPIA_SEGUNDOS, httponly=True, samesite='Lax',
+                secure=request.is_secure()
+            )
+        return response
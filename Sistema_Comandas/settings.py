@@ -25,12 +25,14 @@ ALLOWED_HOSTS = env.list('ALLOWED_HOSTS', default=['localhost', '127.0.0.1'])
 # Application definition
 
 INSTALLED_APPS = [
+    'daphne',  # runserver ASGI (WebSocket de cocina)
     'django.contrib.admin',
     'django.contrib.auth',
     'django.contrib.contenttypes',
     'django.contrib.sessions',
     'django.contrib.messages',
     'django.contrib.staticfiles',
+    'channels',
     'login',
     'garzon',
     'gerencia',
@@ -38,11 +40,14 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
-    'whitenoise.middleware.WhiteNoiseMiddleware',
+    'Sistema_Comandas.estaticos.WhiteNoiseAsyncMiddleware',
+    'Sistema_Comandas.metricas.MetricasMiddleware',
     'django.middleware.security.SecurityMiddleware',
+    'Sistema_Comandas.replica.LecturaPropiaMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
+    'login.middleware.BackendDeSesionMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
@@ -67,6 +72,14 @@ TEMPLATES = [
 ]
 
 WSGI_APPLICATION = 'Sistema_Comandas.wsgi.application'
+ASGI_APPLICATION = 'Sistema_Comandas.asgi.application'
+
+# Channels: capa en memoria, suficiente para un solo nodo
+CHANNEL_LAYERS = {
+    'default': {
+        'BACKEND': 'channels.layers.InMemoryChannelLayer',
+    },
+}
 
 
 # Database
@@ -88,6 +101,32 @@ DATABASES = {
     }
 }
 
+# Réplica de lectura para los reportes de gerencia (ver Sistema_Comandas/replica.py).
+# Sin DB_REPORTS_HOST los reportes leen de la primaria.
+DB_REPORTS_HOST = env('DB_REPORTS_HOST', default='')
+if DB_REPORTS_HOST:
+    DATABASES['reports'] = {
+        **DATABASES['default'],
+        'HOST': DB_REPORTS_HOST,
+        'PORT': env('DB_REPORTS_PORT', default=DATABASES['default']['PORT']),
+        'OPTIONS': {**DATABASES['default']['OPTIONS'], 'application_name': 'django_reportes'},
+        'TEST': {'MIRROR': 'default'},
+    }
+
+DATABASE_ROUTERS = ['Sistema_Comandas.replica.EnrutadorReportes']
+
+
+# Cache
+# Caché en memoria del proceso (catálogo del menú, sesiones, usuario de la
+# sesión). Con varios procesos de servidor conviene un backend compartido
+# para que las invalidaciones lleguen a todos.
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    }
+}
+
 
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
@@ -113,7 +152,17 @@ USE_TZ = True
 STATIC_URL = '/static/'
 STATICFILES_DIRS = [os.path.join(BASE_DIR, 'static')]
 STATIC_ROOT = os.path.join(BASE_DIR, 'staticfiles')
-STATICFILES_STORAGE = "whitenoise.storage.CompressedManifestStaticFilesStorage"
+# collectstatic minifica el JS del proyecto y publica nombres con hash y
+# variantes comprimidas, que WhiteNoise sirve con caché inmutable
+# (ver Sistema_Comandas/estaticos.py)
+STORAGES = {
+    'default': {
+        'BACKEND': 'django.core.files.storage.FileSystemStorage',
+    },
+    'staticfiles': {
+        'BACKEND': 'Sistema_Comandas.estaticos.EstaticosMinificados',
+    },
+}
 
 # Default primary key field type
 # https://docs.djangoproject.com/en/5.2/ref/settings/#default-auto-field
@@ -122,6 +171,19 @@ DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
 AUTH_USER_MODEL = 'login.Usuario'
 
+# El usuario de la sesión se lee de la caché (ver login/backends.py). Las
+# sesiones iniciadas con ModelBackend pasan a este backend en su próxima
+# petición (login/middleware.py).
+AUTHENTICATION_BACKENDS = [
+    'login.backends.UsuarioEnCacheBackend',
+]
+
+# Sesiones en caché con escritura a la base de datos: leerlas no hace consultas
+SESSION_ENGINE = 'django.contrib.sessions.backends.cached_db'
+
+# Métricas por vista (/metricas/): staff, o un scraper con este token
+METRICAS_TOKEN = env('METRICAS_TOKEN', default='')
+
 # Redirecciones de autenticación
 LOGIN_URL = '/login/login/'
 LOGIN_REDIRECT_URL = '/login/home/'
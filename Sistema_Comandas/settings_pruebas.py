@@ -0,0 +1,31 @@
+"""
+Configuración para correr las pruebas localmente, sin PostgreSQL: dos bases
+SQLite hacen de primaria ('default') y réplica de reportes ('reports').
+
+    python manage.py test --settings=Sistema_Comandas.settings_pruebas
+"""
+import os
+
+for variable in ('SECRET_KEY', 'DB_NAME', 'DB_USER', 'DB_PASSWORD', 'DB_HOST', 'DB_PORT'):
+    os.environ.setdefault(variable, 'pruebas')
+
+from .settings import *  # noqa: E402,F401,F403
+from .settings import BASE_DIR  # noqa: E402
+
+# Bases separadas (sin TEST MIRROR) para comprobar a cuál va cada consulta
+DATABASES = {
+    'default': {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': BASE_DIR / 'pruebas_primaria.sqlite3',
+    },
+    'reports': {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': BASE_DIR / 'pruebas_reportes.sqlite3',
+    },
+}
+
+# Las pruebas no ejecutan collectstatic: sin manifiesto de nombres con hash
+STORAGES = {
+    'default': {'BACKEND': 'django.core.files.storage.FileSystemStorage'},
+    'staticfiles': {'BACKEND': 'django.contrib.staticfiles.storage.StaticFilesStorage'},
+}
@@ -1,10 +1,12 @@
 from django.contrib import admin
 from django.urls import path, include
 from django.shortcuts import redirect
+from .metricas import metricas
 
 urlpatterns = [
     path('', lambda request: redirect('login')),  # redirección automática al login
     path('admin/', admin.site.urls),
+    path('metricas/', metricas, name='metricas'),
     path('login/', include('login.urls')),
     path('garzon/', include('garzon.urls')),
     path('cocina/', include('cocina.urls', namespace='cocina')),
@@ -0,0 +1,27 @@
+from channels.generic.websocket import AsyncJsonWebsocketConsumer
+
+from .eventos import GRUPO_COCINA
+
+
+class CocinaConsumer(AsyncJsonWebsocketConsumer):
+    """
+    WebSocket del tablero de cocina: reenvía a cada pantalla los cambios
+    difundidos por cocina.eventos
+    """
+
+    async def connect(self):
+        user = self.scope.get('user')
+        if user is None or not user.is_authenticated:
+            await self.close()
+            return
+        await self.channel_layer.group_add(GRUPO_COCINA, self.channel_name)
+        await self.accept()
+
+    async def disconnect(self, code):
+        await self.channel_layer.group_discard(GRUPO_COCINA, self.channel_name)
+
+    async def comanda_actualizada(self, event):
+        await self.send_json({'tipo': 'actualizada', 'comanda': event['comanda']})
+
+    async def comanda_retirada(self, event):
+        await self.send_json({'tipo': 'retirada', 'id': event['id']})
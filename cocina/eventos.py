@@ -0,0 +1,84 @@
+"""
+Difusión de cambios del tablero de cocina a las pantallas conectadas
+por WebSocket (ver cocina.consumers) y al tablero en memoria del proceso
+(ver cocina.tablero).
+"""
+import logging
+
+from asgiref.sync import async_to_sync
+from channels.layers import get_channel_layer
+from django.db import transaction
+
+from .serializadores import comandas_en_cocina, serializar_comanda
+from .tablero import tablero
+
+logger = logging.getLogger(__name__)
+
+GRUPO_COCINA = 'cocina'
+
+
+def _enviar_al_grupo(mensaje):
+    channel_layer = get_channel_layer()
+    if channel_layer is None:
+        return
+    try:
+        async_to_sync(channel_layer.group_send)(GRUPO_COCINA, mensaje)
+    except Exception:
+        # Las pantallas se resincronizan solas; un fallo aquí no debe romper la vista
+        logger.exception("No se pudo notificar a cocina")
+
+
+async def _aenviar_al_grupo(mensaje):
+    channel_layer = get_channel_layer()
+    if channel_layer is None:
+        return
+    try:
+        await channel_layer.group_send(GRUPO_COCINA, mensaje)
+    except Exception:
+        logger.exception("No se pudo notificar a cocina")
+
+
+def notificar_comanda_enviada(comanda_id):
+    """
+    Avisa a cocina que una comanda entró (o cambió) en estado 'E'.
+    Se ejecuta al confirmar la transacción para no difundir datos sin guardar.
+    """
+    def enviar():
+        comanda = comandas_en_cocina().filter(id=comanda_id).first()
+        if comanda is None:
+            return
+        serializada = serializar_comanda(comanda)
+        tablero.actualizar(serializada)
+        _enviar_al_grupo({
+            'type': 'comanda.actualizada',
+            'comanda': serializada,
+        })
+
+    transaction.on_commit(enviar)
+
+
+def notificar_comanda_retirada(comanda_id):
+    """
+    Avisa a cocina que una comanda salió del tablero (lista o anulada)
+    """
+    def enviar():
+        tablero.retirar(comanda_id)
+        _enviar_al_grupo({
+            'type': 'comanda.retirada',
+            'id': comanda_id,
+        })
+
+    transaction.on_commit(enviar)
+
+
+
+async def anotificar_comanda_retirada(comanda_id):
+    """
+    Versión para vistas asíncronas, que guardan en modo autocommit: el
+    cambio ya está confirmado y se difunde de inmediato
+    """
+    tablero.retirar(comanda_id)
+    await _aenviar_al_grupo({
+        'type': 'comanda.retirada',
+        'id': comanda_id,
+    })
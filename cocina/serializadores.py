@@ -0,0 +1,31 @@
+from garzon.models import Comanda
+
+
+def comandas_en_cocina():
+    """
+    Comandas enviadas a cocina, con sus items y productos precargados
+    """
+    return Comanda.objects.filter(estado='E').prefetch_related('items__producto').order_by('created_at')
+
+
+def serializar_comanda(comanda):
+    """
+    Convierte una comanda al formato que usa el tablero de cocina
+    """
+    # Formatear items para el template
+    items_data = []
+    for item in comanda.items.all():
+        items_data.append({
+            'nombre': item.producto.nombre,
+            'cantidad': item.cantidad,
+            'detalles': item.notas or ''
+        })
+
+    # El tiempo transcurrido lo calcula la pantalla a partir de confirmado_at
+    return {
+        'id': comanda.id,
+        'numero_habitacion': comanda.numero_habitacion,
+        'confirmado_at': comanda.created_at.isoformat(),  # Para el timer
+        'items': items_data,
+        'notas_cocina': comanda.notas_cocina or ''
+    }
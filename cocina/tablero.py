@@ -0,0 +1,159 @@
+"""
+Tablero de cocina en memoria del proceso.
+
+Guarda las comandas en estado 'E' ya serializadas (serializar_comanda) para
+que api_comandas_list responda sin consultar la base de datos. Se actualiza
+en el lugar con los mismos eventos que avisan a las pantallas
+(cocina.eventos) y cada INTERVALO_RECONCILIACION segundos se compara con la
+base de datos, lo que corrige cambios hechos por otros procesos (admin,
+comandos de gestión).
+
+Cursor: '<época>:<secuencia>'. Cada cambio incrementa la secuencia; la época
+cambia al reiniciarse el proceso, y un cursor de otra época (o demasiado
+antiguo para las retiradas que se conservan) recibe el tablero completo.
+"""
+import threading
+import time
+import uuid
+
+from .serializadores import comandas_en_cocina, serializar_comanda
+
+INTERVALO_RECONCILIACION = 30  # segundos
+# Cuánto se recuerdan las comandas retiradas para las respuestas incrementales
+RETENCION_RETIRADAS = 600  # segundos
+
+
+class Tablero:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.epoca = uuid.uuid4().hex[:8]
+        self.secuencia = 0
+        self.comandas = {}      # id -> comanda serializada
+        self.versiones = {}     # id -> secuencia del último cambio
+        self.retiradas = {}     # id -> (secuencia, instante en que salió)
+        self.secuencia_descartada = 0  # Retiradas olvidadas hasta esta secuencia
+        self.reconciliado_at = None
+        self._reconciliado_previo = None
+
+    # Cambios puntuales (eventos de la aplicación)
+
+    def actualizar(self, comanda):
+        """
+        Agrega o reemplaza una comanda serializada (entró o cambió en 'E')
+        """
+        with self._lock:
+            self.secuencia += 1
+            self.comandas[comanda['id']] = comanda
+            self.versiones[comanda['id']] = self.secuencia
+            self.retiradas.pop(comanda['id'], None)
+
+    def retirar(self, comanda_id):
+        """
+        Quita una comanda del tablero (lista o anulada)
+        """
+        with self._lock:
+            self._retirar(comanda_id)
+
+    def _retirar(self, comanda_id):
+        self.secuencia += 1
+        self.comandas.pop(comanda_id, None)
+        self.versiones.pop(comanda_id, None)
+        self.retiradas[comanda_id] = (self.secuencia, time.monotonic())
+        self._olvidar_retiradas()
+
+    def _olvidar_retiradas(self):
+        limite = time.monotonic() - RETENCION_RETIRADAS
+        for comanda_id, (secuencia, instante) in list(self.retiradas.items()):
+            if instante < limite:
+                del self.retiradas[comanda_id]
+                self.secuencia_descartada = max(self.secuencia_descartada, secuencia)
+
+    # Reconciliación con la base de datos
+
+    def necesita_reconciliar(self):
+        """
+        True si toca comparar con la base de datos. Solo una petición por
+        intervalo lo recibe: las demás siguen usando la copia en memoria
+        (al arrancar, vacía hasta que termina la primera lectura; sus
+        cursores reciben después esas comandas como cambios).
+        """
+        with self._lock:
+            ahora = time.monotonic()
+            if self.reconciliado_at is not None and ahora - self.reconciliado_at < INTERVALO_RECONCILIACION:
+                return False
+            # El intervalo se reserva antes de leer la base de datos
+            self._reconciliado_previo = self.reconciliado_at
+            self.reconciliado_at = ahora
+            return True
+
+    async def areconciliar(self):
+        inicio = self.secuencia
+        try:
+            serializadas = [serializar_comanda(comanda) async for comanda in comandas_en_cocina()]
+        except Exception:
+            # Sin la lectura, la próxima petición debe volver a intentarlo
+            # en vez de responder con el tablero viejo (o vacío) 30 segundos
+            with self._lock:
+                self.reconciliado_at = self._reconciliado_previo
+            raise
+        self._aplicar(serializadas, inicio)
+
+    def _aplicar(self, serializadas, secuencia_inicio):
+        """
+        Deja el tablero igual a la lectura de la base de datos. Las comandas
+        que cambiaron por un evento después de iniciada la lectura se
+        respetan: el evento es más reciente que la lectura.
+        """
+        with self._lock:
+            def cambio_despues(comanda_id):
+                if self.versiones.get(comanda_id, 0) > secuencia_inicio:
+                    return True
+                retirada = self.retiradas.get(comanda_id)
+                return retirada is not None and retirada[0] > secuencia_inicio
+
+            en_base = {comanda['id']: comanda for comanda in serializadas}
+            for comanda_id, comanda in en_base.items():
+                if self.comandas.get(comanda_id) != comanda and not cambio_despues(comanda_id):
+                    self.secuencia += 1
+                    self.comandas[comanda_id] = comanda
+                    self.versiones[comanda_id] = self.secuencia
+                    self.retiradas.pop(comanda_id, None)
+            for comanda_id in list(self.comandas):
+                if comanda_id not in en_base and not cambio_despues(comanda_id):
+                    self._retirar(comanda_id)
+            self.reconciliado_at = time.monotonic()
+
+    # Lectura
+
+    @property
+    def cursor(self):
+        return f'{self.epoca}:{self.secuencia}'
+
+    def cambios_desde(self, cursor):
+        """
+        (cursor actual, completo, comandas, retiradas). Con un cursor válido
+        de esta época devuelve solo lo que cambió después de él; si no, el
+        tablero completo.
+        """
+        with self._lock:
+            desde = self._secuencia_de(cursor)
+            if desde is None:
+                comandas = list(self.comandas.values())
+                retiradas = []
+            else:
+                comandas = [c for i, c in self.comandas.items() if self.versiones[i] > desde]
+                retiradas = [i for i, (secuencia, _) in self.retiradas.items() if secuencia > desde]
+            comandas.sort(key=lambda c: (c['confirmado_at'], c['id']))
+            return self.cursor, desde is None, comandas, retiradas
+
+    def _secuencia_de(self, cursor):
+        epoca, _, secuencia = (cursor or '').partition(':')
+        if epoca != self.epoca or not secuencia.isdigit():
+            return None
+        secuencia = int(secuencia)
+        if secuencia < self.secuencia_descartada or secuencia > self.secuencia:
+            return None
+        return secuencia
+
+
+tablero = Tablero()
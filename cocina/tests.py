@@ -1,3 +1,46 @@
+from unittest import mock
+
+from django.db import OperationalError
 from django.test import TestCase
+from django.urls import reverse
+
+from garzon.models import Comanda
+from login.models import Usuario
+from .tablero import Tablero
+
+
+class ReconciliacionTableroTests(TestCase):
+    def setUp(self):
+        self.tablero = Tablero()
+        Comanda.objects.create(numero_habitacion=1, estado='E')
+
+    async def test_una_sola_peticion_reconcilia_por_intervalo(self):
+        self.assertTrue(self.tablero.necesita_reconciliar())
+        self.assertFalse(self.tablero.necesita_reconciliar())
+        await self.tablero.areconciliar()
+        self.assertEqual(len(self.tablero.comandas), 1)
+        self.assertFalse(self.tablero.necesita_reconciliar())
+
+    async def test_si_la_lectura_falla_la_siguiente_peticion_reintenta(self):
+        self.assertTrue(self.tablero.necesita_reconciliar())
+        with mock.patch('cocina.tablero.comandas_en_cocina', side_effect=OperationalError):
+            with self.assertRaises(OperationalError):
+                await self.tablero.areconciliar()
+        self.assertIsNone(self.tablero.reconciliado_at)
+
+        self.assertTrue(self.tablero.necesita_reconciliar())
+        await self.tablero.areconciliar()
+        self.assertEqual(len(self.tablero.comandas), 1)
+
+    def test_la_api_no_responde_un_tablero_vacio_si_la_lectura_falla(self):
+        usuario = Usuario.objects.create_user('cocina', password='x', rol='cocina', is_active=True)
+        self.client.force_login(usuario)
+        self.client.raise_request_exception = False
+        with mock.patch('cocina.views.tablero', self.tablero), \
+                mock.patch('cocina.tablero.comandas_en_cocina', side_effect=OperationalError):
+            respuesta = self.client.get(reverse('cocina:api_comandas_list'))
+        self.assertEqual(respuesta.status_code, 500)
 
-# Create your tests here.
+        with mock.patch('cocina.views.tablero', self.tablero):
+            respuesta = self.client.get(reverse('cocina:api_comandas_list'))
+        self.assertEqual([c['id'] for c in respuesta.json()['comandas']], [Comanda.objects.get().id])
@@ -1,10 +1,19 @@
-from django.shortcuts import render, get_object_or_404, redirect
+import json
+from asgiref.sync import sync_to_async
+from django.shortcuts import render
 from django.contrib.auth.decorators import login_required
 from django.views.decorators.http import require_POST
-from django.http import JsonResponse
-from django.utils import timezone
-from garzon.models import Comanda, ComandaItem
-import json
+from django.db import transaction
+from django.http import Http404, JsonResponse, HttpResponseNotModified
+from garzon.estados import atransicionar, transicionar_varias
+from gerencia.rollups import actualizar_ventas_creadas
+from .eventos import anotificar_comanda_retirada, notificar_comanda_retirada
+from .tablero import tablero
+
+# Estados a los que cocina puede pasar una comanda enviada
+ESTADOS_SALIDA = ('L', 'A')
+# Máximo de comandas por petición en api_transicionar_comandas
+MAX_COMANDAS_LOTE = 200
 
 @login_required
 def home_cocina(request):
@@ -14,67 +23,107 @@ def home_cocina(request):
     return render(request, 'home_cocina.html')
 
 @login_required
-def api_comandas_list(request):
+async def api_comandas_list(request):
+    """
+    API para obtener lista de comandas en formato compatible con el template.
+    Se responde desde el tablero en memoria (cocina.tablero), sin consultar
+    la base de datos salvo en la reconciliación periódica.
+
+    Con ?since=<cursor> devuelve solo las comandas que entraron o cambiaron
+    y las que salieron desde ese cursor, y responde 304 si no hubo cambios.
+    Sin cursor (o con uno vencido) devuelve el tablero completo.
+    """
+    if tablero.necesita_reconciliar():
+        await tablero.areconciliar()
+
+    since = request.GET.get('since')
+    cursor, completo, comandas, retiradas = tablero.cambios_desde(since)
+    etag = f'"{cursor}"'
+
+    if since == cursor or request.headers.get('If-None-Match') == etag:
+        response = HttpResponseNotModified()
+        response['ETag'] = etag
+        return response
+
+    datos = {
+        'ok': True,
+        'completo': completo,
+        'cursor': cursor,
+        'comandas': comandas,
+    }
+    if not completo:
+        datos['retiradas'] = retiradas
+    response = JsonResponse(datos)
+    response['ETag'] = etag
+    return response
+
+def _retirar_de_cocina(ids, destino):
     """
-    API para obtener lista de comandas en formato compatible con el template
+    Pasa de 'E' a `destino` las comandas indicadas en una transacción; el
+    tablero y los resúmenes se actualizan al confirmarla. Devuelve los ids
+    que cambiaron.
     """
-    # Comandas en estado 'Pendiente'
-    comandas = Comanda.objects.filter(estado='E').prefetch_related('items__producto').order_by('created_at')
-    
-    comandas_data = []
-    for comanda in comandas:
-        # Calcular tiempo transcurrido
-        tiempo_transcurrido = timezone.now() - comanda.created_at
-        minutos = int(tiempo_transcurrido.total_seconds() // 60)
-        segundos = int(tiempo_transcurrido.total_seconds() % 60)
-        
-        # Formatear items para el template
-        items_data = []
-        for item in comanda.items.all():
-            # CORREGIDO: Usar solo el campo 'notas' que existe en el modelo
-            detalles = item.notas or ''
-            
-            items_data.append({
-                'nombre': item.producto.nombre if item.producto else item.nombre,
-                'cantidad': item.cantidad,
-                'detalles': detalles
-            })
-        
-        comandas_data.append({
-            'id': comanda.id,
-            'numero_orden': comanda.id,  # Para compatibilidad con template
-            'numero_habitacion': comanda.numero_habitacion,
-            'confirmado_at': comanda.created_at.isoformat(),  # Para el timer
-            'estado': 'PENDIENTE',  # Para compatibilidad
-            'items': items_data,
-            'tiempo_transcurrido': f"{minutos}m {segundos}s",
-            'notas_cocina': comanda.notas_cocina if comanda.notas_cocina else ''
-        })
-    
-    return JsonResponse({'ok': True, 'comandas': comandas_data})
+    with transaction.atomic():
+        cambiadas = transicionar_varias(ids, destino, origen='E')
+        for comanda_id in cambiadas:
+            notificar_comanda_retirada(comanda_id)
+        if destino == 'A' and cambiadas:
+            # Dejan de contar como venta
+            actualizar_ventas_creadas(cambiadas.values())
+    return sorted(cambiadas)
 
 @login_required
 @require_POST
-def api_marcar_lista(request, comanda_id):
+async def api_marcar_lista(request, comanda_id):
     """
-    API para marcar comanda como lista
+    API para marcar comanda como lista (un solo UPDATE condicional)
     """
-    comanda = get_object_or_404(Comanda, id=comanda_id, estado='E')
-    comanda.estado = 'L'  # Lista
-    comanda.save()
+    if not await atransicionar(comanda_id, 'L', origen='E'):
+        raise Http404("La comanda no está en cocina")
+    await anotificar_comanda_retirada(comanda_id)
     return JsonResponse({'ok': True})
 
 @login_required
 @require_POST
-def api_eliminar_comanda(request, comanda_id):
+async def api_eliminar_comanda(request, comanda_id):
     """
     API para eliminar/anular comanda
     """
-    comanda = get_object_or_404(Comanda, id=comanda_id, estado='E')
-    comanda.estado = 'A'  # Anulada
-    comanda.save()
+    # Transaccional (recalcula el día de la comanda): corre en el hilo sincrónico
+    if not await sync_to_async(_retirar_de_cocina)([comanda_id], 'A'):
+        raise Http404("La comanda no está en cocina")
     return JsonResponse({'ok': True})
 
+@login_required
+@require_POST
+async def api_transicionar_comandas(request):
+    """
+    API para cambiar de estado varias comandas en una petición, p. ej.
+    marcar listas todas las de un apuro.
+    Recibe {"ids": [...], "estado": "L" | "A"} y devuelve las comandas que
+    cambiaron y las omitidas (ya no estaban en cocina).
+    """
+    try:
+        data = json.loads(request.body.decode('utf-8') or '{}')
+        ids = list(dict.fromkeys(int(comanda_id) for comanda_id in data.get('ids', [])))
+    except (ValueError, TypeError, AttributeError):
+        return JsonResponse({'ok': False, 'error': 'Datos inválidos'}, status=400)
+    estado = data.get('estado')
+    if estado not in ESTADOS_SALIDA:
+        return JsonResponse({'ok': False, 'error': 'Estado no permitido'}, status=400)
+    if len(ids) > MAX_COMANDAS_LOTE:
+        return JsonResponse(
+            {'ok': False, 'error': f'Máximo {MAX_COMANDAS_LOTE} comandas por petición'}, status=400
+        )
+
+    cambiadas = await sync_to_async(_retirar_de_cocina)(ids, estado) if ids else []
+    retiradas = set(cambiadas)
+    return JsonResponse({
+        'ok': True,
+        'cambiadas': cambiadas,
+        'omitidas': [comanda_id for comanda_id in ids if comanda_id not in retiradas],
+    })
+
 # Vistas adicionales para compatibilidad (si las necesitas)
 @login_required
 @require_POST
@@ -1,5 +1,6 @@
 from django.contrib import admin
-from .models import Categoria, Producto, ClienteExterno, Comanda, ComandaItem
+from .models import Categoria, Producto, ClienteExterno, Comanda, ComandaItem, ComandaArchivada, ComandaItemArchivada
+from .services import recalcular_totales
 
 @admin.register(Categoria)
 class CategoriaAdmin(admin.ModelAdmin):
@@ -86,6 +87,7 @@ class ComandaAdmin(admin.ModelAdmin):
         'origen_display_admin', 
         'estado', 
         'total_display', 
+        'cantidad_items', 
         'created_by', 
         'created_at', 
         'updated_at'
@@ -134,13 +136,19 @@ class ComandaAdmin(admin.ModelAdmin):
     origen_display_admin.short_description = 'Origen'
     
     def total_display(self, obj):
-        return f"${obj.total()}"
+        return f"${obj.total}"
     total_display.short_description = 'Total'
+    total_display.admin_order_field = 'total'
+    
+    def save_related(self, request, form, formsets, change):
+        super().save_related(request, form, formsets, change)
+        # Los items del inline pudieron cambiar
+        recalcular_totales(Comanda.objects.filter(pk=form.instance.pk))
     
     def get_queryset(self, request):
         return super().get_queryset(request).select_related(
             'cliente_externo', 'created_by'
-        ).prefetch_related('items')
+        )
 
 
 @admin.register(ComandaItem)
@@ -195,7 +203,50 @@ class ComandaItemAdmin(admin.ModelAdmin):
         return f"${obj.subtotal()}"
     subtotal_display.short_description = 'Subtotal'
     
+    def save_model(self, request, obj, form, change):
+        super().save_model(request, obj, form, change)
+        recalcular_totales(Comanda.objects.filter(pk=obj.comanda_id))
+    
+    def delete_model(self, request, obj):
+        comanda_id = obj.comanda_id
+        super().delete_model(request, obj)
+        recalcular_totales(Comanda.objects.filter(pk=comanda_id))
+    
+    def delete_queryset(self, request, queryset):
+        comanda_ids = list(queryset.values_list('comanda_id', flat=True).distinct())
+        super().delete_queryset(request, queryset)
+        recalcular_totales(Comanda.objects.filter(id__in=comanda_ids))
+    
     def get_queryset(self, request):
         return super().get_queryset(request).select_related(
             'comanda', 'comanda__cliente_externo', 'producto'
-        )
\ No newline at end of file
+        )
+
+class ComandaItemArchivadaInline(admin.TabularInline):
+    model = ComandaItemArchivada
+    extra = 0
+    can_delete = False
+    fields = ['producto', 'cantidad', 'precio_unitario', 'notas', 'created_at']
+    readonly_fields = fields
+
+    def has_add_permission(self, request, obj=None):
+        return False
+
+
+@admin.register(ComandaArchivada)
+class ComandaArchivadaAdmin(admin.ModelAdmin):
+    """
+    Solo lectura: para devolver una comanda a trabajo use `restaurar_comandas`
+    """
+    list_display = ['id', 'numero_habitacion', 'cliente_externo', 'estado', 'total', 'created_at', 'archivada_at']
+    list_filter = ['estado', 'created_at']
+    search_fields = ['id', 'numero_habitacion', 'cliente_externo__nombre']
+    ordering = ['-created_at']
+    list_select_related = ['cliente_externo']
+    inlines = [ComandaItemArchivadaInline]
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class GarzonConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'garzon'
+
+    def ready(self):
+        from . import signals  # noqa: F401
@@ -0,0 +1,96 @@
+"""
+Archivo de comandas cerradas.
+
+Las comandas listas o anuladas antiguas se mueven, con sus items, a
+ComandaArchivada / ComandaItemArchivada para que las tablas de trabajo
+(cocina, garzón, admin) solo tengan las últimas semanas. Cada lote se mueve
+en su propia transacción, conservando ids y fechas, así que se puede
+restaurar sin perder nada.
+
+Los reportes que necesitan el historial completo recorren FUENTES: la tabla
+de trabajo y la de archivo tienen los mismos nombres de campos.
+"""
+from datetime import timedelta
+
+from django.db import transaction
+from django.utils import timezone
+
+from .models import Comanda, ComandaArchivada, ComandaItem, ComandaItemArchivada
+
+# Solo se archivan comandas que ya no cambian
+ESTADOS_ARCHIVABLES = ['L', 'A']
+
+# (modelo de comandas, modelo de items): tablas de trabajo y de archivo
+FUENTES = [(Comanda, ComandaItem), (ComandaArchivada, ComandaItemArchivada)]
+
+CAMPOS_COMANDA = [
+    'id', 'numero_habitacion', 'cliente_externo_id', 'estado', 'created_by_id',
+    'created_at', 'updated_at', 'notas_cocina', 'total', 'cantidad_items',
+]
+CAMPOS_ITEM = ['id', 'comanda_id', 'producto_id', 'cantidad', 'precio_unitario', 'notas', 'created_at']
+
+
+def _mover(ids, origen, destino):
+    """
+    Copia las comandas (y sus items) de un par de modelos al otro y las
+    borra del origen, en una sola transacción. Devuelve cuántas movió.
+    """
+    modelo_comanda, modelo_item = origen
+    destino_comanda, destino_item = destino
+    with transaction.atomic():
+        # skip_locked: una comanda que alguien está modificando queda para el próximo lote
+        comandas = list(
+            modelo_comanda.objects.select_for_update(skip_locked=True).filter(id__in=ids).values(*CAMPOS_COMANDA)
+        )
+        ids = [comanda['id'] for comanda in comandas]
+        items = list(modelo_item.objects.filter(comanda_id__in=ids).values(*CAMPOS_ITEM))
+
+        nuevas = destino_comanda.objects.bulk_create([destino_comanda(**comanda) for comanda in comandas])
+        nuevos = destino_item.objects.bulk_create([destino_item(**item) for item in items])
+        if destino_comanda is Comanda:
+            # bulk_create aplica auto_now/auto_now_add: se reponen las fechas originales
+            for objeto, comanda in zip(nuevas, comandas):
+                objeto.created_at, objeto.updated_at = comanda['created_at'], comanda['updated_at']
+            for objeto, item in zip(nuevos, items):
+                objeto.created_at = item['created_at']
+            Comanda.objects.bulk_update(nuevas, ['created_at', 'updated_at'])
+            ComandaItem.objects.bulk_update(nuevos, ['created_at'])
+
+        modelo_item.objects.filter(comanda_id__in=ids).delete()
+        modelo_comanda.objects.filter(id__in=ids).delete()
+    return len(ids)
+
+
+def comandas_archivables(dias):
+    corte = timezone.now() - timedelta(days=dias)
+    return Comanda.objects.filter(estado__in=ESTADOS_ARCHIVABLES, updated_at__lt=corte)
+
+
+def archivar(dias, lote=500):
+    """
+    Mueve al archivo las comandas cerradas sin cambios hace más de `dias`.
+    Genera la cantidad movida en cada lote.
+    """
+    candidatas = comandas_archivables(dias).order_by('id')
+    ultimo_id = 0
+    while True:
+        ids = list(candidatas.filter(id__gt=ultimo_id).values_list('id', flat=True)[:lote])
+        if not ids:
+            return
+        ultimo_id = ids[-1]
+        yield _mover(ids, FUENTES[0], FUENTES[1])
+
+
+def restaurar(archivadas, lote=500):
+    """
+    Devuelve a las tablas de trabajo las comandas archivadas del queryset.
+    Genera la cantidad movida en cada lote.
+    """
+    candidatas = archivadas.order_by('id')
+    ultimo_id = 0
+    while True:
+        ids = list(candidatas.filter(id__gt=ultimo_id).values_list('id', flat=True)[:lote])
+        if not ids:
+            return
+        ultimo_id = ids[-1]
+        yield _mover(ids, FUENTES[1], FUENTES[0])
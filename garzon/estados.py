@@ -0,0 +1,74 @@
+"""
+Máquina de estados de las comandas.
+
+    P (pendiente) → E (enviada a cocina) → L (lista)
+    E → E (reenvío: el garzón agrega items a una comanda ya en cocina)
+    P, E → A (anulada)
+
+Cada transición es un UPDATE condicional (WHERE id = ... AND estado IN
+(...)): si otra pantalla ya cambió la comanda, no se pisa su cambio y la
+transición simplemente no ocurre. update() no aplica auto_now, por eso se
+fija updated_at (lo usan el archivo y el refresco incremental de ventas).
+"""
+from django.db import transaction
+from django.utils import timezone
+
+from .models import Comanda
+
+TRANSICIONES = {
+    'P': ('E', 'A'),
+    'E': ('E', 'L', 'A'),
+    'L': (),
+    'A': (),
+}
+
+
+class TransicionInvalida(ValueError):
+    pass
+
+
+def origenes(destino, origen=None):
+    """
+    Estados desde los que se puede pasar a `destino` (solo `origen`, si se indica)
+    """
+    validos = [estado for estado, destinos in TRANSICIONES.items() if destino in destinos]
+    if origen is not None:
+        validos = [estado for estado in validos if estado == origen]
+    if not validos:
+        raise TransicionInvalida(f"Transición no permitida: {origen or '*'} → {destino}")
+    return validos
+
+
+def _pendientes(ids, destino, origen):
+    return Comanda.objects.filter(id__in=ids, estado__in=origenes(destino, origen))
+
+
+def transicionar(comanda_id, destino, origen=None):
+    """
+    Pasa una comanda a `destino` con una sola consulta.
+    Devuelve False si no estaba en un estado de origen válido (o no existe).
+    """
+    return _pendientes([comanda_id], destino, origen).update(
+        estado=destino, updated_at=timezone.now()
+    ) == 1
+
+
+async def atransicionar(comanda_id, destino, origen=None):
+    return await _pendientes([comanda_id], destino, origen).aupdate(
+        estado=destino, updated_at=timezone.now()
+    ) == 1
+
+
+def transicionar_varias(ids, destino, origen=None):
+    """
+    Pasa a `destino` las comandas de `ids` que estén en un estado de origen
+    válido. Bloquea esas filas y las actualiza con un solo UPDATE dentro de
+    la transacción. Devuelve {id: created_at} de las que cambiaron.
+    """
+    with transaction.atomic():
+        cambiadas = dict(
+            _pendientes(ids, destino, origen).select_for_update().values_list('id', 'created_at')
+        )
+        if cambiadas:
+            Comanda.objects.filter(id__in=cambiadas).update(estado=destino, updated_at=timezone.now())
+    return cambiadas
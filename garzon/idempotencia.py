@@ -0,0 +1,71 @@
+"""
+Envíos idempotentes del garzón.
+
+Con WiFi inestable el navegador reintenta los envíos; cada intento trae la
+misma clave (cabecera Idempotency-Key) y solo el primero se aplica. La
+clave se guarda en la misma transacción que la operación: si la operación
+falla no queda registrada y el reintento se aplica normalmente.
+"""
+import hashlib
+import json
+from datetime import timedelta
+
+from django.db import IntegrityError, transaction
+
+from .models import ClaveIdempotencia
+
+CABECERA_CLAVE = 'Idempotency-Key'
+LARGO_MAXIMO_CLAVE = 64
+# Tiempo durante el que se reconoce un reintento
+TTL_CLAVES = timedelta(hours=24)
+
+
+class ClaveReutilizada(Exception):
+    """
+    La clave ya se usó con una petición distinta
+    """
+
+
+def clave_de(request):
+    """
+    Clave de la petición ('' si no trae). ValueError si es demasiado larga.
+    """
+    clave = request.headers.get(CABECERA_CLAVE, '').strip()
+    if len(clave) > LARGO_MAXIMO_CLAVE:
+        raise ValueError(f"La clave de idempotencia admite hasta {LARGO_MAXIMO_CLAVE} caracteres")
+    return clave
+
+
+def huella(operacion, datos):
+    contenido = json.dumps([operacion, datos], sort_keys=True, default=str)
+    return hashlib.sha256(contenido.encode('utf-8')).hexdigest()
+
+
+def ejecutar_una_vez(usuario, clave, operacion, datos, funcion):
+    """
+    Ejecuta funcion() -> (respuesta, status) una sola vez por clave y usuario.
+    Con una clave ya usada devuelve la respuesta guardada sin ejecutar nada.
+    Sin clave solo ejecuta.
+    """
+    if not clave:
+        return funcion()
+
+    firma = huella(operacion, datos)
+    with transaction.atomic():
+        try:
+            # Si otra petición con la misma clave está en curso, el INSERT
+            # espera a que termine y falla si ella se confirmó
+            with transaction.atomic():
+                registro = ClaveIdempotencia.objects.create(
+                    usuario=usuario, clave=clave, operacion=operacion, huella=firma
+                )
+        except IntegrityError:
+            previo = ClaveIdempotencia.objects.get(usuario=usuario, clave=clave)
+            if previo.huella != firma:
+                raise ClaveReutilizada(clave)
+            return previo.respuesta, previo.status
+
+        respuesta, status = funcion()
+        registro.respuesta, registro.status = respuesta, status
+        registro.save(update_fields=['respuesta', 'status'])
+    return respuesta, status
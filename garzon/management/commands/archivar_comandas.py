@@ -0,0 +1,29 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from garzon.archivo import archivar, comandas_archivables
+
+
+class Command(BaseCommand):
+    help = "Mueve las comandas listas o anuladas antiguas (con sus items) a las tablas de archivo"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--dias', type=int, default=21, help="Archiva las comandas sin cambios hace más de estos días (por defecto 21)")
+        parser.add_argument('--lote', type=int, default=500, help="Comandas movidas por transacción")
+        parser.add_argument('--pausa', type=float, default=0.1, help="Segundos de espera entre lotes")
+        parser.add_argument('--simular', action='store_true', help="Solo informa cuántas comandas se archivarían")
+
+    def handle(self, *args, **options):
+        if options['simular']:
+            cantidad = comandas_archivables(options['dias']).count()
+            self.stdout.write(f'Comandas a archivar: {cantidad}')
+            return
+
+        total = 0
+        for movidas in archivar(options['dias'], options['lote']):
+            total += movidas
+            self.stdout.write(f'Comandas archivadas: {total}')
+            if options['pausa']:
+                time.sleep(options['pausa'])
+        self.stdout.write(self.style.SUCCESS(f'Archivo completado: {total} comanda(s)'))
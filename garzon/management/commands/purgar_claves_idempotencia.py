@@ -0,0 +1,24 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from garzon.idempotencia import TTL_CLAVES
+from garzon.models import ClaveIdempotencia
+from .purgar_clientes_externos import borrar_en_lotes
+
+
+class Command(BaseCommand):
+    help = "Elimina las claves de idempotencia de envíos del garzón más antiguas que su vigencia"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--horas', type=int, default=int(TTL_CLAVES.total_seconds() // 3600),
+                            help="Horas de vigencia de las claves (por defecto 24)")
+        parser.add_argument('--lote', type=int, default=1000, help="Filas borradas por transacción")
+        parser.add_argument('--pausa', type=float, default=0.1, help="Segundos de espera entre lotes")
+
+    def handle(self, *args, **options):
+        corte = timezone.now() - timedelta(hours=options['horas'])
+        vencidas = ClaveIdempotencia.objects.filter(created_at__lt=corte)
+        borradas = borrar_en_lotes(vencidas, options['lote'], options['pausa'])
+        self.stdout.write(self.style.SUCCESS(f'Claves de idempotencia eliminadas: {borradas}'))
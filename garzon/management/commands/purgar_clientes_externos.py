@@ -0,0 +1,67 @@
+import time
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Exists, OuterRef
+from django.utils import timezone
+
+from garzon.models import ClienteExterno, Comanda, ComandaArchivada
+
+
+def borrar_en_lotes(queryset, lote, pausa=0):
+    """
+    Borra las filas del queryset en transacciones cortas de `lote` filas,
+    para no mantener bloqueadas las tablas mientras dura la limpieza
+    """
+    borradas = 0
+    while True:
+        ids = list(queryset.order_by('id').values_list('id', flat=True)[:lote])
+        if not ids:
+            return borradas
+        with transaction.atomic():
+            queryset.model.objects.filter(id__in=ids).delete()
+        borradas += len(ids)
+        if pausa:
+            time.sleep(pausa)
+
+
+class Command(BaseCommand):
+    help = "Elimina comandas vacías abandonadas y clientes externos sin comandas más antiguos que el período de retención"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--dias', type=int, default=30, help="Días de retención (por defecto 30)")
+        parser.add_argument('--lote', type=int, default=1000, help="Filas borradas por transacción")
+        parser.add_argument('--pausa', type=float, default=0.1, help="Segundos de espera entre lotes")
+        parser.add_argument('--simular', action='store_true', help="Solo informa cuántas filas se borrarían")
+
+    def handle(self, *args, **options):
+        corte = timezone.now() - timedelta(days=options['dias'])
+
+        # Comandas sin items que nunca llegaron a cocina (pendientes o anuladas).
+        # Las enviadas o listas se conservan: cuentan en los resúmenes de ventas.
+        comandas = Comanda.objects.filter(
+            estado__in=['P', 'A'],
+            cantidad_items=0,
+            updated_at__lt=corte
+        )
+        # Clientes externos sin ninguna comanda, ni activa ni archivada
+        # (borrarlos no arrastra ventas)
+        clientes = ClienteExterno.objects.filter(created_at__lt=corte).exclude(
+            Exists(Comanda.objects.filter(cliente_externo=OuterRef('pk')))
+        ).exclude(
+            Exists(ComandaArchivada.objects.filter(cliente_externo=OuterRef('pk')))
+        )
+
+        if options['simular']:
+            vacias = comandas.count()
+            self.stdout.write(f'Comandas vacías a eliminar: {vacias}')
+            self.stdout.write(f'Clientes externos sin comandas a eliminar: {clientes.count()}')
+            self.stdout.write('(más los clientes que queden sin comandas al borrar las vacías)')
+            return
+
+        # Primero las comandas, así sus clientes quedan sin comandas y se borran después
+        borradas = borrar_en_lotes(comandas, options['lote'], options['pausa'])
+        self.stdout.write(f'Comandas vacías eliminadas: {borradas}')
+        borrados = borrar_en_lotes(clientes, options['lote'], options['pausa'])
+        self.stdout.write(self.style.SUCCESS(f'Clientes externos eliminados: {borrados}'))
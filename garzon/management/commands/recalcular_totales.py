@@ -0,0 +1,30 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from garzon.services import comandas_con_totales_incorrectos, recalcular_totales
+
+
+class Command(BaseCommand):
+    help = "Recalcula total y cantidad_items de las comandas, o solo verifica que estén al día"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--verificar', action='store_true',
+            help="No modifica nada; falla si hay comandas con totales desactualizados"
+        )
+
+    def handle(self, *args, **options):
+        if options['verificar']:
+            incorrectas = comandas_con_totales_incorrectos()
+            cantidad = incorrectas.count()
+            for comanda in incorrectas[:20]:
+                self.stdout.write(
+                    f'Comanda #{comanda.id}: total {comanda.total} (real {comanda.total_real}), '
+                    f'items {comanda.cantidad_items} (real {comanda.cantidad_real})'
+                )
+            if cantidad:
+                raise CommandError(f'{cantidad} comanda(s) con totales desactualizados')
+            self.stdout.write(self.style.SUCCESS('Totales de comandas verificados'))
+            return
+
+        actualizadas = recalcular_totales()
+        self.stdout.write(self.style.SUCCESS(f'Totales recalculados: {actualizadas} comanda(s)'))
@@ -0,0 +1,33 @@
+from datetime import date
+
+from django.core.management.base import BaseCommand, CommandError
+
+from garzon.archivo import restaurar
+from garzon.models import ComandaArchivada
+from gerencia.fechas import filtro_rango
+
+
+class Command(BaseCommand):
+    help = "Devuelve comandas archivadas (con sus items) a las tablas de trabajo"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--ids', type=int, nargs='+', help="Ids de las comandas a restaurar")
+        parser.add_argument('--desde', type=date.fromisoformat, help="Fecha de creación inicial (YYYY-MM-DD)")
+        parser.add_argument('--hasta', type=date.fromisoformat, help="Fecha de creación final (YYYY-MM-DD)")
+        parser.add_argument('--lote', type=int, default=500, help="Comandas movidas por transacción")
+
+    def handle(self, *args, **options):
+        if not (options['ids'] or options['desde'] or options['hasta']):
+            raise CommandError('Indique --ids o un rango con --desde/--hasta')
+
+        archivadas = ComandaArchivada.objects.filter(
+            **filtro_rango('created_at', options['desde'], options['hasta'])
+        )
+        if options['ids']:
+            archivadas = archivadas.filter(id__in=options['ids'])
+
+        total = 0
+        for movidas in restaurar(archivadas, options['lote']):
+            total += movidas
+            self.stdout.write(f'Comandas restauradas: {total}')
+        self.stdout.write(self.style.SUCCESS(f'Restauración completada: {total} comanda(s)'))
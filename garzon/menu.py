@@ -0,0 +1,96 @@
+"""
+Catálogo del menú (categoría -> productos activos) cacheado por versión.
+Junto al menú se guarda su JSON ya serializado y un hash del contenido,
+que el endpoint garzon:garzon_menu usa como ETag.
+
+La versión se incrementa cada vez que cambia un Producto o una Categoria
+(ver garzon.signals), así abrir una comanda no consulta el menú en la base
+de datos mientras el catálogo no cambie.
+"""
+import hashlib
+import json
+
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Prefetch
+from .models import Categoria, Producto
+
+CLAVE_VERSION = 'menu:version'
+CLAVE_CATALOGO = 'menu:catalogo'
+# Las versiones viejas expiran solas; la actual se reconstruye al expirar
+DURACION_CATALOGO = 60 * 60 * 24
+
+
+def version_menu():
+    """
+    Versión vigente del catálogo
+    """
+    version = cache.get(CLAVE_VERSION)
+    if version is None:
+        cache.add(CLAVE_VERSION, 1, timeout=None)
+        version = cache.get(CLAVE_VERSION, 1)
+    return version
+
+
+def _incrementar_version():
+    try:
+        cache.incr(CLAVE_VERSION)
+    except ValueError:
+        # La clave no existía (caché reiniciada): cualquier valor nuevo sirve
+        cache.set(CLAVE_VERSION, 1, timeout=None)
+        cache.delete(CLAVE_CATALOGO, version=1)
+
+
+def invalidar_menu():
+    """
+    Marca el catálogo como obsoleto al confirmar la transacción en curso,
+    para que nadie reconstruya la caché con datos aún sin guardar.
+    """
+    transaction.on_commit(_incrementar_version)
+
+
+def construir_menu():
+    """
+    Arma el menú agrupado por categoría con dos consultas
+    """
+    categorias = Categoria.objects.prefetch_related(
+        Prefetch(
+            'productos',
+            queryset=Producto.objects.filter(activo=True).order_by('id'),
+            to_attr='productos_activos'
+        )
+    ).order_by('id')
+
+    menu_por_categoria = {}
+    for categoria in categorias:
+        menu_por_categoria[categoria.nombre] = [
+            {
+                'id': str(producto.id),
+                'nombre': producto.nombre,
+                'precio': float(producto.precio),
+                'ingredientes': producto.descripcion or '',
+                'imagen': producto.imagen_url or '/static/img/ejemplo.png'
+            }
+            for producto in categoria.productos_activos
+        ]
+    return menu_por_categoria
+
+
+def obtener_catalogo():
+    """
+    Devuelve {'menu', 'json', 'hash'} desde la caché, reconstruyéndolo
+    solo si cambió la versión
+    """
+    version = version_menu()
+    catalogo = cache.get(CLAVE_CATALOGO, version=version)
+    if catalogo is None:
+        menu = construir_menu()
+        contenido = json.dumps(menu, ensure_ascii=False, sort_keys=True)
+        hash_menu = hashlib.sha256(contenido.encode('utf-8')).hexdigest()[:16]
+        catalogo = {
+            'menu': menu,
+            'hash': hash_menu,
+            'json': json.dumps({'hash': hash_menu, 'menu': menu}, ensure_ascii=False),
+        }
+        cache.set(CLAVE_CATALOGO, catalogo, timeout=DURACION_CATALOGO, version=version)
+    return catalogo
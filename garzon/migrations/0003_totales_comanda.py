@@ -0,0 +1,36 @@
+# Generated by Django 5.2.7 on 2026-10-18 09:40
+
+from django.db import migrations, models
+from django.db.models import F, OuterRef, Subquery, Sum
+from django.db.models.functions import Coalesce
+
+
+def calcular_totales(apps, schema_editor):
+    Comanda = apps.get_model('garzon', 'Comanda')
+    ComandaItem = apps.get_model('garzon', 'ComandaItem')
+    items = ComandaItem.objects.filter(comanda=OuterRef('pk')).order_by().values('comanda')
+    Comanda.objects.update(
+        total=Coalesce(Subquery(items.annotate(t=Sum(F('cantidad') * F('precio_unitario'))).values('t')), 0),
+        cantidad_items=Coalesce(Subquery(items.annotate(c=Sum('cantidad')).values('c')), 0),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('garzon', '0002_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='comanda',
+            name='cantidad_items',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='comanda',
+            name='total',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.RunPython(calcular_totales, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,45 @@
+# Generated by Django 5.2.7 on 2026-10-18 09:40
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('garzon', '0003_totales_comanda'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='comandaitem',
+            name='comanda',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='items', to='garzon.comanda'),
+        ),
+        migrations.AddIndex(
+            model_name='clienteexterno',
+            index=models.Index(fields=['created_at'], name='cliente_externo_creado_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='comanda',
+            index=models.Index(fields=['estado', 'created_at'], name='comanda_estado_creada_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='comanda',
+            index=models.Index(condition=models.Q(('estado', 'E')), fields=['created_at'], name='comanda_enviada_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='comanda',
+            index=models.Index(fields=['updated_at'], name='comanda_actualizada_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='comandaitem',
+            index=models.Index(fields=['comanda', 'producto'], name='comanda_item_producto_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='producto',
+            index=models.Index(condition=models.Q(('activo', True)), fields=['categoria'], name='producto_activo_idx'),
+        ),
+    ]
@@ -0,0 +1,27 @@
+# Generated by Django 5.2.7 on 2026-10-18 09:48
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('garzon', '0004_indices'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='clienteexterno',
+            name='cliente_externo_creado_idx',
+        ),
+        migrations.AddIndex(
+            model_name='clienteexterno',
+            index=models.Index(fields=['created_at', 'id'], name='cliente_externo_creado_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='comanda',
+            index=models.Index(fields=['created_at', 'id'], name='comanda_creada_id_idx'),
+        ),
+    ]
@@ -0,0 +1,63 @@
+# Generated by Django 5.2.7 on 2026-10-18 09:50
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('garzon', '0005_indices_keyset'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ComandaArchivada',
+            fields=[
+                ('id', models.BigIntegerField(primary_key=True, serialize=False)),
+                ('numero_habitacion', models.PositiveIntegerField(blank=True, null=True)),
+                ('estado', models.CharField(choices=[('P', 'Pendiente'), ('E', 'Enviada'), ('L', 'Lista'), ('A', 'Anulada')], max_length=1)),
+                ('created_at', models.DateTimeField()),
+                ('updated_at', models.DateTimeField()),
+                ('notas_cocina', models.TextField(blank=True, null=True)),
+                ('total', models.PositiveIntegerField(default=0)),
+                ('cantidad_items', models.PositiveIntegerField(default=0)),
+                ('archivada_at', models.DateTimeField(auto_now_add=True)),
+                ('cliente_externo', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, to='garzon.clienteexterno')),
+                ('created_by', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': 'Comanda archivada',
+                'verbose_name_plural': 'Comandas archivadas',
+                'db_table': 'comanda_archivada',
+                'ordering': ['-created_at'],
+            },
+        ),
+        migrations.CreateModel(
+            name='ComandaItemArchivada',
+            fields=[
+                ('id', models.BigIntegerField(primary_key=True, serialize=False)),
+                ('cantidad', models.PositiveIntegerField(default=1)),
+                ('precio_unitario', models.PositiveIntegerField()),
+                ('notas', models.TextField(blank=True, null=True)),
+                ('created_at', models.DateTimeField()),
+                ('comanda', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='items', to='garzon.comandaarchivada')),
+                ('producto', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='garzon.producto')),
+            ],
+            options={
+                'verbose_name': 'Item de comanda archivada',
+                'verbose_name_plural': 'Items de comandas archivadas',
+                'db_table': 'comanda_item_archivada',
+            },
+        ),
+        migrations.AddIndex(
+            model_name='comandaarchivada',
+            index=models.Index(fields=['estado', 'created_at'], name='comanda_arch_estado_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='comandaarchivada',
+            index=models.Index(fields=['created_at', 'id'], name='comanda_arch_creada_id_idx'),
+        ),
+    ]
@@ -0,0 +1,34 @@
+# Generated by Django 5.2.7 on 2026-10-18 10:00
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('garzon', '0006_comandas_archivadas'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ClaveIdempotencia',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('clave', models.CharField(max_length=64)),
+                ('operacion', models.CharField(max_length=50)),
+                ('huella', models.CharField(max_length=64)),
+                ('respuesta', models.JSONField(null=True)),
+                ('status', models.PositiveSmallIntegerField(default=200)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('usuario', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'db_table': 'clave_idempotencia',
+                'indexes': [models.Index(fields=['created_at'], name='clave_idempotencia_creada_idx')],
+                'constraints': [models.UniqueConstraint(fields=('usuario', 'clave'), name='clave_idempotencia_unica')],
+            },
+        ),
+    ]
@@ -1,4 +1,5 @@
 from django.db import models
+from django.db.models import Q
 from django.conf import settings
 from django.utils import timezone
 from django.core.validators import MinValueValidator
@@ -39,6 +40,10 @@ class Producto(models.Model):
         db_table = 'producto'
         verbose_name = 'Producto'
         verbose_name_plural = 'Productos'
+        indexes = [
+            # Menú del garzón: solo productos activos por categoría
+            models.Index(fields=['categoria'], condition=Q(activo=True), name='producto_activo_idx'),
+        ]
     
     def __str__(self):
         return f"{self.nombre} - ${self.precio}"
@@ -50,6 +55,10 @@ class ClienteExterno(models.Model):
     
     class Meta:
         db_table = 'cliente_externo'
+        indexes = [
+            # Listado paginado por cursor (created_at, id)
+            models.Index(fields=['created_at', 'id'], name='cliente_externo_creado_id_idx'),
+        ]
     
     def __str__(self):
         return self.nombre
@@ -65,6 +74,8 @@ class Comanda(models.Model):
         ('L', 'Lista'),          # Preparada y lista (cocina)
         ('A', 'Anulada'),        # Cancelada
     )
+    # Comandas que todavía se pueden atender
+    ESTADOS_ABIERTOS = ('P', 'E')
     
     numero_habitacion = models.PositiveIntegerField(null=True, blank=True)
     cliente_externo = models.ForeignKey(ClienteExterno, on_delete=models.CASCADE, null=True, blank=True)
@@ -76,11 +87,25 @@ class Comanda(models.Model):
     # Notas específicas para cocina
     notas_cocina = models.TextField(blank=True, null=True)
 
+    # Totales desnormalizados, se mantienen al sincronizar los items
+    total = models.PositiveIntegerField(default=0)
+    cantidad_items = models.PositiveIntegerField(default=0)
+
     class Meta:
         db_table = 'comanda'
         verbose_name = 'Comanda'
         verbose_name_plural = 'Comandas'
         ordering = ['-created_at']
+        indexes = [
+            # Reportes y listados por estado y fecha
+            models.Index(fields=['estado', 'created_at'], name='comanda_estado_creada_idx'),
+            # Tablero de cocina: solo las comandas enviadas
+            models.Index(fields=['created_at'], condition=Q(estado='E'), name='comanda_enviada_idx'),
+            # Refresco incremental de resúmenes
+            models.Index(fields=['updated_at'], name='comanda_actualizada_idx'),
+            # Recorridos por fecha sin filtrar estado (exportaciones)
+            models.Index(fields=['created_at', 'id'], name='comanda_creada_id_idx'),
+        ]
 
     def __str__(self):
         if self.cliente_externo:
@@ -99,10 +124,6 @@ class Comanda(models.Model):
     def tiempo_transcurrido(self):
         """Calcula tiempo desde creación (para cocina)"""
         return timezone.now() - self.created_at
-    
-    def total(self):
-        """Calcula el total de la comanda"""
-        return sum(item.subtotal() for item in self.items.all())
 
 
 class ComandaItem(models.Model):
@@ -110,7 +131,8 @@ class ComandaItem(models.Model):
     Items individuales de cada comanda
     Relaciona Producto con Comanda
     """
-    comanda = models.ForeignKey(Comanda, related_name='items', on_delete=models.CASCADE)
+    # Sin índice propio: lo cubre comanda_item_producto_idx
+    comanda = models.ForeignKey(Comanda, related_name='items', on_delete=models.CASCADE, db_index=False)
     producto = models.ForeignKey(Producto, on_delete=models.CASCADE)
     cantidad = models.PositiveIntegerField(default=1)
     precio_unitario = models.PositiveIntegerField(
@@ -124,9 +146,93 @@ class ComandaItem(models.Model):
         db_table = 'comanda_item'
         verbose_name = 'Item de Comanda'
         verbose_name_plural = 'Items de Comanda'
+        indexes = [
+            models.Index(fields=['comanda', 'producto'], name='comanda_item_producto_idx'),
+        ]
 
     def subtotal(self):
         return self.precio_unitario * self.cantidad
 
     def __str__(self):
-        return f"{self.cantidad}x {self.producto.nombre} - Comanda {self.comanda.id}"
\ No newline at end of file
+        return f"{self.cantidad}x {self.producto.nombre} - Comanda {self.comanda.id}"
+
+class ComandaArchivada(models.Model):
+    """
+    Comandas cerradas (listas o anuladas) movidas fuera de la tabla de
+    trabajo por `archivar_comandas`. Conservan el id y las fechas originales.
+    """
+    id = models.BigIntegerField(primary_key=True)
+    numero_habitacion = models.PositiveIntegerField(null=True, blank=True)
+    cliente_externo = models.ForeignKey(ClienteExterno, on_delete=models.CASCADE, null=True, blank=True)
+    estado = models.CharField(max_length=1, choices=Comanda.ESTADOS)
+    created_by = models.ForeignKey(settings.AUTH_USER_MODEL, null=True, blank=True, on_delete=models.SET_NULL)
+    created_at = models.DateTimeField()
+    updated_at = models.DateTimeField()
+    notas_cocina = models.TextField(blank=True, null=True)
+    total = models.PositiveIntegerField(default=0)
+    cantidad_items = models.PositiveIntegerField(default=0)
+    archivada_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        db_table = 'comanda_archivada'
+        verbose_name = 'Comanda archivada'
+        verbose_name_plural = 'Comandas archivadas'
+        ordering = ['-created_at']
+        indexes = [
+            # Resúmenes de ventas por día
+            models.Index(fields=['estado', 'created_at'], name='comanda_arch_estado_idx'),
+            # Exportaciones por fecha
+            models.Index(fields=['created_at', 'id'], name='comanda_arch_creada_id_idx'),
+        ]
+
+    def __str__(self):
+        return f"Comanda archivada #{self.id} - {self.get_estado_display()}"
+
+
+class ComandaItemArchivada(models.Model):
+    """
+    Items de una comanda archivada, con los mismos campos que ComandaItem
+    """
+    id = models.BigIntegerField(primary_key=True)
+    comanda = models.ForeignKey(ComandaArchivada, related_name='items', on_delete=models.CASCADE)
+    producto = models.ForeignKey(Producto, on_delete=models.CASCADE)
+    cantidad = models.PositiveIntegerField(default=1)
+    precio_unitario = models.PositiveIntegerField()
+    notas = models.TextField(blank=True, null=True)
+    created_at = models.DateTimeField()
+
+    class Meta:
+        db_table = 'comanda_item_archivada'
+        verbose_name = 'Item de comanda archivada'
+        verbose_name_plural = 'Items de comandas archivadas'
+
+    def subtotal(self):
+        return self.precio_unitario * self.cantidad
+
+class ClaveIdempotencia(models.Model):
+    """
+    Respuestas de envíos del garzón ya aplicados, por clave generada en el
+    navegador (cabecera Idempotency-Key). Un reintento con la misma clave
+    recibe la respuesta guardada en vez de aplicarse otra vez.
+    Se borran pasado TTL_CLAVES con `purgar_claves_idempotencia`.
+    """
+    usuario = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE)
+    clave = models.CharField(max_length=64)
+    operacion = models.CharField(max_length=50)
+    huella = models.CharField(max_length=64)  # sha256 de la petición
+    respuesta = models.JSONField(null=True)
+    status = models.PositiveSmallIntegerField(default=200)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        db_table = 'clave_idempotencia'
+        constraints = [
+            models.UniqueConstraint(fields=['usuario', 'clave'], name='clave_idempotencia_unica'),
+        ]
+        indexes = [
+            # Limpieza por antigüedad
+            models.Index(fields=['created_at'], name='clave_idempotencia_creada_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.operacion} {self.clave}"
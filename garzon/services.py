@@ -0,0 +1,140 @@
+from django.db import transaction
+from django.db.models import F, OuterRef, Q, Subquery, Sum
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+from .models import Comanda, ComandaItem, Producto
+
+
+def _normalizar_items(items):
+    """
+    Agrupa los items recibidos del garzón por producto.
+    Devuelve {producto_id: {'cantidad': int, 'notas': str}} y descarta
+    las entradas sin id válido o sin cantidad positiva.
+    """
+    normalizados = {}
+    for it in items:
+        try:
+            producto_id = int(it.get('id'))
+            cantidad = int(it.get('cantidad', 1))
+        except (AttributeError, TypeError, ValueError):
+            continue
+        if cantidad < 1:
+            continue
+        if producto_id in normalizados:
+            normalizados[producto_id]['cantidad'] += cantidad
+        else:
+            normalizados[producto_id] = {
+                'cantidad': cantidad,
+                'notas': it.get('ingredientes', '') or '',
+            }
+    return normalizados
+
+
+def sincronizar_items(comanda, items):
+    """
+    Deja los items de la comanda iguales a la lista recibida aplicando solo
+    las diferencias (crear, actualizar, borrar) en una única transacción.
+
+    Cuesta un número fijo de consultas sin importar cuántos items lleguen.
+    Los items que ya existían conservan su precio_unitario (precio al momento
+    del pedido); los nuevos toman el precio actual del producto.
+    En la misma transacción actualiza total y cantidad_items de la comanda
+    (y updated_at, para el refresco incremental de ventas) y deja en
+    comanda.estado el estado leído con la fila bloqueada.
+    Devuelve la lista final de items.
+    """
+    deseados = _normalizar_items(items)
+
+    with transaction.atomic():
+        # Bloquear la comanda evita que dos guardados simultáneos dupliquen items
+        comanda.estado = Comanda.objects.select_for_update().values_list(
+            'estado', flat=True
+        ).get(pk=comanda.pk)
+
+        productos = Producto.objects.in_bulk(list(deseados))
+
+        existentes = {}
+        por_borrar = []
+        for item in ComandaItem.objects.filter(comanda=comanda):
+            if item.producto_id in existentes:
+                por_borrar.append(item.id)  # Duplicado de un guardado anterior
+            else:
+                existentes[item.producto_id] = item
+
+        por_crear = []
+        por_actualizar = []
+        finales = []
+        for producto_id, datos in deseados.items():
+            producto = productos.get(producto_id)
+            if producto is None:
+                continue  # Producto inexistente: se ignora
+            item = existentes.pop(producto_id, None)
+            if item is None:
+                item = ComandaItem(
+                    comanda=comanda,
+                    producto=producto,
+                    cantidad=datos['cantidad'],
+                    precio_unitario=producto.precio,
+                    notas=datos['notas']
+                )
+                por_crear.append(item)
+            elif item.cantidad != datos['cantidad'] or (item.notas or '') != datos['notas']:
+                item.cantidad = datos['cantidad']
+                item.notas = datos['notas']
+                por_actualizar.append(item)
+            finales.append(item)
+
+        por_borrar.extend(item.id for item in existentes.values())
+
+        if por_borrar:
+            ComandaItem.objects.filter(id__in=por_borrar).delete()
+        if por_crear:
+            ComandaItem.objects.bulk_create(por_crear)
+        if por_actualizar:
+            ComandaItem.objects.bulk_update(por_actualizar, ['cantidad', 'notas'])
+
+        # Totales calculados en memoria, sin volver a leer los items
+        comanda.total = sum(item.subtotal() for item in finales)
+        comanda.cantidad_items = sum(item.cantidad for item in finales)
+        comanda.updated_at = timezone.now()
+        Comanda.objects.filter(pk=comanda.pk).update(
+            total=comanda.total,
+            cantidad_items=comanda.cantidad_items,
+            updated_at=comanda.updated_at
+        )
+
+    return finales
+
+
+def _totales_reales():
+    """
+    Subconsultas con el total y la cantidad de items calculados desde ComandaItem
+    """
+    items = ComandaItem.objects.filter(comanda=OuterRef('pk')).order_by().values('comanda')
+    total = Subquery(items.annotate(t=Sum(F('cantidad') * F('precio_unitario'))).values('t'))
+    cantidad = Subquery(items.annotate(c=Sum('cantidad')).values('c'))
+    return Coalesce(total, 0), Coalesce(cantidad, 0)
+
+
+def recalcular_totales(comandas=None):
+    """
+    Recalcula total y cantidad_items de todas las comandas (o del queryset
+    dado) con un único UPDATE. Devuelve la cantidad de filas actualizadas.
+    """
+    if comandas is None:
+        comandas = Comanda.objects.all()
+    total, cantidad = _totales_reales()
+    return comandas.order_by().update(total=total, cantidad_items=cantidad)
+
+
+def comandas_con_totales_incorrectos(comandas=None):
+    """
+    Comandas cuyos totales guardados no coinciden con sus items
+    """
+    if comandas is None:
+        comandas = Comanda.objects.all()
+    total, cantidad = _totales_reales()
+    return comandas.annotate(
+        total_real=total,
+        cantidad_real=cantidad
+    ).filter(~Q(total=F('total_real')) | ~Q(cantidad_items=F('cantidad_real')))
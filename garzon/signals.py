@@ -0,0 +1,13 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from .menu import invalidar_menu
+from .models import Categoria, Producto
+
+
+@receiver([post_save, post_delete], sender=Producto)
+@receiver([post_save, post_delete], sender=Categoria)
+def invalidar_menu_al_cambiar(sender, **kwargs):
+    """
+    Cualquier cambio en productos o categorías (incluidos los precios) invalida el menú
+    """
+    invalidar_menu()
@@ -1,3 +1,142 @@
+import json
+from datetime import timedelta
+
 from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from gerencia.fechas import hoy
+from gerencia.models import VentaDiaria
+from gerencia.rollups import refrescar_incremental
+from login.models import Usuario
+from .models import Categoria, ClaveIdempotencia, Comanda, Producto
+
+
+class GarzonTestCase(TestCase):
+    def setUp(self):
+        self.garzon = Usuario.objects.create_user('garzon', password='x', rol='garzon', is_active=True)
+        self.client.force_login(self.garzon)
+        categoria = Categoria.objects.create(nombre='Fondos')
+        self.producto = Producto.objects.create(nombre='Lomo', precio=1000, categoria=categoria)
+
+
+class EnviarComandaTests(GarzonTestCase):
+    def guardar(self, comanda, cantidad):
+        return self.client.post(
+            reverse('garzon:garzon_guardar_items', args=[comanda.id]),
+            json.dumps({'items': [{'id': self.producto.id, 'cantidad': cantidad}]}),
+            content_type='application/json',
+        )
+
+    def enviar(self, comanda, cantidad=1, clave='clave-1'):
+        return self.client.post(
+            reverse('garzon:garzon_enviar_comanda', args=[comanda.id]),
+            json.dumps({'items': [{'id': self.producto.id, 'cantidad': cantidad}], 'notas_cocina': 'sin sal'}),
+            content_type='application/json',
+            headers={'Idempotency-Key': clave},
+        )
+
+    def test_enviar_pasa_la_comanda_a_cocina(self):
+        comanda = Comanda.objects.create(numero_habitacion=1)
+        self.assertEqual(self.enviar(comanda).status_code, 200)
+        comanda.refresh_from_db()
+        self.assertEqual((comanda.estado, comanda.notas_cocina, comanda.cantidad_items), ('E', 'sin sal', 1))
+
+    def test_reenviar_una_comanda_en_cocina(self):
+        comanda = Comanda.objects.create(numero_habitacion=1, estado='E')
+        self.assertEqual(self.enviar(comanda, cantidad=3).status_code, 200)
+        comanda.refresh_from_db()
+        self.assertEqual((comanda.estado, comanda.cantidad_items), ('E', 3))
+
+    def test_una_comanda_cerrada_no_vuelve_a_cocina(self):
+        for estado in ('L', 'A'):
+            comanda = Comanda.objects.create(numero_habitacion=1, estado=estado)
+            respuesta = self.enviar(comanda, clave=f'clave-{estado}')
+            self.assertEqual(respuesta.status_code, 409)
+            comanda.refresh_from_db()
+            self.assertEqual((comanda.estado, comanda.cantidad_items), (estado, 0))
+
+    def test_editar_una_comanda_enviada_actualiza_las_ventas(self):
+        comanda = Comanda.objects.create(numero_habitacion=1)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.enviar(comanda, cantidad=2)
+        refrescar_incremental()
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.assertEqual(self.guardar(comanda, 5).status_code, 200)
+        venta = VentaDiaria.objects.get(fecha=hoy())
+        self.assertEqual((venta.unidades, venta.ingresos), (5, 5000))
+
+    def test_el_refresco_incremental_ve_los_items_editados(self):
+        comanda = Comanda.objects.create(numero_habitacion=1)
+        self.enviar(comanda, cantidad=2)
+        # La marca queda más allá de la comanda (y de su margen)
+        Comanda.objects.filter(pk=comanda.pk).update(updated_at=timezone.now() - timedelta(hours=1))
+        refrescar_incremental()
+
+        self.guardar(comanda, 5)
+        self.assertEqual(refrescar_incremental(), 1)
+        self.assertEqual(VentaDiaria.objects.get(fecha=hoy()).unidades, 5)
+
+
+class EnviosIdempotentesTests(GarzonTestCase):
+    def setUp(self):
+        super().setUp()
+        self.comanda = Comanda.objects.create(numero_habitacion=1)
+
+    def guardar(self, cantidad, clave=None):
+        headers = {'Idempotency-Key': clave} if clave else {}
+        return self.client.post(
+            reverse('garzon:garzon_guardar_items', args=[self.comanda.id]),
+            json.dumps({'items': [{'id': self.producto.id, 'cantidad': cantidad}]}),
+            content_type='application/json',
+            headers=headers,
+        )
+
+    def cantidad_guardada(self):
+        return self.comanda.items.get().cantidad
+
+    def test_la_misma_clave_se_aplica_una_vez(self):
+        primera = self.guardar(2, clave='k1')
+        self.guardar(7)  # Otro cambio, sin clave, entre los dos intentos
+        reintento = self.guardar(2, clave='k1')
+
+        self.assertEqual(reintento.status_code, primera.status_code)
+        self.assertJSONEqual(reintento.content, primera.json())
+        self.assertEqual(self.cantidad_guardada(), 7)
+        self.assertEqual(ClaveIdempotencia.objects.count(), 1)
+
+    def test_la_misma_clave_con_otro_envio_se_rechaza(self):
+        self.guardar(2, clave='k1')
+        respuesta = self.guardar(3, clave='k1')
+        self.assertEqual(respuesta.status_code, 422)
+        self.assertEqual(self.cantidad_guardada(), 2)
+
+    def test_un_envio_rechazado_no_detiene_el_lote(self):
+        lista = Comanda.objects.create(numero_habitacion=2, estado='L')
+        item = {'id': self.producto.id, 'cantidad': 1}
+        envios = [
+            {'clave': 'b1', 'operacion': 'guardar', 'comanda': self.comanda.id, 'items': [item]},
+            {'clave': 'b2', 'operacion': 'enviar', 'comanda': lista.id, 'items': [item]},
+            {'clave': 'b3', 'operacion': 'enviar', 'comanda': 999999, 'items': [item]},
+            {'clave': 'b4', 'operacion': 'enviar', 'comanda': self.comanda.id, 'items': [item]},
+        ]
+        respuesta = self.client.post(
+            reverse('garzon:garzon_sincronizar_envios'),
+            json.dumps({'envios': envios}),
+            content_type='application/json',
+        )
 
-# Create your tests here.
+        resultados = respuesta.json()['resultados']
+        self.assertEqual(
+            [(r['clave'], r['status']) for r in resultados],
+            [('b1', 200), ('b2', 409), ('b3', 404), ('b4', 200)]
+        )
+        self.comanda.refresh_from_db()
+        lista.refresh_from_db()
+        self.assertEqual((self.comanda.estado, lista.estado), ('E', 'L'))
+        self.assertFalse(lista.items.exists())
+        # Solo quedan registradas las claves de los envíos aplicados
+        self.assertEqual(
+            set(ClaveIdempotencia.objects.values_list('clave', flat=True)), {'b1', 'b4'}
+        )
@@ -1,13 +1,21 @@
 import json
-from django.shortcuts import render, redirect, get_object_or_404
+from asgiref.sync import sync_to_async
+from django.shortcuts import render, redirect, get_object_or_404, aget_object_or_404
 from django.contrib.auth.decorators import login_required
 from django.views.decorators.http import require_POST
-from django.utils.timezone import now
-from datetime import timedelta
-from django.http import JsonResponse
+from django.http import HttpResponse, HttpResponseNotModified, JsonResponse
 from django.urls import reverse
 from django.views.decorators.csrf import csrf_exempt
-from .models import Comanda, ComandaItem, ClienteExterno, Producto, Categoria
+from django.db import transaction
+from django.db.models import Count, Q
+from Sistema_Comandas.paginacion import paginar
+from cocina.eventos import notificar_comanda_enviada
+from gerencia.rollups import ESTADOS_VENTA, actualizar_venta_de_comanda
+from .estados import TransicionInvalida, transicionar
+from .idempotencia import ClaveReutilizada, LARGO_MAXIMO_CLAVE, clave_de, ejecutar_una_vez
+from .menu import obtener_catalogo
+from .models import Comanda, ClienteExterno
+from .services import sincronizar_items
 
 @login_required
 def garzon_home(request):
@@ -29,117 +37,190 @@ def crear_comanda(request):
 def comanda_detail(request, comanda_id):
     comanda = get_object_or_404(Comanda, id=comanda_id)
     
-    # Obtener productos organizados por categoría desde la base de datos
-    categorias = Categoria.objects.prefetch_related('productos').all()
-    menu_por_categoria = {}
-    
-    for categoria in categorias:
-        menu_por_categoria[categoria.nombre] = [
-            {
-                'id': str(producto.id),
-                'nombre': producto.nombre,
-                'precio': float(producto.precio),
-                'ingredientes': producto.descripcion or '',
-                'imagen': producto.imagen_url or '/static/img/ejemplo.png'
-            }
-            for producto in categoria.productos.filter(activo=True)
-        ]
-    
+    # El menú lo descarga el navegador desde garzon:garzon_menu; aquí solo
+    # va su hash para que reutilice la copia guardada si no cambió
     items = comanda.items.all()
     return render(request, 'comanda_detail.html', {
         'comanda': comanda,
         'items': items,
-        'menu': menu_por_categoria,
+        'menu_hash': obtener_catalogo()['hash'],
     })
 
 @login_required
-@require_POST
-def guardar_items(request, comanda_id):
-    comanda = get_object_or_404(Comanda, id=comanda_id)
+async def menu_json(request):
+    """
+    Menú activo en JSON con ETag. Pedido con ?v=<hash> vigente se puede
+    cachear indefinidamente: un cambio de menú produce otra URL.
+    """
+    catalogo = await sync_to_async(obtener_catalogo)()
+    etag = f'"{catalogo["hash"]}"'
+
+    if request.headers.get('If-None-Match') == etag:
+        response = HttpResponseNotModified()
+    else:
+        response = HttpResponse(catalogo['json'], content_type='application/json')
+
+    response['ETag'] = etag
+    if request.GET.get('v') == catalogo['hash']:
+        response['Cache-Control'] = 'private, max-age=31536000, immutable'
+    else:
+        response['Cache-Control'] = 'private, no-cache'
+    return response
+
+def _enviar_a_cocina(comanda, items, notas):
+    """
+    Pasa la comanda a 'E' (o la reenvía si ya estaba en cocina) y guarda los
+    items y las notas en una transacción; cocina y los resúmenes se
+    actualizan al confirmarla. TransicionInvalida si ya está lista o
+    anulada: un envío reintentado horas después no la devuelve a cocina.
+    """
+    with transaction.atomic():
+        # El UPDATE condicional va primero: bloquea la fila hasta confirmar
+        if not transicionar(comanda.id, 'E'):
+            raise TransicionInvalida("La comanda ya no está abierta")
+        comanda.estado = 'E'  # Enviada
+        if items:
+            sincronizar_items(comanda, items)
+        comanda.notas_cocina = notas
+        comanda.save(update_fields=['notas_cocina'])
+        notificar_comanda_enviada(comanda.id)
+        actualizar_venta_de_comanda(comanda)
+
+def _guardar(comanda, data):
+    with transaction.atomic():
+        sincronizar_items(comanda, data.get('items', []))
+        # Una comanda ya enviada cambia lo que ve cocina y lo vendido en su día
+        if comanda.estado in ESTADOS_VENTA:
+            notificar_comanda_enviada(comanda.id)
+            actualizar_venta_de_comanda(comanda)
+    return {'ok': True}, 200
+
+def _enviar(comanda, data):
+    _enviar_a_cocina(comanda, data.get('items', []), data.get('notas_cocina', ''))
+    return {'ok': True, 'redirect': reverse('garzon:garzon_home')}, 200
+
+# Envíos que el garzón puede reintentar o dejar en cola sin conexión
+OPERACIONES = {'guardar': _guardar, 'enviar': _enviar}
+# Máximo de envíos por petición en sincronizar_envios
+MAX_ENVIOS_LOTE = 50
+
+def _aplicar(usuario, clave, operacion, comanda, data):
+    """
+    Aplica la operación una sola vez por clave (ver garzon.idempotencia).
+    Transaccional: corre en el hilo sincrónico de la petición.
+    """
+    try:
+        return ejecutar_una_vez(
+            usuario, clave, operacion, [comanda.id, data],
+            lambda: OPERACIONES[operacion](comanda, data)
+        )
+    except ClaveReutilizada:
+        return {'ok': False, 'error': 'La clave ya se usó con otro envío'}, 422
+    except TransicionInvalida as e:
+        # La clave no queda registrada: la operación se deshizo completa
+        return {'ok': False, 'error': str(e)}, 409
+
+async def _responder(request, comanda_id, operacion):
+    try:
+        clave = clave_de(request)
+    except ValueError as e:
+        return JsonResponse({'ok': False, 'error': str(e)}, status=400)
+    comanda = await aget_object_or_404(Comanda, id=comanda_id)
     data = json.loads(request.body.decode('utf-8') or '{}')
-    items = data.get('items', [])
-
-    comanda.items.all().delete()
-    for it in items:
-        try:
-            producto = Producto.objects.get(id=it.get('id'))
-            ComandaItem.objects.create(
-                comanda=comanda,
-                producto=producto,
-                cantidad=it.get('cantidad', 1),
-                precio_unitario=producto.precio,
-                notas=it.get('ingredientes', '')
-            )
-        except Producto.DoesNotExist:
-            ComandaItem.objects.create(
-                comanda=comanda,
-                nombre=it.get('nombre'),
-                precio=it.get('precio'),
-                cantidad=it.get('cantidad', 1),
-                ingredientes=it.get('ingredientes', ''),
-                imagen=it.get('imagen', '')
+
+    respuesta, status = await sync_to_async(_aplicar)(request.user, clave, operacion, comanda, data)
+    return JsonResponse(respuesta, status=status)
+
+@login_required
+@require_POST
+async def guardar_items(request, comanda_id):
+    return await _responder(request, comanda_id, 'guardar')
+
+@login_required
+@require_POST
+async def enviar_comanda(request, comanda_id):
+    return await _responder(request, comanda_id, 'enviar')
+
+def _aplicar_envios(usuario, envios):
+    """
+    Aplica en orden los envíos de un lote, cada uno en su transacción:
+    uno rechazado no deshace los demás
+    """
+    comandas = Comanda.objects.in_bulk([envio['comanda'] for envio in envios])
+    resultados = []
+    for envio in envios:
+        comanda = comandas.get(envio['comanda'])
+        if comanda is None:
+            respuesta, status = {'ok': False, 'error': 'Comanda no encontrada'}, 404
+        else:
+            respuesta, status = _aplicar(
+                usuario, envio['clave'], envio['operacion'], comanda, envio['datos']
             )
-    
-    return JsonResponse({'ok': True})
+        resultados.append({'clave': envio['clave'], 'status': status, 'respuesta': respuesta})
+    return resultados
 
 @login_required
 @require_POST
-def enviar_comanda(request, comanda_id):
-    comanda = get_object_or_404(Comanda, id=comanda_id)
-    data = json.loads(request.body.decode('utf-8') or '{}')
-    items = data.get('items', [])
-    notas = data.get('notas_cocina', '')
-
-    if items:
-        comanda.items.all().delete()
-        for it in items:
-            try:
-                producto = Producto.objects.get(id=it.get('id'))
-                ComandaItem.objects.create(
-                    comanda=comanda,
-                    producto=producto,
-                    cantidad=it.get('cantidad', 1),
-                    precio_unitario=producto.precio,
-                    notas=it.get('ingredientes', '')
-                )
-            except Producto.DoesNotExist:
-                ComandaItem.objects.create(
-                    comanda=comanda,
-                    nombre=it.get('nombre'),
-                    precio=it.get('precio'),
-                    cantidad=it.get('cantidad', 1),
-                    ingredientes=it.get('ingredientes', ''),
-                    imagen=it.get('imagen', '')
-                )
-    comanda.notas_cocina = notas
-    comanda.estado = 'E'  # Enviada
-    comanda.save()
-    return JsonResponse({'ok': True, 'redirect': reverse('garzon:garzon_home')})
+async def sincronizar_envios(request):
+    """
+    Recibe varios envíos en cola (guardar/enviar) de un dispositivo que
+    estuvo sin conexión, en una sola petición:
+    {"envios": [{"clave", "operacion", "comanda", "items", "notas_cocina"}, ...]}
+    Cada envío necesita su clave de idempotencia; el resultado de cada uno
+    va en "resultados", en el mismo orden.
+    """
+    try:
+        data = json.loads(request.body.decode('utf-8') or '{}')
+        envios = []
+        for envio in data.get('envios', []):
+            clave = str(envio.get('clave') or '').strip()
+            if not clave or len(clave) > LARGO_MAXIMO_CLAVE or envio.get('operacion') not in OPERACIONES:
+                raise ValueError(clave)
+            envios.append({
+                'clave': clave,
+                'operacion': envio['operacion'],
+                'comanda': int(envio.get('comanda')),
+                'datos': {k: v for k, v in envio.items() if k not in ('clave', 'operacion', 'comanda')},
+            })
+    except (ValueError, TypeError, AttributeError):
+        return JsonResponse({'ok': False, 'error': 'Datos inválidos'}, status=400)
+    if len(envios) > MAX_ENVIOS_LOTE:
+        return JsonResponse(
+            {'ok': False, 'error': f'Máximo {MAX_ENVIOS_LOTE} envíos por petición'}, status=400
+        )
+
+    resultados = await sync_to_async(_aplicar_envios)(request.user, envios)
+    return JsonResponse({'ok': True, 'resultados': resultados})
 
 @login_required
 def clientes_externos(request):
-    clientes = ClienteExterno.objects.order_by('-created_at')
-    lista = []
-    for c in clientes:
-        diff = now() - c.created_at
-        if diff < timedelta(minutes=1):
-            tiempo = "unos segundos"
-        elif diff < timedelta(hours=1):
-            tiempo = f"{int(diff.seconds/60)} min"
-        else:
-            tiempo = f"{int(diff.seconds/3600)} h"
-        lista.append({"id": c.id, "nombre": c.nombre, "tiempo": tiempo})
-    return render(request, 'clientes_externos.html', {'clientes': lista})
+    """
+    Clientes externos con una comanda abierta (pendiente o en cocina).
+    El tiempo transcurrido lo muestra el navegador a partir de created_at.
+    """
+    # Una sola consulta agrupada: desde las comandas abiertas hacia su cliente
+    abiertos = ClienteExterno.objects.filter(
+        comanda__estado__in=Comanda.ESTADOS_ABIERTOS
+    ).annotate(
+        en_cocina=Count('comanda', filter=Q(comanda__estado='E'))
+    ).only('id', 'nombre', 'created_at')
+    clientes = paginar(
+        abiertos, ('-created_at', '-id'),
+        despues=request.GET.get('despues'),
+        antes=request.GET.get('antes'),
+        tamano=30
+    )
+    return render(request, 'clientes_externos.html', {'clientes': clientes})
 
 @csrf_exempt
-def agregar_cliente_externo(request):
+async def agregar_cliente_externo(request):
     if request.method == "POST":
         data = json.loads(request.body)
         nombre = data.get("nombre")
         if not nombre:
             return JsonResponse({"ok": False})
-        cliente = ClienteExterno.objects.create(nombre=nombre)
-        comanda = Comanda.objects.create(cliente_externo=cliente, estado='P')
+        cliente = await ClienteExterno.objects.acreate(nombre=nombre)
+        await Comanda.objects.acreate(cliente_externo=cliente, estado='P')
         return JsonResponse({"ok": True, "id": cliente.id, "nombre": cliente.nombre})
     return JsonResponse({"ok": False})
 
@@ -0,0 +1,155 @@
+"""
+Exportaciones de datos crudos (comandas, items e historial de precios).
+
+Las filas se leen con values_list().iterator() y se escriben a medida que
+se envían, así exportar un año completo usa memoria constante. Comandas e
+items se leen de la tabla de trabajo y del archivo (garzon.archivo) y se
+intercalan por fecha.
+
+Bajo ASGI (daphne) la respuesta debe recibir un iterador asíncrono
+(en_bloques): con uno sincrónico Django lo consume completo en memoria
+antes de enviar el primer byte.
+"""
+import csv
+import heapq
+import json
+from datetime import datetime
+from itertools import islice
+
+from asgiref.sync import sync_to_async
+from django.utils import timezone
+
+from garzon.archivo import FUENTES
+from .fechas import filtro_rango, zona_hotel
+from .models import HistorialPrecio
+
+# Filas que se traen de la base de datos por cada viaje
+TAMANO_BLOQUE = 2000
+# Líneas que se envían al cliente por cada paso al hilo de la base de datos
+LINEAS_POR_ENVIO = 500
+
+
+class Eco:
+    """
+    Objeto con write() que devuelve lo escrito, para que csv.writer
+    genere cada línea sin acumularla en un buffer
+    """
+
+    def write(self, valor):
+        return valor
+
+
+def _comandas(desde, hasta):
+    return [
+        modelo_comanda.objects.filter(
+            **filtro_rango('created_at', desde, hasta)
+        ).order_by('created_at', 'id')
+        for modelo_comanda, _ in FUENTES
+    ]
+
+
+def _items(desde, hasta):
+    return [
+        modelo_item.objects.filter(
+            **filtro_rango('comanda__created_at', desde, hasta)
+        ).order_by('comanda__created_at', 'comanda_id', 'id')
+        for _, modelo_item in FUENTES
+    ]
+
+
+def _historial(desde, hasta):
+    return [
+        HistorialPrecio.objects.filter(
+            **filtro_rango('fecha_cambio', desde, hasta)
+        ).order_by('fecha_cambio', 'id')
+    ]
+
+
+# nombre: (querysets por rango de fechas, campos de orden para intercalarlos, [(columna, campo)])
+EXPORTACIONES = {
+    'comandas': (_comandas, ['created_at', 'id'], [
+        ('id', 'id'),
+        ('creada', 'created_at'),
+        ('actualizada', 'updated_at'),
+        ('estado', 'estado'),
+        ('habitacion', 'numero_habitacion'),
+        ('cliente_externo', 'cliente_externo__nombre'),
+        ('garzon', 'created_by__username'),
+        ('cantidad_items', 'cantidad_items'),
+        ('total', 'total'),
+        ('notas_cocina', 'notas_cocina'),
+    ]),
+    'items': (_items, ['comanda__created_at', 'comanda_id'], [
+        ('comanda_id', 'comanda_id'),
+        ('comanda_creada', 'comanda__created_at'),
+        ('comanda_estado', 'comanda__estado'),
+        ('producto_id', 'producto_id'),
+        ('producto', 'producto__nombre'),
+        ('categoria', 'producto__categoria__nombre'),
+        ('cantidad', 'cantidad'),
+        ('precio_unitario', 'precio_unitario'),
+        ('notas', 'notas'),
+    ]),
+    'historial_precios': (_historial, ['fecha_cambio', 'id'], [
+        ('id', 'id'),
+        ('fecha_cambio', 'fecha_cambio'),
+        ('producto_id', 'producto_id'),
+        ('producto', 'producto__nombre'),
+        ('precio_anterior', 'precio_anterior'),
+        ('precio_nuevo', 'precio_nuevo'),
+        ('razon', 'razon_cambio'),
+        ('usuario', 'usuario__username'),
+    ]),
+}
+
+
+def _valor(valor):
+    # Las fechas se exportan en la hora del hotel
+    if isinstance(valor, datetime):
+        return timezone.localtime(valor, zona_hotel()).isoformat()
+    return valor
+
+
+def filas(nombre, desde, hasta):
+    """
+    Encabezados y un iterador de filas (tuplas) de una exportación
+    """
+    consultas, orden, columnas = EXPORTACIONES[nombre]
+    campos = [campo for _, campo in columnas]
+    posiciones = [campos.index(campo) for campo in orden]
+    valores = heapq.merge(
+        *(queryset.values_list(*campos).iterator(chunk_size=TAMANO_BLOQUE) for queryset in consultas(desde, hasta)),
+        key=lambda fila: [fila[i] for i in posiciones]
+    )
+    return [columna for columna, _ in columnas], (tuple(_valor(v) for v in fila) for fila in valores)
+
+
+def lineas_csv(encabezados, datos):
+    escritor = csv.writer(Eco())
+    # BOM para que Excel reconozca el UTF-8 (tildes y ñ)
+    yield '\ufeff' + escritor.writerow(encabezados)
+    for fila in datos:
+        yield escritor.writerow(fila)
+
+
+def lineas_ndjson(encabezados, datos):
+    for fila in datos:
+        yield json.dumps(dict(zip(encabezados, fila)), ensure_ascii=False) + '\n'
+
+
+async def en_bloques(lineas, tamano=LINEAS_POR_ENVIO):
+    """
+    Recorre un generador de líneas que consulta la base de datos desde una
+    respuesta asíncrona: cada bloque de `tamano` líneas se arma en el hilo
+    sincrónico de la petición (el mismo que tiene abierto el cursor)
+    """
+    siguiente = sync_to_async(lambda: ''.join(islice(lineas, tamano)))
+    try:
+        while True:
+            bloque = await siguiente()
+            if not bloque:
+                break
+            yield bloque
+    finally:
+        # Si el cliente corta la descarga, el cursor se cierra en su hilo
+        await sync_to_async(lineas.close)()
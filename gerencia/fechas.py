@@ -0,0 +1,139 @@
+"""
+Rangos de fechas y agrupaciones en la hora del hotel (settings.TIME_ZONE).
+
+Filtrar con `created_at__date=...` obliga a la base de datos a convertir
+cada fila de zona horaria antes de comparar, y así no puede usar el índice
+de created_at. Aquí los días locales se convierten a rangos semiabiertos
+[inicio, fin) en UTC, que sí recorren el índice.
+"""
+from datetime import date, datetime, time, timedelta, timezone as dt_timezone
+
+from django.db.models.functions import Trunc, TruncDate, TruncHour, TruncMonth, TruncWeek
+from django.utils import timezone
+
+# De la más fina a la más gruesa
+GRANULARIDADES = ['hora', 'dia', 'semana', 'mes']
+
+TRUNCADORES = {
+    'hora': TruncHour,
+    'dia': TruncDate,
+    'semana': TruncWeek,
+    'mes': TruncMonth,
+}
+
+# Tipo de Trunc() para campos DateField (TruncDate solo acepta datetimes)
+TIPOS_TRUNC = {'dia': 'day', 'semana': 'week', 'mes': 'month'}
+
+
+def zona_hotel():
+    return timezone.get_default_timezone()
+
+
+def hoy():
+    """
+    Fecha actual en la hora del hotel
+    """
+    return timezone.localdate(timezone=zona_hotel())
+
+
+def parsear_fecha(valor, por_defecto=None):
+    """
+    Convierte 'YYYY-MM-DD' en date; si falta o no es válida devuelve por_defecto
+    """
+    if isinstance(valor, date):
+        return valor
+    try:
+        return date.fromisoformat(valor)
+    except (TypeError, ValueError):
+        return por_defecto
+
+
+def inicio_del_dia(fecha):
+    """
+    Medianoche local del día, expresada en UTC
+    """
+    local = timezone.make_aware(datetime.combine(fecha, time.min), zona_hotel())
+    return local.astimezone(dt_timezone.utc)
+
+
+def rango_dias(desde, hasta):
+    """
+    Rango semiabierto [inicio, fin) en UTC que cubre los días locales
+    desde..hasta (inclusive)
+    """
+    return inicio_del_dia(desde), inicio_del_dia(hasta + timedelta(days=1))
+
+
+def rango_dia(fecha):
+    return rango_dias(fecha, fecha)
+
+
+def filtro_rango(campo, desde=None, hasta=None):
+    """
+    Argumentos para .filter() que limitan un DateTimeField a días locales.
+    Cualquiera de los dos extremos puede omitirse.
+    """
+    filtro = {}
+    if desde is not None:
+        filtro[f'{campo}__gte'] = inicio_del_dia(desde)
+    if hasta is not None:
+        filtro[f'{campo}__lt'] = inicio_del_dia(hasta + timedelta(days=1))
+    return filtro
+
+
+def truncar(campo, granularidad, con_zona=True):
+    """
+    Expresión para agrupar por 'hora', 'dia', 'semana' o 'mes'.
+    Con con_zona (DateTimeField) los cortes se hacen en la hora del hotel;
+    para un DateField debe ser False.
+    """
+    if con_zona:
+        return TRUNCADORES[granularidad](campo, tzinfo=zona_hotel())
+    return Trunc(campo, TIPOS_TRUNC[granularidad])
+
+
+def _lunes(fecha):
+    return fecha - timedelta(days=fecha.weekday())
+
+
+def cantidad_periodos(desde, hasta, granularidad):
+    """
+    Cantidad de períodos entre dos fechas (inclusive), sin enumerarlos
+    """
+    if granularidad == 'hora':
+        inicio, fin = rango_dias(desde, hasta)
+        return int((fin - inicio).total_seconds() // 3600)
+    if granularidad == 'dia':
+        return (hasta - desde).days + 1
+    if granularidad == 'semana':
+        return (_lunes(hasta) - _lunes(desde)).days // 7 + 1
+    return (hasta.year - desde.year) * 12 + hasta.month - desde.month + 1
+
+
+def periodos(desde, hasta, granularidad):
+    """
+    Inicio de cada período entre dos fechas (inclusive). Las horas se
+    devuelven como datetimes en UTC (así los cambios de horario no repiten
+    ni saltan horas); los demás como date.
+    """
+    if granularidad == 'hora':
+        actual, fin = rango_dias(desde, hasta)
+        while actual < fin:
+            yield actual
+            actual += timedelta(hours=1)
+        return
+
+    if granularidad == 'dia':
+        actual, paso = desde, timedelta(days=1)
+    elif granularidad == 'semana':
+        actual, paso = _lunes(desde), timedelta(days=7)
+    else:
+        actual = desde.replace(day=1)
+        while actual <= hasta:
+            yield actual
+            actual = (actual + timedelta(days=32)).replace(day=1)
+        return
+
+    while actual <= hasta:
+        yield actual
+        actual += paso
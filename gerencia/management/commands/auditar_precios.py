@@ -0,0 +1,51 @@
+from datetime import date, timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+
+from garzon.archivo import FUENTES
+from gerencia.fechas import hoy, rango_dias
+from gerencia.precios import TAMANO_LOTE, lineas_de_precios
+from gerencia.rollups import ESTADOS_VENTA
+
+
+class Command(BaseCommand):
+    help = "Compara el precio cobrado en cada item vendido con el precio de lista vigente al momento del pedido"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--desde', help="Primer día (YYYY-MM-DD, por defecto hace 30 días)")
+        parser.add_argument('--hasta', help="Último día (YYYY-MM-DD, por defecto hoy)")
+        parser.add_argument('--detalle', type=int, default=10, help="Items con diferencia a listar")
+
+    def handle(self, *args, **options):
+        try:
+            hasta = date.fromisoformat(options['hasta']) if options['hasta'] else hoy()
+            desde = date.fromisoformat(options['desde']) if options['desde'] else hasta - timedelta(days=30)
+        except ValueError:
+            raise CommandError("Las fechas deben tener formato YYYY-MM-DD")
+        if desde > hasta:
+            raise CommandError("--desde es posterior a --hasta")
+
+        inicio, fin = rango_dias(desde, hasta)
+        # Los precios de todo el período en memoria: ninguna consulta por item
+        lineas = lineas_de_precios(inicio, fin)
+
+        items = cobrado = de_lista = 0
+        diferencias = []
+        for _, modelo_item in FUENTES:
+            vendidos = modelo_item.objects.filter(
+                created_at__gte=inicio, created_at__lt=fin, comanda__estado__in=ESTADOS_VENTA
+            ).values_list('id', 'producto_id', 'created_at', 'cantidad', 'precio_unitario')
+            for item_id, producto_id, creado, cantidad, precio_unitario in vendidos.iterator(chunk_size=TAMANO_LOTE):
+                precio = lineas[producto_id].precio_en(creado)
+                items += 1
+                cobrado += cantidad * precio_unitario
+                de_lista += cantidad * precio
+                if precio != precio_unitario and len(diferencias) < options['detalle']:
+                    diferencias.append((item_id, producto_id, creado, precio_unitario, precio))
+
+        for item_id, producto_id, creado, precio_unitario, precio in diferencias:
+            self.stdout.write(f'Item {item_id} (producto {producto_id}, {creado:%Y-%m-%d %H:%M}): cobrado ${precio_unitario}, lista ${precio}')
+        self.stdout.write(f'Items revisados: {items}')
+        self.stdout.write(f'Ingresos cobrados: ${cobrado}')
+        self.stdout.write(f'Ingresos a precio de lista: ${de_lista}')
+        self.stdout.write(self.style.SUCCESS(f'Diferencia: ${cobrado - de_lista}'))
@@ -0,0 +1,27 @@
+from datetime import date
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from gerencia.rollups import refrescar_incremental, refrescar_rango
+
+
+class Command(BaseCommand):
+    help = "Refresca los resúmenes diarios de ventas (solo los días con cambios desde la última ejecución)"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--desde', help="Recalcular desde esta fecha (YYYY-MM-DD), ignorando la marca")
+        parser.add_argument('--hasta', help="Fecha final para --desde (por defecto hoy)")
+
+    def handle(self, *args, **options):
+        if options['desde']:
+            try:
+                desde = date.fromisoformat(options['desde'])
+                hasta = date.fromisoformat(options['hasta']) if options['hasta'] else timezone.localdate()
+            except ValueError:
+                raise CommandError("Las fechas deben tener formato YYYY-MM-DD")
+            dias = refrescar_rango(desde, hasta)
+        else:
+            dias = refrescar_incremental()
+
+        self.stdout.write(self.style.SUCCESS(f'Resúmenes de ventas refrescados: {dias} día(s)'))
@@ -0,0 +1,102 @@
+import re
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.utils import timezone
+
+from garzon.models import ClienteExterno, Comanda, ComandaItem, Producto
+from gerencia.models import HistorialPrecio
+
+
+def consultas_criticas():
+    """
+    Formas de consulta de las rutas más usadas: (nombre, queryset)
+    """
+    ahora = timezone.now()
+    comanda_id = Comanda.objects.order_by().values_list('id', flat=True).first() or 1
+    producto_id = Producto.objects.order_by().values_list('id', flat=True).first() or 1
+    categoria_id = Producto.objects.order_by().values_list('categoria_id', flat=True).first() or 1
+
+    return [
+        ('tablero de cocina',
+         Comanda.objects.filter(estado='E').order_by('created_at')),
+        ('comandas modificadas',
+         Comanda.objects.filter(updated_at__gte=ahora - timedelta(minutes=5))),
+        ('ventas de un día',
+         Comanda.objects.filter(estado__in=['E', 'L'], created_at__gte=ahora - timedelta(days=1), created_at__lt=ahora)),
+        ('items de una comanda',
+         ComandaItem.objects.filter(comanda_id=comanda_id)),
+        ('producto en una comanda',
+         ComandaItem.objects.filter(comanda_id=comanda_id, producto_id=producto_id)),
+        ('clientes externos recientes',
+         ClienteExterno.objects.order_by('-created_at')[:50]),
+        ('historial de un producto',
+         HistorialPrecio.objects.filter(producto_id=producto_id).order_by('-fecha_cambio')),
+        ('menú de una categoría',
+         Producto.objects.filter(activo=True, categoria_id=categoria_id)),
+    ]
+
+
+def filas_estimadas(tabla):
+    """
+    Tamaño de la tabla; en PostgreSQL se usa la estimación del planificador
+    para no recorrer tablas grandes con COUNT(*)
+    """
+    with connection.cursor() as cursor:
+        if connection.vendor == 'postgresql':
+            cursor.execute("SELECT reltuples::bigint FROM pg_class WHERE relname = %s", [tabla])
+            fila = cursor.fetchone()
+            return max(fila[0], 0) if fila else 0
+        cursor.execute(f"SELECT COUNT(*) FROM {connection.ops.quote_name(tabla)}")
+        return cursor.fetchone()[0]
+
+
+def usa_scan_secuencial(plan, tabla):
+    """
+    Detecta un recorrido completo de la tabla en la salida de EXPLAIN
+    """
+    if connection.vendor == 'postgresql':
+        return re.search(rf'Seq Scan on {re.escape(tabla)}\b', plan) is not None
+    if connection.vendor == 'sqlite':
+        # "SCAN tabla" sin "USING ... INDEX" es un recorrido completo
+        for linea in plan.splitlines():
+            if re.search(rf'\bSCAN {re.escape(tabla)}\b', linea) and 'INDEX' not in linea:
+                return True
+        return False
+    raise CommandError(f'Motor no soportado para verificar índices: {connection.vendor}')
+
+
+class Command(BaseCommand):
+    help = "Ejecuta EXPLAIN sobre las consultas críticas y falla si alguna recorre la tabla completa"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--min-filas', type=int, default=10000,
+            help="Solo se exige índice si la tabla tiene al menos estas filas (por defecto 10000)"
+        )
+        parser.add_argument(
+            '--mostrar-planes', action='store_true',
+            help="Imprime el plan de cada consulta"
+        )
+
+    def handle(self, *args, **options):
+        fallidas = []
+        for nombre, queryset in consultas_criticas():
+            tabla = queryset.model._meta.db_table
+            filas = filas_estimadas(tabla)
+            plan = queryset.explain()
+
+            if options['mostrar_planes']:
+                self.stdout.write(f'--- {nombre}\n{plan}')
+
+            if not usa_scan_secuencial(plan, tabla):
+                self.stdout.write(self.style.SUCCESS(f'OK      {nombre} ({tabla}, {filas} filas)'))
+            elif filas < options['min_filas']:
+                self.stdout.write(f'OMITIDA {nombre}: scan secuencial en {tabla}, pero solo tiene {filas} filas')
+            else:
+                self.stdout.write(self.style.ERROR(f'FALLA   {nombre}: scan secuencial en {tabla} ({filas} filas)'))
+                fallidas.append(nombre)
+
+        if fallidas:
+            raise CommandError(f'Consultas sin índice: {", ".join(fallidas)}')
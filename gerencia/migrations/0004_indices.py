@@ -0,0 +1,26 @@
+# Generated by Django 5.2.7 on 2026-10-18 09:40
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('garzon', '0004_indices'),
+        ('gerencia', '0003_ventas_diarias'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='historialprecio',
+            name='producto',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='historial_precios', to='garzon.producto'),
+        ),
+        migrations.AddIndex(
+            model_name='historialprecio',
+            index=models.Index(fields=['producto', 'fecha_cambio'], name='historial_producto_fecha_idx'),
+        ),
+    ]
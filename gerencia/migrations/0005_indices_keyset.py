@@ -0,0 +1,20 @@
+# Generated by Django 5.2.7 on 2026-10-18 09:48
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('garzon', '0005_indices_keyset'),
+        ('gerencia', '0004_indices'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='historialprecio',
+            index=models.Index(fields=['fecha_cambio', 'id'], name='historial_fecha_id_idx'),
+        ),
+    ]
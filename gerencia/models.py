@@ -2,13 +2,14 @@ from django.db import models
 from django.conf import settings
 from django.utils import timezone
 from django.core.validators import MinValueValidator
-from garzon.models import Producto, Comanda, ComandaItem
+from garzon.models import Producto, Categoria, Comanda, ComandaItem
 
 class HistorialPrecio(models.Model):
     """
     Historial de cambios de precios de productos
     """
-    producto = models.ForeignKey(Producto, on_delete=models.CASCADE, related_name='historial_precios')
+    # Sin índice propio: lo cubre historial_producto_fecha_idx
+    producto = models.ForeignKey(Producto, on_delete=models.CASCADE, related_name='historial_precios', db_index=False)
     precio_anterior = models.PositiveIntegerField(
         validators=[MinValueValidator(1)],
         help_text="Precio anterior en pesos chilenos (entero positivo)"
@@ -26,6 +27,11 @@ class HistorialPrecio(models.Model):
         verbose_name = 'Historial de Precio'
         verbose_name_plural = 'Historial de Precios'
         ordering = ['-fecha_cambio']
+        indexes = [
+            models.Index(fields=['producto', 'fecha_cambio'], name='historial_producto_fecha_idx'),
+            # Listado paginado por cursor (fecha_cambio, id)
+            models.Index(fields=['fecha_cambio', 'id'], name='historial_fecha_id_idx'),
+        ]
     
     def __str__(self):
         return f"{self.producto.nombre} - ${self.precio_anterior} → ${self.precio_nuevo}"
@@ -36,4 +42,61 @@ class HistorialPrecio(models.Model):
     def porcentaje_cambio(self):
         if self.precio_anterior > 0:
             return ((self.precio_nuevo - self.precio_anterior) / self.precio_anterior) * 100
-        return 0
\ No newline at end of file
+        return 0
+
+class VentaDiaria(models.Model):
+    """
+    Resumen de ventas por día (hora del hotel), mantenido por gerencia.rollups
+    """
+    fecha = models.DateField(unique=True)
+    comandas = models.PositiveIntegerField(default=0)
+    unidades = models.PositiveIntegerField(default=0)
+    ingresos = models.PositiveBigIntegerField(default=0)
+    actualizado_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = 'venta_diaria'
+        verbose_name = 'Venta Diaria'
+        verbose_name_plural = 'Ventas Diarias'
+        ordering = ['fecha']
+
+    def __str__(self):
+        return f"{self.fecha} - {self.comandas} comandas - ${self.ingresos}"
+
+
+class VentaDiariaProducto(models.Model):
+    """
+    Resumen de ventas por día y producto, mantenido por gerencia.rollups
+    """
+    fecha = models.DateField()
+    producto = models.ForeignKey(Producto, on_delete=models.CASCADE, related_name='ventas_diarias')
+    categoria = models.ForeignKey(Categoria, on_delete=models.CASCADE, related_name='ventas_diarias')
+    comandas = models.PositiveIntegerField(default=0)
+    unidades = models.PositiveIntegerField(default=0)
+    ingresos = models.PositiveBigIntegerField(default=0)
+
+    class Meta:
+        db_table = 'venta_diaria_producto'
+        verbose_name = 'Venta Diaria por Producto'
+        verbose_name_plural = 'Ventas Diarias por Producto'
+        ordering = ['fecha']
+        constraints = [
+            models.UniqueConstraint(fields=['fecha', 'producto'], name='venta_diaria_producto_unica'),
+        ]
+
+    def __str__(self):
+        return f"{self.fecha} - {self.producto.nombre} x{self.unidades}"
+
+
+class MarcaRollup(models.Model):
+    """
+    Hasta dónde se procesaron los cambios de comandas al refrescar los resúmenes
+    """
+    nombre = models.CharField(max_length=50, unique=True)
+    procesado_hasta = models.DateTimeField()
+
+    class Meta:
+        db_table = 'marca_rollup'
+
+    def __str__(self):
+        return f"{self.nombre}: {self.procesado_hasta}"
@@ -0,0 +1,172 @@
+"""
+Precios de productos: cambios y consultas históricas.
+
+- cambiar_precios() ajusta muchos productos a la vez (una selección,
+  categorías completas o ambas) con un UPDATE y un INSERT en lote dentro de
+  una sola transacción, e invalida el menú del garzón una vez al confirmar.
+- precios_en() responde "cuánto costaba cada producto en el instante T"
+  para muchos productos en una sola consulta, y lineas_de_precios() arma en
+  memoria la línea de tiempo de precios de un período para procesos en lote
+  (p. ej. recalcular un mes de ventas sin una consulta por item).
+
+Precio en T: el precio_nuevo del último cambio hasta T inclusive; si el
+producto no cambió antes de T, el precio_anterior de su primer cambio
+posterior; si nunca cambió, su precio actual.
+"""
+from bisect import bisect_right
+from decimal import ROUND_HALF_UP, Decimal
+
+from django.db import transaction
+from django.db.models import F, OuterRef, Q, Subquery
+from django.db.models.functions import Coalesce
+
+from garzon.menu import invalidar_menu
+from garzon.models import Producto
+from .models import HistorialPrecio
+
+# monto: suma (o resta) pesos; porcentaje: sube (o baja) el precio en ese %
+MODOS_AJUSTE = ('monto', 'porcentaje')
+# Límite de PositiveIntegerField
+PRECIO_MAXIMO = 2147483647
+TAMANO_LOTE = 500
+
+
+class AjusteInvalido(ValueError):
+    pass
+
+
+def precio_ajustado(precio, modo, valor, redondeo=1):
+    """
+    Precio resultante de aplicar el ajuste, redondeado al múltiplo de
+    `redondeo` más cercano (p. ej. 10 o 100 pesos)
+    """
+    valor = Decimal(str(valor))
+    if modo == 'monto':
+        nuevo = Decimal(precio) + valor
+    elif modo == 'porcentaje':
+        nuevo = Decimal(precio) * (100 + valor) / 100
+    else:
+        raise AjusteInvalido(f"Modo de ajuste desconocido: {modo}")
+    nuevo = (nuevo / redondeo).quantize(Decimal(1), rounding=ROUND_HALF_UP) * redondeo
+    return int(nuevo)
+
+
+def cambiar_precios(usuario, modo, valor, productos=(), categorias=(), razon='', redondeo=1):
+    """
+    Aplica el ajuste a los productos indicados y a todos los de las
+    categorías indicadas. Devuelve [(producto, precio_anterior)] de los que
+    cambiaron. Si algún precio quedaría fuera de rango (menos de $1) no cambia ninguno.
+    """
+    if redondeo < 1:
+        raise AjusteInvalido("El redondeo debe ser de al menos $1")
+
+    with transaction.atomic():
+        seleccion = Producto.objects.select_for_update().filter(
+            Q(id__in=productos) | Q(categoria_id__in=categorias)
+        ).order_by('id')
+
+        cambiados = []
+        for producto in seleccion:
+            nuevo = precio_ajustado(producto.precio, modo, valor, redondeo)
+            if not 1 <= nuevo <= PRECIO_MAXIMO:
+                raise AjusteInvalido(f"{producto.nombre} quedaría con un precio de ${nuevo}")
+            if nuevo != producto.precio:
+                cambiados.append((producto, producto.precio))
+                producto.precio = nuevo
+
+        if cambiados:
+            Producto.objects.bulk_update(
+                [producto for producto, _ in cambiados], ['precio'], batch_size=TAMANO_LOTE
+            )
+            HistorialPrecio.objects.bulk_create([
+                HistorialPrecio(
+                    producto=producto,
+                    precio_anterior=anterior,
+                    precio_nuevo=producto.precio,
+                    razon_cambio=razon,
+                    usuario=usuario,
+                )
+                for producto, anterior in cambiados
+            ], batch_size=TAMANO_LOTE)
+            # bulk_update no emite señales: el menú se invalida una sola vez,
+            # al confirmar (invalidar_menu ya espera a la transacción)
+            invalidar_menu()
+    return cambiados
+
+
+def _productos(productos):
+    consulta = Producto.objects.all()
+    if productos is not None:
+        consulta = consulta.filter(id__in=productos)
+    return consulta
+
+
+def precios_en(instante, productos=None):
+    """
+    {producto_id: precio vigente en `instante`} de los productos indicados
+    (todos si es None), en una sola consulta: por cada producto se busca un
+    cambio hacia atrás y uno hacia adelante en historial_producto_fecha_idx.
+    """
+    historial = HistorialPrecio.objects.filter(producto=OuterRef('pk'))
+    ultimo_cambio = historial.filter(fecha_cambio__lte=instante).order_by('-fecha_cambio', '-id')
+    siguiente_cambio = historial.filter(fecha_cambio__gt=instante).order_by('fecha_cambio', 'id')
+    return dict(
+        _productos(productos).annotate(
+            precio_en=Coalesce(
+                Subquery(ultimo_cambio.values('precio_nuevo')[:1]),
+                Subquery(siguiente_cambio.values('precio_anterior')[:1]),
+                F('precio'),
+            )
+        ).values_list('id', 'precio_en')
+    )
+
+
+class LineaPrecios:
+    """
+    Precios de un producto en [desde, hasta): precios[i] rige desde fechas[i]
+    """
+    __slots__ = ('fechas', 'precios', 'hasta')
+
+    def __init__(self, desde, hasta, precio_inicial):
+        self.fechas = [desde]
+        self.precios = [precio_inicial]
+        self.hasta = hasta
+
+    def agregar(self, fecha, precio):
+        """
+        Cambio de precio en `fecha` (en orden cronológico)
+        """
+        if fecha == self.fechas[-1]:
+            self.precios[-1] = precio
+        else:
+            self.fechas.append(fecha)
+            self.precios.append(precio)
+
+    def precio_en(self, instante):
+        if not self.fechas[0] <= instante < self.hasta:
+            raise ValueError(f"{instante} está fuera del período cargado")
+        return self.precios[bisect_right(self.fechas, instante) - 1]
+
+    def __len__(self):
+        return len(self.fechas)
+
+
+def lineas_de_precios(desde, hasta, productos=None):
+    """
+    {producto_id: LineaPrecios} del período [desde, hasta) para los
+    productos indicados (todos si es None). Son dos consultas en total,
+    sin importar cuántos productos ni cuántos instantes se consulten después.
+    """
+    lineas = {
+        producto_id: LineaPrecios(desde, hasta, precio)
+        for producto_id, precio in precios_en(desde, productos).items()
+    }
+    cambios = HistorialPrecio.objects.filter(fecha_cambio__gt=desde, fecha_cambio__lt=hasta)
+    if productos is not None:
+        cambios = cambios.filter(producto_id__in=list(lineas))
+    cambios = cambios.order_by('producto_id', 'fecha_cambio', 'id').values_list(
+        'producto_id', 'fecha_cambio', 'precio_nuevo'
+    )
+    for producto_id, fecha, precio in cambios.iterator(chunk_size=TAMANO_LOTE):
+        lineas[producto_id].agregar(fecha, precio)
+    return lineas
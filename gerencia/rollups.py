@@ -0,0 +1,156 @@
+"""
+Resúmenes diarios de ventas (VentaDiaria y VentaDiariaProducto).
+
+Los reportes de gerencia leen de estas tablas en vez de recorrer todas las
+comandas. Se mantienen de dos formas:
+- refrescar_incremental(): recalcula los días con comandas modificadas desde
+  la última marca (comando `refrescar_ventas`).
+- actualizar_venta_de_comanda(): al cambiar el estado de una comanda se
+  recalcula su día, así el día de hoy está siempre al día.
+"""
+import logging
+from datetime import timedelta
+
+from django.db import transaction
+from django.db.models import Count, F, Sum
+from django.utils import timezone
+
+from garzon.archivo import FUENTES
+from garzon.models import Comanda
+from .fechas import rango_dia, truncar, zona_hotel
+from .models import MarcaRollup, VentaDiaria, VentaDiariaProducto
+
+logger = logging.getLogger(__name__)
+
+# Comandas que cuentan como venta: enviadas o listas
+ESTADOS_VENTA = ['E', 'L']
+
+MARCA_VENTAS = 'ventas'
+# Margen para no perder comandas guardadas justo antes de tomar la marca
+MARGEN_MARCA = timedelta(minutes=5)
+
+
+def refrescar_dia(fecha):
+    """
+    Recalcula los resúmenes de un día a partir de las comandas
+    """
+    inicio, fin = rango_dia(fecha)
+
+    with transaction.atomic():
+        # Bloquear la fila del día antes de contar serializa refrescos
+        # simultáneos del mismo día: cada uno cuenta después de que el
+        # anterior confirmó, así el último en escribir nunca es el más viejo
+        VentaDiaria.objects.get_or_create(fecha=fecha)
+        dia = VentaDiaria.objects.select_for_update().get(fecha=fecha)
+
+        # Comandas de la tabla de trabajo y del archivo (garzon.archivo); una
+        # comanda está en una sola de las dos, así que los totales se suman
+        cantidad_comandas = 0
+        por_producto = {}
+        for modelo_comanda, modelo_item in FUENTES:
+            cantidad_comandas += modelo_comanda.objects.filter(
+                estado__in=ESTADOS_VENTA,
+                created_at__gte=inicio,
+                created_at__lt=fin
+            ).count()
+            filas = modelo_item.objects.filter(
+                comanda__estado__in=ESTADOS_VENTA,
+                comanda__created_at__gte=inicio,
+                comanda__created_at__lt=fin
+            ).values('producto_id', 'producto__categoria_id').annotate(
+                total_comandas=Count('comanda_id', distinct=True),
+                total_unidades=Sum('cantidad'),
+                total_ingresos=Sum(F('cantidad') * F('precio_unitario'))
+            ).order_by()
+            for fila in filas:
+                clave = (fila['producto_id'], fila['producto__categoria_id'])
+                acumulado = por_producto.setdefault(clave, [0, 0, 0])
+                acumulado[0] += fila['total_comandas']
+                acumulado[1] += fila['total_unidades'] or 0
+                acumulado[2] += fila['total_ingresos'] or 0
+
+        filas = [
+            VentaDiariaProducto(
+                fecha=fecha,
+                producto_id=producto_id,
+                categoria_id=categoria_id,
+                comandas=comandas,
+                unidades=unidades,
+                ingresos=ingresos
+            )
+            for (producto_id, categoria_id), (comandas, unidades, ingresos) in por_producto.items()
+        ]
+        VentaDiariaProducto.objects.filter(fecha=fecha).delete()
+        VentaDiariaProducto.objects.bulk_create(filas)
+
+        dia.comandas = cantidad_comandas
+        dia.unidades = sum(fila.unidades for fila in filas)
+        dia.ingresos = sum(fila.ingresos for fila in filas)
+        dia.save()
+    return dia
+
+
+def refrescar_rango(fecha_desde, fecha_hasta):
+    """
+    Recalcula todos los días entre dos fechas (inclusive)
+    """
+    fecha = fecha_desde
+    dias = 0
+    while fecha <= fecha_hasta:
+        refrescar_dia(fecha)
+        fecha += timedelta(days=1)
+        dias += 1
+    return dias
+
+
+def refrescar_incremental():
+    """
+    Recalcula solo los días que tienen comandas modificadas desde la última
+    ejecución y avanza la marca. Devuelve la cantidad de días procesados.
+    """
+    ahora = timezone.now()
+    marca = MarcaRollup.objects.filter(nombre=MARCA_VENTAS).first()
+
+    comandas = Comanda.objects.filter(updated_at__lte=ahora)
+    if marca is not None:
+        comandas = comandas.filter(updated_at__gt=marca.procesado_hasta - MARGEN_MARCA)
+
+    fechas = comandas.annotate(dia=truncar('created_at', 'dia')).values_list(
+        'dia', flat=True
+    ).distinct().order_by('dia')
+
+    dias = 0
+    for fecha in fechas:
+        refrescar_dia(fecha)
+        dias += 1
+
+    MarcaRollup.objects.update_or_create(
+        nombre=MARCA_VENTAS, defaults={'procesado_hasta': ahora}
+    )
+    return dias
+
+
+def actualizar_venta_de_comanda(comanda):
+    """
+    Recalcula el día de la comanda al confirmar la transacción en curso.
+    Se llama en cada cambio de estado que afecta a las ventas.
+    """
+    actualizar_ventas_creadas([comanda.created_at])
+
+
+def actualizar_ventas_creadas(creaciones):
+    """
+    Como actualizar_venta_de_comanda, para varias comandas a la vez a partir
+    de sus created_at: cada día afectado se recalcula una sola vez.
+    """
+    fechas = sorted({timezone.localtime(creada, zona_hotel()).date() for creada in creaciones})
+
+    def refrescar():
+        for fecha in fechas:
+            try:
+                refrescar_dia(fecha)
+            except Exception:
+                # El comando refrescar_ventas corrige el día en la próxima pasada
+                logger.exception("No se pudo refrescar el resumen de ventas del %s", fecha)
+
+    transaction.on_commit(refrescar)
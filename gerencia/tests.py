@@ -1,3 +1,131 @@
-from django.test import TestCase
+from datetime import datetime, timedelta
+from unittest import mock, skipUnless
 
-# Create your tests here.
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, OperationalError, connections
+from django.http import JsonResponse
+from django.test import RequestFactory, TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from Sistema_Comandas import replica
+from Sistema_Comandas.replica import ALIAS_REPORTES, COOKIE_LECTURA_PROPIA, lecturas_de_reportes
+from garzon.models import Categoria, Producto
+from login.models import Usuario
+from .fechas import hoy
+from .models import HistorialPrecio, VentaDiaria
+from .precios import lineas_de_precios, precios_en
+
+
+@lecturas_de_reportes
+def vista_lee_escribe_lee(request):
+    antes = VentaDiaria.objects.get().comandas
+    VentaDiaria.objects.create(fecha=hoy().replace(year=2000), comandas=7)
+    despues = VentaDiaria.objects.filter(comandas=7).exists()
+    return JsonResponse({'antes': antes, 'despues': despues})
+
+
+@skipUnless(ALIAS_REPORTES in settings.DATABASES,
+            "Necesita la base 'reports': --settings=Sistema_Comandas.settings_pruebas")
+class EnrutadorReportesTests(TestCase):
+    """
+    Primaria y réplica son bases distintas con un resumen distinto para el
+    mismo día: el valor leído indica de cuál vino la consulta
+    """
+    databases = {DEFAULT_DB_ALIAS, ALIAS_REPORTES}
+
+    def setUp(self):
+        replica._caida_hasta = 0.0
+        VentaDiaria.objects.create(fecha=hoy(), comandas=1)
+        VentaDiaria.objects.using(ALIAS_REPORTES).create(fecha=hoy(), comandas=99)
+        self.gerente = Usuario.objects.create_user('gerente', password='x', rol='gerencia', is_active=True)
+        self.client.force_login(self.gerente)
+
+    def ventas_de_hoy(self):
+        fecha = hoy().isoformat()
+        respuesta = self.client.get(reverse('gerencia:api_ventas'), {'fecha_inicio': fecha, 'fecha_fin': fecha})
+        self.assertEqual(respuesta.status_code, 200)
+        return respuesta.json()['datos'][0]['ventas']
+
+    def test_fuera_de_los_reportes_se_lee_la_primaria(self):
+        self.assertEqual(VentaDiaria.objects.get().comandas, 1)
+
+    def test_los_reportes_leen_la_replica(self):
+        self.assertEqual(self.ventas_de_hoy(), 99)
+
+    def test_sin_replica_disponible_se_lee_la_primaria(self):
+        with mock.patch.object(connections[ALIAS_REPORTES], 'ensure_connection', side_effect=OperationalError), \
+                self.assertLogs('Sistema_Comandas.replica', 'WARNING'):
+            self.assertEqual(self.ventas_de_hoy(), 1)
+            # Tras el fallo no se reintenta en cada petición
+            self.assertEqual(self.ventas_de_hoy(), 1)
+            self.assertEqual(connections[ALIAS_REPORTES].ensure_connection.call_count, 1)
+
+    def test_tras_escribir_en_la_peticion_se_lee_la_primaria(self):
+        respuesta = vista_lee_escribe_lee(RequestFactory().get('/'))
+        self.assertJSONEqual(respuesta.content, {'antes': 99, 'despues': True})
+        self.assertFalse(VentaDiaria.objects.using(ALIAS_REPORTES).filter(comandas=7).exists())
+
+    def test_un_objeto_leido_de_la_replica_se_guarda_en_la_primaria(self):
+        venta = VentaDiaria.objects.using(ALIAS_REPORTES).get()
+        venta.comandas = 5
+        venta.save()
+        self.assertEqual(VentaDiaria.objects.get().comandas, 5)
+        self.assertEqual(VentaDiaria.objects.using(ALIAS_REPORTES).get().comandas, 99)
+
+    def test_quien_acaba_de_escribir_lee_la_primaria(self):
+        respuesta = self.client.post(reverse('gerencia:actualizar_precio', args=[0]))
+        self.assertIn(COOKIE_LECTURA_PROPIA, respuesta.cookies)
+        self.assertEqual(self.ventas_de_hoy(), 1)
+
+    def test_las_lecturas_sin_escritura_no_marcan(self):
+        self.assertEqual(self.ventas_de_hoy(), 99)
+        respuesta = self.client.get(reverse('gerencia:api_ventas'))
+        self.assertNotIn(COOKIE_LECTURA_PROPIA, respuesta.cookies)
+
+
+class PreciosHistoricosTests(TestCase):
+    """
+    Lomo: 1000 → 2000 en T1, y en T2 dos cambios en el mismo instante
+    (2000 → 2500 y 2500 → 3000; rige el de mayor id). Pan nunca cambió.
+    """
+
+    def setUp(self):
+        self.t1 = datetime(2025, 3, 1, 12, tzinfo=timezone.get_current_timezone())
+        self.t2 = self.t1 + timedelta(days=1)
+        usuario = Usuario.objects.create_user('gerente', password='x', rol='gerencia')
+        categoria = Categoria.objects.create(nombre='Fondos')
+        self.lomo = Producto.objects.create(nombre='Lomo', precio=3000, categoria=categoria)
+        self.pan = Producto.objects.create(nombre='Pan', precio=500, categoria=categoria)
+        for fecha, anterior, nuevo in [(self.t1, 1000, 2000), (self.t2, 2000, 2500), (self.t2, 2500, 3000)]:
+            cambio = HistorialPrecio.objects.create(
+                producto=self.lomo, precio_anterior=anterior, precio_nuevo=nuevo, usuario=usuario
+            )
+            HistorialPrecio.objects.filter(pk=cambio.pk).update(fecha_cambio=fecha)
+
+    def test_antes_del_primer_cambio_rige_el_precio_anterior(self):
+        precios = precios_en(self.t1 - timedelta(seconds=1))
+        self.assertEqual(precios, {self.lomo.id: 1000, self.pan.id: 500})
+
+    def test_el_cambio_rige_desde_su_instante(self):
+        self.assertEqual(precios_en(self.t1, [self.lomo.id]), {self.lomo.id: 2000})
+
+    def test_en_un_empate_rige_el_ultimo_cambio_registrado(self):
+        self.assertEqual(precios_en(self.t2, [self.lomo.id]), {self.lomo.id: 3000})
+
+    def test_la_linea_de_precios_coincide_con_precios_en(self):
+        desde, hasta = self.t1 - timedelta(hours=1), self.t2 + timedelta(hours=1)
+        with self.assertNumQueries(2):
+            lineas = lineas_de_precios(desde, hasta)
+        self.assertEqual(len(lineas[self.lomo.id]), 3)
+        for instante in [desde, self.t1 - timedelta(seconds=1), self.t1, self.t2 - timedelta(seconds=1), self.t2]:
+            esperados = precios_en(instante)
+            for producto_id, linea in lineas.items():
+                self.assertEqual(linea.precio_en(instante), esperados[producto_id], instante)
+
+    def test_la_linea_de_precios_solo_responde_dentro_del_periodo(self):
+        desde, hasta = self.t1 - timedelta(hours=1), self.t2 + timedelta(hours=1)
+        linea = lineas_de_precios(desde, hasta, [self.lomo.id])[self.lomo.id]
+        for instante in (desde - timedelta(seconds=1), hasta):
+            with self.assertRaises(ValueError):
+                linea.precio_en(instante)
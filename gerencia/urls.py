@@ -9,6 +9,7 @@ urlpatterns = [
     # Gestión de precios
     path('precios/', views.gestion_precios, name='gestion_precios'),
     path('precios/actualizar/<int:producto_id>/', views.actualizar_precio, name='actualizar_precio'),
+    path('precios/masivo/', views.actualizar_precios_masivo, name='actualizar_precios_masivo'),
     path('precios/historial/', views.historial_precios, name='historial_precios'),
     
     # Reportes y gráficos
@@ -16,4 +17,7 @@ urlpatterns = [
     path('reportes/productos/', views.reporte_productos, name='reporte_productos'),
     path('api/ventas/', views.api_ventas, name='api_ventas'),
     path('api/productos-mas-vendidos/', views.api_productos_mas_vendidos, name='api_productos_mas_vendidos'),
+    
+    # Exportaciones (CSV / NDJSON)
+    path('exportar/<str:nombre>/', views.exportar, name='exportar'),
 ]
\ No newline at end of file
@@ -1,15 +1,31 @@
 from django.shortcuts import render, get_object_or_404, redirect
 from django.contrib.auth.decorators import login_required
 from django.views.decorators.http import require_POST
-from django.http import JsonResponse
+from django.core.handlers.asgi import ASGIRequest
+from django.http import Http404, JsonResponse, StreamingHttpResponse
 from django.db.models import Count, Sum, Q
 from django.utils import timezone
-from datetime import datetime, timedelta
+from datetime import timedelta, timezone as dt_timezone
+from decimal import Decimal
 import json
-from garzon.models import Producto, Comanda, ComandaItem, Categoria
-from .models import HistorialPrecio
+from Sistema_Comandas.paginacion import paginar
+from Sistema_Comandas.replica import lecturas_de_reportes
+from garzon.archivo import FUENTES
+from garzon.models import Producto, Categoria
+from .fechas import (
+    GRANULARIDADES, cantidad_periodos, filtro_rango, hoy as fecha_hoy, parsear_fecha,
+    periodos, truncar, zona_hotel
+)
+from .exportaciones import EXPORTACIONES, en_bloques, filas, lineas_csv, lineas_ndjson
+from .models import HistorialPrecio, VentaDiaria, VentaDiariaProducto
+from .precios import MODOS_AJUSTE, AjusteInvalido, cambiar_precios
+from .rollups import ESTADOS_VENTA
+
+# Máximo de puntos de una serie de api_ventas antes de agrupar más grueso
+MAX_PUNTOS_SERIE = 400
 
 @login_required
+@lecturas_de_reportes
 def panel_gerencia(request):
     """
     Panel principal de gerencia
@@ -18,39 +34,32 @@ def panel_gerencia(request):
     if getattr(request.user, 'rol', '').lower() != 'gerencia':
         return redirect('garzon:garzon_home')
     
-    # Estadísticas rápidas
-    hoy = timezone.now().date()
+    # Estadísticas rápidas, desde los resúmenes diarios (gerencia.rollups)
+    hoy = fecha_hoy()
     semana_pasada = hoy - timedelta(days=7)
     mes_pasado = hoy - timedelta(days=30)
     
-    # Ventas
-    ventas_hoy = Comanda.objects.filter(
-        created_at__date=hoy, 
-        estado__in=['E', 'L']
-    ).count()
-    
-    ventas_semana = Comanda.objects.filter(
-        created_at__date__gte=semana_pasada,
-        estado__in=['E', 'L']
-    ).count()
-    
-    ventas_mes = Comanda.objects.filter(
-        created_at__date__gte=mes_pasado,
-        estado__in=['E', 'L']
-    ).count()
-    
-    # Ingresos
-    ingresos_hoy = ComandaItem.objects.filter(
-        comanda__created_at__date=hoy,
-        comanda__estado__in=['E', 'L']
-    ).aggregate(total=Sum('precio_unitario'))['total'] or 0
+    # Ventas e ingresos en una sola consulta
+    resumen = VentaDiaria.objects.filter(
+        fecha__gte=mes_pasado,
+        fecha__lte=hoy
+    ).aggregate(
+        ventas_hoy=Sum('comandas', filter=Q(fecha=hoy)),
+        ventas_semana=Sum('comandas', filter=Q(fecha__gte=semana_pasada)),
+        ventas_mes=Sum('comandas'),
+        ingresos_hoy=Sum('ingresos', filter=Q(fecha=hoy))
+    )
+    ventas_hoy = resumen['ventas_hoy'] or 0
+    ventas_semana = resumen['ventas_semana'] or 0
+    ventas_mes = resumen['ventas_mes'] or 0
+    ingresos_hoy = resumen['ingresos_hoy'] or 0
     
     # Productos más vendidos esta semana
-    productos_mas_vendidos = ComandaItem.objects.filter(
-        comanda__estado__in=['E', 'L'],
-        comanda__created_at__date__gte=semana_pasada
+    productos_mas_vendidos = VentaDiariaProducto.objects.filter(
+        fecha__gte=semana_pasada,
+        fecha__lte=hoy
     ).values('producto__nombre').annotate(
-        total_vendido=Sum('cantidad')
+        total_vendido=Sum('unidades')
     ).order_by('-total_vendido')[:5]
     
     context = {
@@ -142,6 +151,53 @@ def actualizar_precio(request, producto_id):
     })
 
 @login_required
+@require_POST
+def actualizar_precios_masivo(request):
+    """
+    API para ajustar de una vez los precios de varios productos y/o
+    categorías completas, en monto o porcentaje (AJAX)
+    """
+    if (getattr(request.user, 'rol', '') or '').lower() != 'gerencia':
+        return JsonResponse({'ok': False, 'error': 'Solo gerencia puede cambiar precios'}, status=403)
+
+    try:
+        data = json.loads(request.body or '{}')
+        productos = [int(producto_id) for producto_id in data.get('productos', [])]
+        categorias = [int(categoria_id) for categoria_id in data.get('categorias', [])]
+        valor = Decimal(str(data.get('valor')))
+        redondeo = int(data.get('redondeo') or 1)
+    except (ValueError, TypeError, AttributeError, ArithmeticError):
+        return JsonResponse({'ok': False, 'error': 'Datos inválidos'}, status=400)
+    modo = data.get('modo')
+    if modo not in MODOS_AJUSTE or not valor.is_finite():
+        return JsonResponse({'ok': False, 'error': 'Ajuste inválido'}, status=400)
+    if not productos and not categorias:
+        return JsonResponse({'ok': False, 'error': 'Seleccione productos o categorías'}, status=400)
+
+    try:
+        cambiados = cambiar_precios(
+            request.user, modo, valor,
+            productos=productos, categorias=categorias,
+            razon=data.get('razon', ''), redondeo=redondeo
+        )
+    except AjusteInvalido as e:
+        return JsonResponse({'ok': False, 'error': str(e)}, status=400)
+
+    return JsonResponse({
+        'ok': True,
+        'cambiados': [
+            {
+                'id': producto.id,
+                'producto': producto.nombre,
+                'precio_anterior': anterior,
+                'precio_nuevo': producto.precio,
+            }
+            for producto, anterior in cambiados
+        ],
+    })
+
+@login_required
+@lecturas_de_reportes
 def historial_precios(request):
     """
     Historial de cambios de precios
@@ -149,25 +205,32 @@ def historial_precios(request):
     if getattr(request.user, 'rol', '').lower() != 'gerencia':
         return redirect('garzon:garzon_home')
     
-    historial = HistorialPrecio.objects.select_related('producto', 'usuario').order_by('-fecha_cambio')
+    historial = HistorialPrecio.objects.select_related('producto__categoria', 'usuario')
     
     # Filtros
     producto_id = request.GET.get('producto')
     if producto_id:
         historial = historial.filter(producto_id=producto_id)
     
-    fecha_desde = request.GET.get('fecha_desde')
-    if fecha_desde:
-        historial = historial.filter(fecha_cambio__date__gte=fecha_desde)
-    
-    fecha_hasta = request.GET.get('fecha_hasta')
-    if fecha_hasta:
-        historial = historial.filter(fecha_cambio__date__lte=fecha_hasta)
+    # Días del hotel como rango de timestamps, para usar el índice de fecha_cambio
+    historial = historial.filter(**filtro_rango(
+        'fecha_cambio',
+        parsear_fecha(request.GET.get('fecha_desde')),
+        parsear_fecha(request.GET.get('fecha_hasta'))
+    ))
+    
+    # Página por cursor sobre (fecha_cambio, id), del más reciente al más antiguo
+    pagina = paginar(
+        historial, ('-fecha_cambio', '-id'),
+        despues=request.GET.get('despues'),
+        antes=request.GET.get('antes')
+    )
     
-    productos = Producto.objects.all()
+    # Para el filtro solo se necesitan id y nombre
+    productos = Producto.objects.order_by('nombre').values('id', 'nombre')
     
     context = {
-        'historial': historial,
+        'historial': pagina,
         'productos': productos,
     }
     return render(request, 'historial_precios.html', context)
@@ -197,92 +260,172 @@ def reporte_productos(request):
     return render(request, 'reporte_productos.html', context)
 
 # APIs para gráficos
+def rango_solicitado(request, dias_por_defecto=30):
+    """
+    fecha_inicio y fecha_fin de la petición como fechas del hotel;
+    por defecto los últimos 30 días hasta hoy
+    """
+    hoy = fecha_hoy()
+    fecha_fin = parsear_fecha(request.GET.get('fecha_fin'), hoy)
+    fecha_inicio = parsear_fecha(request.GET.get('fecha_inicio'), fecha_fin - timedelta(days=dias_por_defecto))
+    return fecha_inicio, fecha_fin
+
 @login_required
+@lecturas_de_reportes
 def api_ventas(request):
     """
-    API para datos de ventas (gráfico)
+    API para datos de ventas (gráfico): una serie continua de períodos con
+    ventas, unidades e ingresos, con ceros donde no hubo ventas
     """
-    # Parámetros de filtro
-    fecha_inicio = request.GET.get('fecha_inicio', (timezone.now() - timedelta(days=30)).strftime('%Y-%m-%d'))
-    fecha_fin = request.GET.get('fecha_fin', timezone.now().strftime('%Y-%m-%d'))
-    tipo_agrupacion = request.GET.get('agrupacion', 'dia')
-    
-    # Filtro base - comandas enviadas o listas
-    comandas = Comanda.objects.filter(
-        estado__in=['E', 'L'],
-        created_at__date__range=[fecha_inicio, fecha_fin]
-    )
+    # Parámetros de filtro (días del hotel)
+    fecha_inicio, fecha_fin = rango_solicitado(request)
+    if fecha_inicio > fecha_fin:
+        return JsonResponse({'ok': False, 'error': 'La fecha de inicio es posterior a la fecha fin'}, status=400)
+    
+    solicitada = request.GET.get('agrupacion', 'dia')
+    if solicitada not in GRANULARIDADES:
+        solicitada = 'dia'
+    
+    # Si el rango generaría demasiados puntos se usa una agrupación más gruesa
+    agrupacion = None
+    for granularidad in GRANULARIDADES[GRANULARIDADES.index(solicitada):]:
+        if cantidad_periodos(fecha_inicio, fecha_fin, granularidad) <= MAX_PUNTOS_SERIE:
+            agrupacion = granularidad
+            break
+    if agrupacion is None:
+        return JsonResponse({'ok': False, 'error': 'El rango de fechas es demasiado amplio'}, status=400)
+    
+    if agrupacion == 'hora':
+        # Por hora no hay resumen: se agrupan las comandas (totales guardados),
+        # de la tabla de trabajo y del archivo
+        consultas = [
+            modelo_comanda.objects.filter(
+                estado__in=ESTADOS_VENTA,
+                **filtro_rango('created_at', fecha_inicio, fecha_fin)
+            ).annotate(
+                periodo=truncar('created_at', 'hora')
+            ).values('periodo').annotate(
+                total_ventas=Count('id'),
+                total_unidades=Sum('cantidad_items'),
+                total_ingresos=Sum('total')
+            ).order_by()
+            for modelo_comanda, _ in FUENTES
+        ]
+    else:
+        # Resúmenes diarios agrupados por día, semana o mes
+        consultas = [
+            VentaDiaria.objects.filter(
+                fecha__range=[fecha_inicio, fecha_fin]
+            ).annotate(
+                periodo=truncar('fecha', agrupacion, con_zona=False)
+            ).values('periodo').annotate(
+                total_ventas=Sum('comandas'),
+                total_unidades=Sum('unidades'),
+                total_ingresos=Sum('ingresos')
+            ).order_by()
+        ]
+    
+    por_periodo = {}
+    for consulta in consultas:
+        for fila in consulta:
+            periodo = fila['periodo']
+            if agrupacion == 'hora':
+                periodo = periodo.astimezone(dt_timezone.utc)
+            acumulado = por_periodo.setdefault(periodo, {'total_ventas': 0, 'total_unidades': 0, 'total_ingresos': 0})
+            for clave in acumulado:
+                acumulado[clave] += fila[clave] or 0
     
     datos = []
+    for periodo in periodos(fecha_inicio, fecha_fin, agrupacion):
+        fila = por_periodo.get(periodo, {})
+        punto = {
+            'fecha': etiqueta_periodo(periodo, agrupacion),
+            'ventas': fila.get('total_ventas') or 0,
+            'unidades': fila.get('total_unidades') or 0,
+            'ingresos': int(fila.get('total_ingresos') or 0),
+        }
+        if agrupacion == 'semana':
+            año, semana, _ = periodo.isocalendar()
+            punto['periodo'] = f"Sem {semana}-{año}"
+        datos.append(punto)
     
-    if tipo_agrupacion == 'semana':
-        # Agrupar por semana usando annotate
-        from django.db.models.functions import ExtractWeek, ExtractYear
-        ventas_por_semana = comandas.annotate(
-            semana=ExtractWeek('created_at'),
-            año=ExtractYear('created_at')
-        ).values('año', 'semana').annotate(
-            total_ventas=Count('id')
-        ).order_by('año', 'semana')
-        
-        for item in ventas_por_semana:
-            datos.append({
-                'periodo': f"Sem {item['semana']}-{item['año']}",
-                'ventas': item['total_ventas']
-            })
-    
-    else:  # Agrupación por día
-        ventas_por_dia = comandas.extra({
-            'fecha': "DATE(created_at)"
-        }).values('fecha').annotate(
-            total_ventas=Count('id')
-        ).order_by('fecha')
-        
-        for item in ventas_por_dia:
-            # CORREGIDO: item['fecha'] ya es string, no necesita strftime
-            datos.append({
-                'fecha': item['fecha'],  # Ya viene como string 'YYYY-MM-DD'
-                'ventas': item['total_ventas']
-            })
-    
-    return JsonResponse({'datos': datos})
+    return JsonResponse({
+        'agrupacion': agrupacion,
+        'agrupacion_solicitada': solicitada,
+        'datos': datos
+    })
+
+def etiqueta_periodo(periodo, agrupacion):
+    if agrupacion == 'hora':
+        return timezone.localtime(periodo, zona_hotel()).strftime('%Y-%m-%d %H:%M')
+    if agrupacion == 'mes':
+        return periodo.strftime('%Y-%m')
+    return periodo.isoformat()
 
 @login_required
+@lecturas_de_reportes
 def api_productos_mas_vendidos(request):
     """
     API para productos más vendidos
     """
     # Parámetros de filtro
     categoria_id = request.GET.get('categoria_id')
-    fecha_inicio = request.GET.get('fecha_inicio', (timezone.now() - timedelta(days=30)).strftime('%Y-%m-%d'))
-    fecha_fin = request.GET.get('fecha_fin', timezone.now().strftime('%Y-%m-%d'))
+    fecha_inicio, fecha_fin = rango_solicitado(request)
     
-    # Filtro base
-    items = ComandaItem.objects.filter(
-        comanda__estado__in=['E', 'L'],
-        comanda__created_at__date__range=[fecha_inicio, fecha_fin]
+    # Resúmenes diarios por producto del rango
+    ventas = VentaDiariaProducto.objects.filter(
+        fecha__range=[fecha_inicio, fecha_fin]
     )
     
     # Aplicar filtros
     if categoria_id and categoria_id != 'todas':
-        items = items.filter(producto__categoria_id=categoria_id)
+        ventas = ventas.filter(categoria_id=categoria_id)
     
     # Agrupar y contar
-    productos_vendidos = items.values(
+    productos_vendidos = ventas.values(
         'producto__nombre', 
-        'producto__categoria__nombre'
+        'categoria__nombre'
     ).annotate(
-        total_vendido=Sum('cantidad'),
-        total_ingresos=Sum('precio_unitario')
+        total_vendido=Sum('unidades'),
+        total_ingresos=Sum('ingresos')
     ).order_by('-total_vendido')[:15]
     
     datos = []
     for item in productos_vendidos:
         datos.append({
             'producto': item['producto__nombre'],
-            'categoria': item['producto__categoria__nombre'],
+            'categoria': item['categoria__nombre'],
             'cantidad': item['total_vendido'] or 0,
             'ingresos': float(item['total_ingresos'] or 0)
         })
     
-    return JsonResponse({'datos': datos})
\ No newline at end of file
+    return JsonResponse({'datos': datos})
+
+@login_required
+def exportar(request, nombre):
+    """
+    Descarga de comandas, items o historial de precios entre dos fechas,
+    en CSV (por defecto) o NDJSON (?formato=ndjson). La respuesta se genera
+    a medida que se envía, también bajo ASGI (ver gerencia.exportaciones).
+    """
+    if getattr(request.user, 'rol', '').lower() != 'gerencia':
+        return redirect('garzon:garzon_home')
+    if nombre not in EXPORTACIONES:
+        raise Http404
+    
+    fecha_inicio, fecha_fin = rango_solicitado(request)
+    encabezados, datos = filas(nombre, fecha_inicio, fecha_fin)
+    
+    if request.GET.get('formato') == 'ndjson':
+        lineas, content_type, extension = lineas_ndjson(encabezados, datos), 'application/x-ndjson', 'ndjson'
+    else:
+        lineas, content_type, extension = lineas_csv(encabezados, datos), 'text/csv; charset=utf-8', 'csv'
+    # Bajo ASGI un generador sincrónico se acumularía completo antes de enviarse
+    if isinstance(request, ASGIRequest):
+        lineas = en_bloques(lineas)
+    response = StreamingHttpResponse(lineas, content_type=content_type)
+    
+    response['Content-Disposition'] = f'attachment; filename="{nombre}_{fecha_inicio}_{fecha_fin}.{extension}"'
+    # Evita que un proxy (nginx) acumule la respuesta completa antes de enviarla
+    response['X-Accel-Buffering'] = 'no'
+    return response
\ No newline at end of file
@@ -0,0 +1,46 @@
+"""
+Backend de autenticación con el usuario en caché.
+
+AuthenticationMiddleware carga el usuario de la sesión en cada petición
+(p. ej. el sondeo de cocina cada pocos segundos). Este backend guarda el
+Usuario en la caché y solo consulta la base de datos cuando no está; junto
+con las sesiones cached_db, una petición autenticada no hace consultas
+antes de llegar a la vista.
+
+La copia se invalida al guardar o borrar el usuario (login.signals): activar,
+cambiar el rol o la contraseña se ve en la petición siguiente. Los cambios
+con queryset.update() no pasan por save(); para esos queda la duración de
+la copia.
+"""
+from django.contrib.auth.backends import ModelBackend
+from django.core.cache import cache
+
+DURACION_USUARIO = 300  # segundos
+
+
+def clave_usuario(user_id):
+    return f'login:usuario:{user_id}'
+
+
+def invalidar_usuario(user_id):
+    cache.delete(clave_usuario(user_id))
+
+
+class UsuarioEnCacheBackend(ModelBackend):
+    def get_user(self, user_id):
+        usuario = cache.get(clave_usuario(user_id))
+        if usuario is None:
+            usuario = super().get_user(user_id)
+            if usuario is None:
+                return None
+            cache.set(clave_usuario(user_id), usuario, timeout=DURACION_USUARIO)
+        return usuario if self.user_can_authenticate(usuario) else None
+
+    async def aget_user(self, user_id):
+        usuario = await cache.aget(clave_usuario(user_id))
+        if usuario is None:
+            usuario = await super().aget_user(user_id)
+            if usuario is None:
+                return None
+            await cache.aset(clave_usuario(user_id), usuario, timeout=DURACION_USUARIO)
+        return usuario if self.user_can_authenticate(usuario) else None
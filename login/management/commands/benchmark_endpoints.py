@@ -0,0 +1,164 @@
+import json
+import math
+import time
+from contextlib import ExitStack
+from datetime import timedelta
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, connections
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from garzon.models import Comanda
+
+User = get_user_model()
+
+
+def percentil(valores, p):
+    """
+    Percentil por rango más cercano sobre una lista ordenada
+    """
+    if not valores:
+        return 0.0
+    indice = max(math.ceil(p / 100 * len(valores)) - 1, 0)
+    return valores[indice]
+
+
+def endpoints():
+    """
+    Vistas críticas a medir: (nombre, url)
+    """
+    hoy = timezone.localdate()
+    rango = f'?fecha_inicio={hoy - timedelta(days=30)}&fecha_fin={hoy}'
+    comanda_id = Comanda.objects.order_by('-created_at').values_list('id', flat=True).first()
+    if comanda_id is None:
+        raise CommandError('No hay comandas; ejecute primero generar_datos')
+
+    return [
+        ('api_comandas_list', reverse('cocina:api_comandas_list')),
+        ('comanda_detail', reverse('garzon:garzon_comanda_detail', args=[comanda_id])),
+        ('panel_gerencia', reverse('gerencia:panel_gerencia')),
+        ('api_ventas', reverse('gerencia:api_ventas') + rango),
+        ('api_productos_mas_vendidos', reverse('gerencia:api_productos_mas_vendidos') + rango),
+        ('historial_precios', reverse('gerencia:historial_precios')),
+    ]
+
+
+def capturar_consultas(stack):
+    """
+    Captura las consultas de todas las bases (p. ej. la réplica 'reports'
+    de los reportes de gerencia), no solo las de 'default'
+    """
+    return [stack.enter_context(CaptureQueriesContext(connections[alias])) for alias in connections]
+
+
+class Command(BaseCommand):
+    help = "Mide latencia (p50/p95/p99) y consultas de las vistas críticas y compara con una línea base"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--repeticiones', type=int, default=50, help="Peticiones medidas por vista")
+        parser.add_argument('--calentamiento', type=int, default=3, help="Peticiones previas sin medir")
+        parser.add_argument('--salida', help="Archivo JSON donde guardar los resultados")
+        parser.add_argument('--baseline', help="Archivo JSON de una ejecución anterior para comparar")
+        parser.add_argument(
+            '--tolerancia', type=float, default=None,
+            help="Falla si el p95 de alguna vista empeora más que esta fracción (ej. 0.2) respecto al baseline"
+        )
+
+    def handle(self, *args, **options):
+        usuario = self.usuario_benchmark()
+        hosts = [h for h in settings.ALLOWED_HOSTS if h != '*' and not h.startswith('.')]
+        client = Client(HTTP_HOST=hosts[0] if hosts else 'localhost')
+        client.force_login(usuario)
+
+        resultados = {}
+        for nombre, url in endpoints():
+            for _ in range(options['calentamiento']):
+                client.get(url)
+
+            tiempos = []
+            consultas = []
+            estado = None
+            for _ in range(options['repeticiones']):
+                with ExitStack() as stack:
+                    capturadas = capturar_consultas(stack)
+                    inicio = time.perf_counter()
+                    respuesta = client.get(url)
+                    tiempos.append((time.perf_counter() - inicio) * 1000)
+                consultas.append(sum(len(base) for base in capturadas))
+                estado = respuesta.status_code
+
+            tiempos.sort()
+            resultados[nombre] = {
+                'url': url,
+                'estado_http': estado,
+                'p50_ms': round(percentil(tiempos, 50), 3),
+                'p95_ms': round(percentil(tiempos, 95), 3),
+                'p99_ms': round(percentil(tiempos, 99), 3),
+                'media_ms': round(sum(tiempos) / len(tiempos), 3),
+                'consultas': max(consultas),
+            }
+            r = resultados[nombre]
+            self.stdout.write(
+                f'{nombre:28} p50 {r["p50_ms"]:9.2f} ms  p95 {r["p95_ms"]:9.2f} ms  '
+                f'p99 {r["p99_ms"]:9.2f} ms  consultas {r["consultas"]:3}  HTTP {estado}'
+            )
+
+        informe = {
+            'fecha': timezone.now().isoformat(),
+            'repeticiones': options['repeticiones'],
+            'motor': connection.vendor,
+            'comandas': Comanda.objects.count(),
+            'resultados': resultados,
+        }
+        if options['salida']:
+            with open(options['salida'], 'w', encoding='utf-8') as archivo:
+                json.dump(informe, archivo, indent=2, ensure_ascii=False)
+            self.stdout.write(self.style.SUCCESS(f'Resultados guardados en {options["salida"]}'))
+
+        if options['baseline']:
+            self.comparar(resultados, options['baseline'], options['tolerancia'])
+
+    def usuario_benchmark(self):
+        """
+        Usuario de gerencia activo (ve todas las vistas); se crea si no existe
+        """
+        usuario = User.objects.filter(rol='gerencia', is_active=True).first()
+        if usuario is None:
+            usuario, _ = User.objects.get_or_create(
+                username='benchmark',
+                defaults={'nombre_completo': 'Benchmark', 'rol': 'gerencia', 'is_active': True}
+            )
+        return usuario
+
+    def comparar(self, resultados, ruta_baseline, tolerancia):
+        try:
+            with open(ruta_baseline, encoding='utf-8') as archivo:
+                baseline = json.load(archivo)['resultados']
+        except (OSError, ValueError, KeyError) as e:
+            raise CommandError(f'No se pudo leer el baseline: {e}')
+
+        self.stdout.write(f'\nComparación con {ruta_baseline}:')
+        peores = []
+        for nombre, actual in resultados.items():
+            base = baseline.get(nombre)
+            if not base:
+                self.stdout.write(f'{nombre:28} (sin baseline)')
+                continue
+            cambio = (actual['p95_ms'] - base['p95_ms']) / base['p95_ms'] if base['p95_ms'] else 0.0
+            linea = (
+                f'{nombre:28} p95 {base["p95_ms"]:9.2f} -> {actual["p95_ms"]:9.2f} ms ({cambio:+.0%})  '
+                f'consultas {base["consultas"]} -> {actual["consultas"]}'
+            )
+            if tolerancia is not None and cambio > tolerancia:
+                self.stdout.write(self.style.ERROR(linea))
+                peores.append(nombre)
+            else:
+                self.stdout.write(linea)
+
+        if peores:
+            raise CommandError(f'Vistas más lentas que el baseline: {", ".join(peores)}')
@@ -0,0 +1,193 @@
+import bisect
+import random
+from contextlib import contextmanager
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from garzon.models import Categoria, ClienteExterno, Comanda, ComandaItem, Producto
+from gerencia.models import HistorialPrecio
+
+User = get_user_model()
+
+CATEGORIAS = ['Desayunos', 'Entradas', 'Fondos', 'Postres', 'Bebidas', 'Snacks']
+
+# Peso relativo de cada hora del día (hora del hotel): desayuno, almuerzo y cena
+PESO_HORAS = [
+    0.2, 0.1, 0.1, 0.1, 0.1, 0.2, 0.5, 3, 4, 3, 1, 1,
+    3, 4, 3, 1, 1, 1, 2, 4, 4, 3, 1.5, 0.5,
+]
+
+# Mezcla de estados para comandas históricas
+PESO_ESTADOS = {'L': 85, 'A': 5, 'P': 10}
+
+
+@contextmanager
+def fechas_manuales(*modelos):
+    """
+    Desactiva auto_now/auto_now_add mientras se generan datos con fechas históricas
+    """
+    campos = []
+    for modelo in modelos:
+        for campo in modelo._meta.concrete_fields:
+            if getattr(campo, 'auto_now', False) or getattr(campo, 'auto_now_add', False):
+                campos.append((campo, campo.auto_now, campo.auto_now_add))
+                campo.auto_now = campo.auto_now_add = False
+    try:
+        yield
+    finally:
+        for campo, auto_now, auto_now_add in campos:
+            campo.auto_now, campo.auto_now_add = auto_now, auto_now_add
+
+
+class Command(BaseCommand):
+    help = "Genera un historial sintético del hotel (productos, precios, comandas e items) para pruebas de carga"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--comandas', type=int, default=10000, help="Cantidad de comandas a generar")
+        parser.add_argument('--dias', type=int, default=365, help="Días de historial hacia atrás")
+        parser.add_argument('--productos', type=int, default=12, help="Productos por categoría")
+        parser.add_argument('--cambios-precio', type=int, default=4, help="Cambios de precio por producto")
+        parser.add_argument('--en-cocina', type=int, default=15, help="Comandas abiertas en cocina ('E') al final")
+        parser.add_argument('--lote', type=int, default=5000, help="Tamaño de lote para bulk_create")
+        parser.add_argument('--semilla', type=int, default=None, help="Semilla aleatoria para datos reproducibles")
+
+    def handle(self, *args, **options):
+        self.rnd = random.Random(options['semilla'])
+        self.ahora = timezone.now()
+        self.inicio = self.ahora - timedelta(days=options['dias'])
+        self.usuarios = list(User.objects.filter(rol='garzon').values_list('id', flat=True)) or [None]
+        # Autor de los cambios de precio: sin él no habría historial de precios
+        self.gerente = User.objects.filter(rol='gerencia').first() or User.objects.first()
+        if self.gerente is None:
+            raise CommandError(
+                'No hay usuarios para registrar los cambios de precio; '
+                'ejecute primero: python manage.py create_initial_users'
+            )
+
+        with fechas_manuales(Producto, HistorialPrecio, ClienteExterno, Comanda, ComandaItem):
+            productos = self.generar_productos(options['productos'])
+            self.precios = self.generar_historial(productos, options['cambios_precio'])
+            self.generar_comandas(options['comandas'], options['en_cocina'], options['lote'])
+
+        self.stdout.write(self.style.SUCCESS(
+            'Datos generados. Para los reportes de gerencia ejecute: '
+            f'python manage.py refrescar_ventas --desde {timezone.localtime(self.inicio).date()}'
+        ))
+
+    def generar_productos(self, por_categoria):
+        productos = []
+        for nombre in CATEGORIAS:
+            categoria, _ = Categoria.objects.get_or_create(nombre=nombre)
+            existentes = categoria.productos.count()
+            nuevos = [
+                Producto(
+                    nombre=f'{nombre} {existentes + i + 1}',
+                    descripcion=f'Producto sintético de {nombre.lower()}',
+                    precio=self.rnd.randrange(2000, 25000, 100),
+                    categoria=categoria,
+                    activo=self.rnd.random() > 0.05,
+                    created_at=self.inicio
+                )
+                for i in range(max(por_categoria - existentes, 0))
+            ]
+            Producto.objects.bulk_create(nuevos)
+            productos.extend(categoria.productos.all())
+        self.stdout.write(f'Productos: {len(productos)}')
+        return productos
+
+    def generar_historial(self, productos, cambios):
+        """
+        Crea cambios de precio repartidos en el período y devuelve, por
+        producto, la línea de tiempo [(fecha, precio)] para valorizar items
+        """
+        lineas = {}
+        historial = []
+        for producto in productos:
+            fechas = sorted(
+                self.inicio + (self.ahora - self.inicio) * self.rnd.random()
+                for _ in range(cambios)
+            )
+            # Se reconstruye hacia atrás desde el precio actual
+            precios = [producto.precio]
+            for _ in fechas:
+                precios.insert(0, max(100, int(precios[0] * self.rnd.uniform(0.85, 1.05)) // 100 * 100))
+            for fecha, anterior, nuevo in zip(fechas, precios, precios[1:]):
+                historial.append(HistorialPrecio(
+                    producto=producto,
+                    precio_anterior=anterior,
+                    precio_nuevo=nuevo,
+                    razon_cambio='Ajuste sintético',
+                    usuario=self.gerente,
+                    fecha_cambio=fecha
+                ))
+            lineas[producto.id] = ([self.inicio] + fechas, precios)
+        HistorialPrecio.objects.bulk_create(historial, batch_size=5000)
+        self.stdout.write(f'Cambios de precio: {len(historial)}')
+        return lineas
+
+    def precio_en(self, producto_id, fecha):
+        fechas, precios = self.precios[producto_id]
+        return precios[max(bisect.bisect_right(fechas, fecha) - 1, 0)]
+
+    def fecha_aleatoria(self):
+        dias = (self.ahora - self.inicio).days
+        dia = timezone.localtime(self.inicio) + timedelta(days=self.rnd.randrange(max(dias, 1)))
+        hora = self.rnd.choices(range(24), weights=PESO_HORAS)[0]
+        fecha = dia.replace(hour=hora, minute=self.rnd.randrange(60), second=self.rnd.randrange(60))
+        return min(fecha, self.ahora)
+
+    def generar_comandas(self, total, en_cocina, lote):
+        producto_ids = list(self.precios)
+        estados = list(PESO_ESTADOS)
+        pesos = list(PESO_ESTADOS.values())
+        generadas = 0
+
+        while generadas < total:
+            cantidad = min(lote, total - generadas)
+            comandas = []
+            for i in range(cantidad):
+                abierta = total - (generadas + i) <= en_cocina
+                creada = self.ahora - timedelta(minutes=self.rnd.randrange(1, 40)) if abierta else self.fecha_aleatoria()
+                comandas.append(Comanda(
+                    estado='E' if abierta else self.rnd.choices(estados, weights=pesos)[0],
+                    created_by_id=self.rnd.choice(self.usuarios),
+                    created_at=creada,
+                    updated_at=creada + timedelta(minutes=self.rnd.randrange(5, 45)) if not abierta else creada,
+                ))
+
+            # 15% son clientes externos
+            externas = [c for c in comandas if self.rnd.random() < 0.15]
+            clientes = ClienteExterno.objects.bulk_create([
+                ClienteExterno(nombre=f'Cliente {self.rnd.randrange(1, 10 ** 6)}', created_at=c.created_at)
+                for c in externas
+            ])
+            for comanda, cliente in zip(externas, clientes):
+                comanda.cliente_externo = cliente
+            for comanda in comandas:
+                if comanda.cliente_externo is None:
+                    comanda.numero_habitacion = self.rnd.randint(1, 40)
+
+            items = []
+            for comanda in comandas:
+                for producto_id in self.rnd.sample(producto_ids, self.rnd.randint(1, min(5, len(producto_ids)))):
+                    item = ComandaItem(
+                        producto_id=producto_id,
+                        cantidad=self.rnd.choices([1, 2, 3], weights=[70, 22, 8])[0],
+                        precio_unitario=self.precio_en(producto_id, comanda.created_at),
+                        created_at=comanda.created_at
+                    )
+                    item.comanda = comanda
+                    items.append(item)
+                    comanda.total += item.subtotal()
+                    comanda.cantidad_items += item.cantidad
+
+            Comanda.objects.bulk_create(comandas)
+            for item in items:
+                item.comanda_id = item.comanda.id
+            ComandaItem.objects.bulk_create(items, batch_size=lote)
+
+            generadas += cantidad
+            self.stdout.write(f'Comandas: {generadas}/{total}')
@@ -0,0 +1,37 @@
+"""
+Sesiones iniciadas antes de UsuarioEnCacheBackend (login/backends.py).
+
+Django carga el usuario con el backend guardado en la sesión, así que una
+sesión iniciada con ModelBackend seguiría consultando la base de datos en
+cada petición hasta volver a iniciar sesión (las pantallas de cocina pasan
+semanas sin hacerlo). Este middleware cambia ese backend por el de caché la
+primera vez que ve la sesión; va entre SessionMiddleware y
+AuthenticationMiddleware.
+"""
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.contrib.auth import BACKEND_SESSION_KEY
+
+BACKEND_ANTERIOR = 'django.contrib.auth.backends.ModelBackend'
+BACKEND_ACTUAL = 'login.backends.UsuarioEnCacheBackend'
+
+
+class BackendDeSesionMiddleware:
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        if request.session.get(BACKEND_SESSION_KEY) == BACKEND_ANTERIOR:
+            request.session[BACKEND_SESSION_KEY] = BACKEND_ACTUAL
+        return self.get_response(request)
+
+    async def __acall__(self, request):
+        if await request.session.aget(BACKEND_SESSION_KEY) == BACKEND_ANTERIOR:
+            await request.session.aset(BACKEND_SESSION_KEY, BACKEND_ACTUAL)
+        return await self.get_response(request)
@@ -0,0 +1,12 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from .backends import invalidar_usuario
+from .models import Usuario
+
+
+@receiver([post_save, post_delete], sender=Usuario)
+def invalidar_usuario_al_cambiar(sender, instance, **kwargs):
+    """
+    Activación, cambio de rol o de contraseña: la próxima petición lee el usuario de la base de datos
+    """
+    invalidar_usuario(instance.pk)
@@ -0,0 +1,291 @@
+// --- static/cocina/js/home_cocina.js ---
+// URLs base sin parámetros (vienen de la plantilla) - los construiremos dinámicamente
+const API_LIST = window.COCINA_URLS.comandas;
+const API_MARCAR_BASE = window.COCINA_URLS.lista.replace('/0/lista/', '/');
+const API_ELIMINAR_BASE = window.COCINA_URLS.eliminar.replace('/0/eliminar/', '/');
+const API_TRANSICIONAR = window.COCINA_URLS.transicionar;
+
+// Funciones para construir URLs dinámicamente
+const API_MARCAR = (id) => `${API_MARCAR_BASE}${id}/lista/`;
+const API_ELIMINAR = (id) => `${API_ELIMINAR_BASE}${id}/eliminar/`;
+
+function getCookie(name) {
+    let cookieValue = null;
+    if (document.cookie && document.cookie !== '') {
+        const cookies = document.cookie.split(';');
+        for (let i = 0; i < cookies.length; i++) {
+            const cookie = cookies[i].trim();
+            if (cookie.substring(0, name.length + 1) === (name + '=')) {
+                cookieValue = decodeURIComponent(cookie.substring(name.length + 1));
+                break;
+            }
+        }
+    }
+    return cookieValue;
+}
+
+function formatTimeSince(iso) {
+    if (!iso) return '';
+    const then = new Date(iso);
+    const now = new Date();
+    let diff = Math.floor((now - then) / 1000); // segundos
+    const hours = Math.floor(diff / 3600);
+    diff -= hours * 3600;
+    const mins = Math.floor(diff / 60);
+    const secs = diff % 60;
+    if (hours > 0) return `${hours}h ${mins}m ${secs}s`;
+    if (mins > 0) return `${mins}m ${secs}s`;
+    return `${secs}s`;
+}
+
+function createCard(c) {
+    const div = document.createElement('div');
+    div.className = 'comanda-card';
+    div.dataset.id = c.id;
+    div.dataset.creado = c.confirmado_at;
+
+    // Cabecera
+    const header = document.createElement('div');
+    header.className = 'comanda-header';
+    header.innerHTML = `
+        <div class="num-orden">Orden #${c.id}</div>
+        <div class="timer" data-iso="${c.confirmado_at}">Tiempo: ${formatTimeSince(c.confirmado_at)}</div>
+    `;
+    div.appendChild(header);
+
+    // Items
+    const itemsDiv = document.createElement('div');
+    itemsDiv.className = 'items-list';
+    (c.items || []).forEach(it => {
+        const row = document.createElement('div');
+        row.className = 'item-row';
+        row.innerHTML = `
+            <div class="item-nombre">${it.nombre} <small style="font-weight:400;">${it.detalles ? '- ' + it.detalles : ''}</small></div>
+            <div class="item-cantidad">x${it.cantidad}</div>
+        `;
+        itemsDiv.appendChild(row);
+    });
+    div.appendChild(itemsDiv);
+
+    // NOTAS DE COCINA - AGREGADAS AQUÍ
+    if (c.notas_cocina && c.notas_cocina.trim() !== '') {
+        const notasDiv = document.createElement('div');
+        notasDiv.className = 'notas-cocina';
+        notasDiv.innerHTML = `<strong>Notas:</strong> ${c.notas_cocina}`;
+        div.appendChild(notasDiv);
+    }
+
+    // Habitación
+    const hab = document.createElement('div');
+    hab.className = 'habitacion';
+    hab.innerText = c.numero_habitacion ? `Habitación: ${c.numero_habitacion}` : 'Cliente externo';
+    div.appendChild(hab);
+
+    // Botones
+    const actions = document.createElement('div');
+    actions.className = 'card-actions';
+    const btnListo = document.createElement('button');
+    btnListo.className = 'btn-correcto';
+    btnListo.innerText = 'Listo';
+    btnListo.addEventListener('click', () => markListo(c.id));
+    const btnEliminar = document.createElement('button');
+    btnEliminar.className = 'btn-eliminar';
+    btnEliminar.innerText = 'Eliminar';
+    btnEliminar.addEventListener('click', () => eliminar(c.id));
+    actions.appendChild(btnListo);
+    actions.appendChild(btnEliminar);
+    div.appendChild(actions);
+
+    return div;
+}
+
+// Función para calcular si hay muchas tarjetas y ajustar el centrado
+function ajustarCentrado() {
+    const cont = document.getElementById('comandas-container');
+    if (!cont) return;
+    
+    const cards = cont.getElementsByClassName('comanda-card');
+    const containerWidth = cont.clientWidth;
+    const cardWidth = 350 + 20; // ancho de tarjeta + gap
+    const totalCardsWidth = cards.length * cardWidth;
+    
+    // Si el ancho total de las tarjetas es mayor que el contenedor, hay muchas tarjetas
+    if (totalCardsWidth > containerWidth) {
+        cont.classList.add('has-many-cards');
+        cont.classList.remove('centered');
+    } else {
+        cont.classList.remove('has-many-cards');
+        cont.classList.add('centered');
+    }
+}
+
+function actualizarVacio() {
+    const cont = document.getElementById('comandas-container');
+    const vacio = cont.getElementsByClassName('comanda-card').length === 0;
+    document.getElementById('empty').style.display = vacio ? '' : 'none';
+    document.getElementById('btn-todas-listas').style.display = vacio ? 'none' : '';
+    if (!vacio) setTimeout(ajustarCentrado, 100);
+}
+
+// Inserta o reemplaza la tarjeta de una comanda, manteniendo el orden por creación
+function upsertCard(c) {
+    const cont = document.getElementById('comandas-container');
+    const nueva = createCard(c);
+    const actual = cont.querySelector(`.comanda-card[data-id="${c.id}"]`);
+    if (actual) {
+        cont.replaceChild(nueva, actual);
+        return;
+    }
+    const siguiente = Array.from(cont.getElementsByClassName('comanda-card'))
+        .find(card => card.dataset.creado > c.confirmado_at);
+    cont.insertBefore(nueva, siguiente || null);
+}
+
+function quitarCard(id) {
+    const actual = document.querySelector(`#comandas-container .comanda-card[data-id="${id}"]`);
+    if (actual) actual.remove();
+}
+
+// Cursor del último estado recibido; con él el servidor solo envía los cambios
+let cursor = null;
+let ultimaSincronizacion = 0;
+const RESINCRONIZAR_MS = 5 * 60 * 1000;
+
+async function fetchComandas(completo = false) {
+    try {
+        if (Date.now() - ultimaSincronizacion > RESINCRONIZAR_MS) completo = true;
+        const url = (completo || cursor === null)
+            ? API_LIST
+            : `${API_LIST}?since=${encodeURIComponent(cursor)}`;
+        const resp = await fetch(url, { credentials: 'same-origin', cache: 'no-store' });
+        if (resp.status === 304) return;  // Sin cambios
+        const data = await resp.json();
+        if (!data.ok) return;
+        const cont = document.getElementById('comandas-container');
+        if (data.completo) {
+            cont.innerHTML = '';
+            (data.comandas || []).forEach(c => cont.appendChild(createCard(c)));
+            ultimaSincronizacion = Date.now();
+        } else {
+            (data.retiradas || []).forEach(quitarCard);
+            (data.comandas || []).forEach(upsertCard);
+        }
+        cursor = data.cursor;
+        actualizarVacio();
+    } catch (e) {
+        console.error('Error al obtener comandas', e);
+    }
+}
+
+// --- Actualizaciones en vivo por WebSocket; polling solo como respaldo ---
+const WS_URL = `${location.protocol === 'https:' ? 'wss' : 'ws'}://${location.host}/ws/cocina/`;
+let pollingTimer = null;
+let reintentoWs = 2000;
+
+function iniciarPolling() {
+    if (!pollingTimer) pollingTimer = setInterval(fetchComandas, 3000);
+}
+
+function detenerPolling() {
+    if (pollingTimer) {
+        clearInterval(pollingTimer);
+        pollingTimer = null;
+    }
+}
+
+function aplicarEvento(evento) {
+    if (evento.tipo === 'actualizada') {
+        upsertCard(evento.comanda);
+    } else if (evento.tipo === 'retirada') {
+        quitarCard(evento.id);
+    }
+    actualizarVacio();
+}
+
+function conectarSocket() {
+    if (!('WebSocket' in window)) return;
+    const socket = new WebSocket(WS_URL);
+    socket.onopen = () => {
+        reintentoWs = 2000;
+        detenerPolling();
+        // Resincronizar el tablero completo al (re)conectar
+        fetchComandas(true);
+    };
+    socket.onmessage = (e) => aplicarEvento(JSON.parse(e.data));
+    socket.onclose = () => {
+        iniciarPolling();
+        setTimeout(conectarSocket, reintentoWs);
+        reintentoWs = Math.min(reintentoWs * 2, 60000);
+    };
+}
+
+function tickTimers() {
+    document.querySelectorAll('.timer').forEach(el => {
+        const iso = el.dataset.iso;
+        el.innerText = 'Tiempo: ' + formatTimeSince(iso);
+    });
+}
+
+async function markListo(id) {
+    if (!confirm('¿Marcar comanda como LISTO?')) return;
+    const csrftoken = getCookie('csrftoken');
+    const resp = await fetch(API_MARCAR(id), {
+        method: 'POST',
+        headers: { 'X-CSRFToken': csrftoken, 'Content-Type': 'application/json' },
+        credentials: 'same-origin'
+    });
+    const data = await resp.json();
+    if (data.ok) {
+        quitarCard(id);
+        actualizarVacio();
+    }
+}
+
+async function eliminar(id) {
+    if (!confirm('¿Eliminar comanda? Esta acción no se puede deshacer.')) return;
+    const csrftoken = getCookie('csrftoken');
+    const resp = await fetch(API_ELIMINAR(id), {
+        method: 'POST',
+        headers: { 'X-CSRFToken': csrftoken, 'Content-Type': 'application/json' },
+        credentials: 'same-origin'
+    });
+    const data = await resp.json();
+    if (data.ok) {
+        quitarCard(id);
+        actualizarVacio();
+    }
+}
+
+// Marca listas todas las comandas en pantalla con una sola petición
+async function marcarTodasListas() {
+    const ids = Array.from(
+        document.querySelectorAll('#comandas-container .comanda-card'),
+        el => Number(el.dataset.id)
+    );
+    if (!ids.length) return;
+    if (!confirm(`¿Marcar ${ids.length} comandas como LISTAS?`)) return;
+    const csrftoken = getCookie('csrftoken');
+    const resp = await fetch(API_TRANSICIONAR, {
+        method: 'POST',
+        headers: { 'X-CSRFToken': csrftoken, 'Content-Type': 'application/json' },
+        credentials: 'same-origin',
+        body: JSON.stringify({ ids, estado: 'L' })
+    });
+    const data = await resp.json();
+    if (data.ok) {
+        // Las omitidas ya habían salido de cocina desde otra pantalla
+        ids.forEach(quitarCard);
+        actualizarVacio();
+    }
+}
+
+document.getElementById('btn-todas-listas').addEventListener('click', marcarTodasListas);
+
+// Cargar y actualizar automáticamente
+fetchComandas(true);
+iniciarPolling();
+conectarSocket();
+setInterval(tickTimers, 1000);
+
+// Ajustar centrado cuando cambia el tamaño de la ventana
+window.addEventListener('resize', ajustarCentrado);
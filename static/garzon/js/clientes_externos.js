@@ -1,8 +1,28 @@
+// "Hace X" a partir de una fecha ISO
+function tiempoRelativo(iso) {
+    const minutos = Math.floor((Date.now() - new Date(iso).getTime()) / 60000);
+    if (minutos < 1) return "Hace unos segundos";
+    if (minutos < 60) return `Hace ${minutos} min`;
+    const horas = Math.floor(minutos / 60);
+    if (horas < 24) return `Hace ${horas} h`;
+    const dias = Math.floor(horas / 24);
+    return dias === 1 ? "Hace 1 día" : `Hace ${dias} días`;
+}
+
+function actualizarTiempos() {
+    document.querySelectorAll(".cliente-card .fecha[data-creado]").forEach((p) => {
+        p.textContent = tiempoRelativo(p.dataset.creado);
+    });
+}
+
 document.addEventListener("DOMContentLoaded", () => {
     const list = document.getElementById("clientes-list");
     const input = document.getElementById("nombre-cliente");
     const btnAdd = document.getElementById("add-cliente-btn");
 
+    actualizarTiempos();
+    setInterval(actualizarTiempos, 60000);
+
     // Clic en card → ir a su comanda
     list.addEventListener("click", (e) => {
         const card = e.target.closest(".cliente-card");
@@ -36,7 +56,7 @@ document.addEventListener("DOMContentLoaded", () => {
                     nuevo.innerHTML = `
                         <div class="cliente-info">
                             <h3>${res.nombre}</h3>
-                            <p class="fecha">Hace unos segundos</p>
+                            <p class="fecha" data-creado="${new Date().toISOString()}">Hace unos segundos</p>
                         </div>
                         <img src="/static/img/ejemplo.png" class="cliente-img" alt="Cliente">
                     `;
@@ -0,0 +1,109 @@
+// --- static/garzon/js/cola_envios.js ---
+// Cola de envíos del garzón para WiFi inestable. Cada envío lleva una clave
+// de idempotencia: si el servidor ya lo aplicó, un reintento no lo repite.
+// Lo que no llega por falta de red queda en localStorage y se manda todo
+// junto (garzon:garzon_sincronizar_envios) al recuperar la conexión.
+const ColaEnvios = (() => {
+    const CLAVE_COLA = 'garzon:cola_envios';
+    const URL_SINCRONIZAR = '/garzon/sincronizar/';
+    const MAX_POR_PETICION = 50;  // MAX_ENVIOS_LOTE en garzon/views.py
+    let sincronizando = false;
+
+    function nuevaClave() {
+        if (window.crypto && crypto.randomUUID) return crypto.randomUUID();
+        return `${Date.now().toString(36)}-${Math.random().toString(36).slice(2)}`;
+    }
+
+    function csrf() {
+        const cookie = document.cookie.split(';').map(c => c.trim())
+            .find(c => c.startsWith('csrftoken='));
+        return cookie ? decodeURIComponent(cookie.slice('csrftoken='.length)) : window.CSRF_TOKEN;
+    }
+
+    function pendientes() {
+        try {
+            return JSON.parse(localStorage.getItem(CLAVE_COLA) || '[]');
+        } catch (e) {
+            return [];
+        }
+    }
+
+    function guardar(cola) {
+        try {
+            localStorage.setItem(CLAVE_COLA, JSON.stringify(cola));
+        } catch (e) {
+            // Sin localStorage el envío se pierde: se avisa al garzón en enviar()
+            return false;
+        }
+        return true;
+    }
+
+    function encolar(envio) {
+        const cola = pendientes().filter(e => e.clave !== envio.clave);
+        cola.push(envio);
+        return guardar(cola);
+    }
+
+    // Envía de inmediato; si no hay red (o el servidor no responde) queda en cola.
+    // Devuelve {ok, encolado, respuesta}
+    async function enviar(url, envio) {
+        const { clave, operacion, comanda, ...datos } = envio;
+        try {
+            const resp = await fetch(url, {
+                method: 'POST',
+                headers: {
+                    'Content-Type': 'application/json',
+                    'X-CSRFToken': csrf(),
+                    'Idempotency-Key': clave,
+                },
+                credentials: 'same-origin',
+                body: JSON.stringify(datos),
+            });
+            if (resp.status < 500) {
+                const respuesta = await resp.json();
+                return { ok: resp.ok && respuesta.ok, encolado: false, respuesta };
+            }
+        } catch (e) {
+            // Sin conexión: se reintenta desde la cola
+        }
+        return { ok: false, encolado: encolar(envio), respuesta: null };
+    }
+
+    // Manda los envíos en cola en una sola petición (por tandas de MAX_POR_PETICION)
+    async function sincronizar() {
+        if (sincronizando || !navigator.onLine) return;
+        sincronizando = true;
+        try {
+            let cola = pendientes();
+            while (cola.length) {
+                const tanda = cola.slice(0, MAX_POR_PETICION);
+                const resp = await fetch(URL_SINCRONIZAR, {
+                    method: 'POST',
+                    headers: { 'Content-Type': 'application/json', 'X-CSRFToken': csrf() },
+                    credentials: 'same-origin',
+                    body: JSON.stringify({ envios: tanda }),
+                });
+                if (!resp.ok) break;
+                const data = await resp.json();
+                // Quedan en cola solo los que fallaron en el servidor (5xx);
+                // los rechazados (4xx) no se van a aplicar nunca
+                const resueltas = new Set(
+                    data.resultados.filter(r => r.status < 500).map(r => r.clave)
+                );
+                if (!resueltas.size) break;
+                cola = pendientes().filter(e => !resueltas.has(e.clave));
+                guardar(cola);
+            }
+        } catch (e) {
+            // Se vuelve a intentar en el próximo evento 'online' o intervalo
+        } finally {
+            sincronizando = false;
+        }
+    }
+
+    window.addEventListener('online', sincronizar);
+    document.addEventListener('DOMContentLoaded', sincronizar);
+    setInterval(() => { if (pendientes().length) sincronizar(); }, 30000);
+
+    return { nuevaClave, enviar, sincronizar, pendientes };
+})();
@@ -1,10 +1,10 @@
 // --- static/garzon/js/comanda_detail.js ---
-document.addEventListener("DOMContentLoaded", () => {
-    const MENU = window.MENU || {};
+document.addEventListener("DOMContentLoaded", async () => {
+    let MENU = {};
     const comandaId = window.COMANDA_ID;
     const csrf = window.CSRF_TOKEN;
 
-    const tabs = document.querySelectorAll('.tab-btn');
+    const tabsDiv = document.getElementById('tabs');
     const itemsList = document.getElementById('items-list');
     const totalDisplay = document.getElementById('total-display');
     const modal = document.getElementById('modal');
@@ -12,6 +12,26 @@ document.addEventListener("DOMContentLoaded", () => {
 
     let cart = {}; // id -> {id, nombre, precio, cantidad, ...}
 
+    // --- Menú: copia local mientras el hash no cambie ---
+    const CLAVE_MENU = 'garzon:menu';
+
+    async function cargarMenu() {
+        try {
+            const guardado = JSON.parse(localStorage.getItem(CLAVE_MENU) || 'null');
+            if (guardado && guardado.hash === window.MENU_HASH) return guardado.menu;
+        } catch (e) {
+            // localStorage no disponible o dañado: se descarga de nuevo
+        }
+        const resp = await fetch(window.MENU_URL, { credentials: 'same-origin' });
+        const data = await resp.json();
+        try {
+            localStorage.setItem(CLAVE_MENU, JSON.stringify(data));
+        } catch (e) {
+            // Sin espacio en localStorage: queda la caché HTTP
+        }
+        return data.menu;
+    }
+
     // --- Formato de dinero ---
     const formatMoney = (num) =>
         `$${num.toLocaleString('es-CL')}`;
@@ -141,26 +161,46 @@ document.addEventListener("DOMContentLoaded", () => {
 
     document.getElementById('cancel-send').addEventListener('click', () => modal.style.display = 'none');
 
-    document.getElementById('confirm-send').addEventListener('click', () => {
-    const notas = document.getElementById("notas-cocina").value;
-
-    const payload = {
-        items: Object.values(cart),
-        notas_cocina: notas
-    };
-    
-    fetch(`/garzon/comanda/${comandaId}/enviar/`, {  // ← URL corregida
-        method: 'POST',
-        headers: {'Content-Type':'application/json','X-CSRFToken': csrf},
-        body: JSON.stringify(payload)
-    }).then(r => r.json()).then(res => {
-        if (res.ok) {
-            window.location.href = res.redirect;  // Esto redirigirá a garzon_home
-        } else alert('Error al enviar comanda.');
+    // Clave del envío en curso: los reintentos del mismo envío la reutilizan
+    let claveEnvio = null;
+    const btnConfirmar = document.getElementById('confirm-send');
+
+    btnConfirmar.addEventListener('click', async () => {
+        const notas = document.getElementById("notas-cocina").value;
+        claveEnvio = claveEnvio || ColaEnvios.nuevaClave();
+
+        btnConfirmar.disabled = true;
+        const resultado = await ColaEnvios.enviar(`/garzon/comanda/${comandaId}/enviar/`, {
+            clave: claveEnvio,
+            operacion: 'enviar',
+            comanda: comandaId,
+            items: Object.values(cart),
+            notas_cocina: notas
+        });
+        btnConfirmar.disabled = false;
+
+        if (resultado.ok) {
+            window.location.href = resultado.respuesta.redirect;  // Esto redirigirá a garzon_home
+        } else if (resultado.encolado) {
+            alert('Sin conexión: la comanda se enviará a cocina al recuperar la red.');
+            window.location.href = '/garzon/';
+        } else {
+            // El servidor la rechazó: un nuevo intento es otro envío
+            claveEnvio = null;
+            alert((resultado.respuesta && resultado.respuesta.error) || 'Error al enviar comanda.');
+        }
     });
-});
 
     // --- Tabs ---
+    MENU = await cargarMenu();
+    Object.keys(MENU).forEach(cat => {
+        const tab = document.createElement('button');
+        tab.className = 'tab-btn';
+        tab.dataset.cat = cat;
+        tab.textContent = cat;
+        tabsDiv.appendChild(tab);
+    });
+    const tabs = tabsDiv.querySelectorAll('.tab-btn');
     tabs.forEach((tab, i) => {
         tab.addEventListener('click', () => {
             tabs.forEach(t => t.classList.remove('active'));
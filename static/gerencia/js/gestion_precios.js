@@ -0,0 +1,223 @@
+// --- static/gerencia/js/gestion_precios.js ---
+// Filtros
+document.getElementById('filtro-categoria').addEventListener('change', function() {
+    const categoriaSeleccionada = this.value;
+    const gruposCategoria = document.querySelectorAll('.categoria-group');
+    
+    gruposCategoria.forEach(grupo => {
+        if (categoriaSeleccionada === 'todas' || grupo.dataset.categoria === categoriaSeleccionada) {
+            grupo.style.display = 'block';
+        } else {
+            grupo.style.display = 'none';
+        }
+    });
+});
+
+// Búsqueda de productos
+document.getElementById('buscar-producto').addEventListener('input', function() {
+    const busqueda = this.value.toLowerCase();
+    const productos = document.querySelectorAll('.producto-item');
+    
+    productos.forEach(producto => {
+        const nombre = producto.dataset.nombre;
+        if (nombre.includes(busqueda)) {
+            producto.style.display = 'grid';
+        } else {
+            producto.style.display = 'none';
+        }
+    });
+});
+
+// Función para validar que sea un número entero
+function validarEntero(input) {
+    // Remover cualquier carácter que no sea número
+    input.value = input.value.replace(/[^0-9]/g, '');
+    
+    // Asegurar que sea al menos 1
+    if (input.value && parseInt(input.value) < 1) {
+        input.value = '1';
+    }
+}
+
+// Aplicar validación a todos los inputs de precio
+document.addEventListener('DOMContentLoaded', function() {
+    const inputsPrecio = document.querySelectorAll('input[type="number"].input-precio');
+    inputsPrecio.forEach(input => {
+        // Validar al cambiar el valor
+        input.addEventListener('input', function() {
+            validarEntero(this);
+        });
+        
+        // Validar al perder el foco
+        input.addEventListener('blur', function() {
+            validarEntero(this);
+        });
+        
+        // Prevenir entrada de decimales
+        input.addEventListener('keydown', function(e) {
+            // Permitir solo números, backspace, delete, tab, etc.
+            if (!/[\d]|Backspace|Delete|Tab|ArrowLeft|ArrowRight|ArrowUp|ArrowDown/.test(e.key)) {
+                e.preventDefault();
+            }
+        });
+    });
+});
+
+// Función para actualizar precio
+async function actualizarPrecio(productoId) {
+    const nuevoPrecioInput = document.getElementById(`nuevo-precio-${productoId}`);
+    const nuevoPrecio = nuevoPrecioInput.value;
+    const razon = document.getElementById(`razon-${productoId}`).value;
+    
+    // Validar que sea un número entero
+    if (!nuevoPrecio || isNaN(nuevoPrecio) || !Number.isInteger(parseFloat(nuevoPrecio))) {
+        alert('Por favor ingrese un precio válido (número entero)');
+        nuevoPrecioInput.focus();
+        return;
+    }
+    
+    const precioEntero = parseInt(nuevoPrecio);
+    
+    if (precioEntero < 1) {
+        alert('El precio debe ser al menos $1');
+        nuevoPrecioInput.focus();
+        return;
+    }
+    
+    if (!razon.trim()) {
+        alert('Por favor ingrese la razón del cambio de precio');
+        document.getElementById(`razon-${productoId}`).focus();
+        return;
+    }
+    
+    if (!confirm(`¿Está seguro de actualizar el precio a $${precioEntero.toLocaleString()}?`)) {
+        return;
+    }
+    
+    try {
+        const response = await fetch(`/gerencia/precios/actualizar/${productoId}/`, {
+            method: 'POST',
+            headers: {
+                'Content-Type': 'application/json',
+                'X-CSRFToken': window.CSRF_TOKEN
+            },
+            body: JSON.stringify({
+                'nuevo_precio': precioEntero,
+                'razon': razon
+            })
+        });
+        
+        const data = await response.json();
+        
+        if (data.ok) {
+            // Actualizar visualización del precio
+            document.getElementById(`precio-actual-${productoId}`).textContent = `$${data.precio_nuevo}`;
+            
+            // Mostrar mensaje de éxito
+            alert(`Precio actualizado exitosamente:\n${data.producto}: $${data.precio_anterior} → $${data.precio_nuevo}`);
+            
+            // Limpiar campos
+            document.getElementById(`razon-${productoId}`).value = '';
+        } else {
+            alert('Error al actualizar el precio: ' + data.error);
+        }
+    } catch (error) {
+        alert('Error de conexión: ' + error);
+    }
+}
+
+// --- Cambio masivo ---
+function productosDeCategoria(checkCategoria) {
+    return checkCategoria.closest('.categoria-group').querySelectorAll('.seleccion-producto');
+}
+
+function actualizarResumenSeleccion() {
+    const categorias = document.querySelectorAll('.seleccion-categoria:checked');
+    const productos = new Set();
+    document.querySelectorAll('.seleccion-producto:checked').forEach(c => productos.add(c.value));
+    const texto = productos.size
+        ? `${productos.size} producto(s) seleccionado(s)` +
+          (categorias.length ? `, ${categorias.length} categoría(s) completa(s)` : '')
+        : 'Marque productos o categorías completas en la lista.';
+    document.getElementById('resumen-seleccion').textContent = texto;
+}
+
+// Marcar una categoría incluye todos sus productos (también los que se agreguen después)
+document.querySelectorAll('.seleccion-categoria').forEach(check => {
+    check.addEventListener('change', function() {
+        productosDeCategoria(this).forEach(p => {
+            p.checked = this.checked;
+            p.disabled = this.checked;
+        });
+        actualizarResumenSeleccion();
+    });
+});
+document.querySelectorAll('.seleccion-producto').forEach(check => {
+    check.addEventListener('change', actualizarResumenSeleccion);
+});
+
+async function aplicarCambioMasivo() {
+    const categorias = Array.from(document.querySelectorAll('.seleccion-categoria:checked'), c => Number(c.value));
+    const productos = Array.from(
+        document.querySelectorAll('.seleccion-producto:checked:not(:disabled)'), c => Number(c.value)
+    );
+    const modo = document.getElementById('masivo-modo').value;
+    const valor = parseFloat(document.getElementById('masivo-valor').value);
+    const redondeo = parseInt(document.getElementById('masivo-redondeo').value);
+    const razon = document.getElementById('masivo-razon').value;
+
+    if (!productos.length && !categorias.length) {
+        alert('Seleccione productos o categorías');
+        return;
+    }
+    if (isNaN(valor) || valor === 0) {
+        alert('Ingrese el valor del ajuste');
+        document.getElementById('masivo-valor').focus();
+        return;
+    }
+    if (!razon.trim()) {
+        alert('Por favor ingrese la razón del cambio de precio');
+        document.getElementById('masivo-razon').focus();
+        return;
+    }
+    const ajuste = modo === 'porcentaje' ? `${valor > 0 ? '+' : ''}${valor}%` : `${valor > 0 ? '+' : '-'}$${Math.abs(valor).toLocaleString()}`;
+    if (!confirm(`¿Aplicar ${ajuste} a la selección?`)) return;
+
+    try {
+        const response = await fetch(window.URL_PRECIOS_MASIVO, {
+            method: 'POST',
+            headers: {
+                'Content-Type': 'application/json',
+                'X-CSRFToken': window.CSRF_TOKEN
+            },
+            body: JSON.stringify({ productos, categorias, modo, valor, redondeo, razon })
+        });
+        const data = await response.json();
+
+        if (data.ok) {
+            data.cambiados.forEach(c => {
+                document.getElementById(`precio-actual-${c.id}`).textContent = `$${c.precio_nuevo}`;
+                document.getElementById(`nuevo-precio-${c.id}`).value = c.precio_nuevo;
+            });
+            document.querySelectorAll('.seleccion-categoria, .seleccion-producto').forEach(c => {
+                c.checked = false;
+                c.disabled = false;
+            });
+            actualizarResumenSeleccion();
+            alert(`Precios actualizados: ${data.cambiados.length} producto(s)`);
+        } else {
+            alert('Error al actualizar los precios: ' + data.error);
+        }
+    } catch (error) {
+        alert('Error de conexión: ' + error);
+    }
+}
+
+document.getElementById('masivo-aplicar').addEventListener('click', aplicarCambioMasivo);
+
+// Enter para buscar
+document.getElementById('buscar-producto').addEventListener('keypress', function(e) {
+    if (e.key === 'Enter') {
+        this.dispatchEvent(new Event('input'));
+    }
+});
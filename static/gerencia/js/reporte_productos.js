@@ -0,0 +1,184 @@
+// --- static/gerencia/js/reporte_productos.js ---
+let graficoProductos = null;
+
+// Función para cargar productos más vendidos
+async function cargarProductosMasVendidos() {
+    const categoriaId = document.getElementById('categoria_id').value;
+    const fechaInicio = document.getElementById('fecha_inicio_productos').value;
+    const fechaFin = document.getElementById('fecha_fin_productos').value;
+    
+    if (!fechaInicio || !fechaFin) {
+        alert('Por favor seleccione ambas fechas');
+        return;
+    }
+    
+    try {
+        let url = `/gerencia/api/productos-mas-vendidos/?fecha_inicio=${fechaInicio}&fecha_fin=${fechaFin}`;
+        if (categoriaId !== 'todas') {
+            url += `&categoria_id=${categoriaId}`;
+        }
+        
+        const response = await fetch(url);
+        const data = await response.json();
+        
+        // Actualizar gráfico
+        actualizarGraficoProductos(data.datos);
+        
+        // Actualizar ranking
+        actualizarRanking(data.datos);
+        
+    } catch (error) {
+        console.error('Error:', error);
+        alert('Error al cargar los datos');
+    }
+}
+
+// Función para actualizar el gráfico de productos
+function actualizarGraficoProductos(datos) {
+    const ctx = document.getElementById('graficoProductos').getContext('2d');
+    
+    // Destruir gráfico anterior si existe
+    if (graficoProductos) {
+        graficoProductos.destroy();
+    }
+    
+    // Tomar solo los primeros 10 productos para el gráfico
+    const datosGrafico = datos.slice(0, 10);
+    const labels = datosGrafico.map(item => item.producto);
+    const cantidades = datosGrafico.map(item => item.cantidad);
+    
+    graficoProductos = new Chart(ctx, {
+        type: 'bar',
+        data: {
+            labels: labels,
+            datasets: [{
+                label: 'Unidades Vendidas',
+                data: cantidades,
+                backgroundColor: [
+                    '#0b8a3e', '#28a745', '#20c997', '#17a2b8', 
+                    '#6f42c1', '#e83e8c', '#fd7e14', '#ffc107',
+                    '#6610f2', '#d63384'
+                ],
+                borderWidth: 1
+            }]
+        },
+        options: {
+            responsive: true,
+            maintainAspectRatio: false,
+            plugins: {
+                title: {
+                    display: true,
+                    text: 'Top 10 Productos Más Vendidos'
+                },
+                legend: {
+                    display: false
+                }
+            },
+            scales: {
+                y: {
+                    beginAtZero: true,
+                    title: {
+                        display: true,
+                        text: 'Unidades Vendidas'
+                    },
+                    // Configuración para mostrar números enteros en el eje Y
+                    ticks: {
+                        callback: function(value) {
+                            if (value % 1 === 0) {
+                                return value;
+                            }
+                        },
+                        stepSize: 1
+                    }
+                },
+                x: {
+                    title: {
+                        display: true,
+                        text: 'Productos'
+                    }
+                }
+            }
+        }
+    });
+}
+
+// Función para actualizar el ranking
+function actualizarRanking(datos) {
+    const rankingContainer = document.getElementById('ranking-productos');
+    
+    if (datos.length === 0) {
+        rankingContainer.innerHTML = '<div style="text-align: center; color: #666; padding: 40px;">No hay datos de ventas para el período seleccionado</div>';
+        return;
+    }
+    
+    let html = '';
+    let totalUnidades = 0;
+    let totalIngresos = 0;
+    
+    datos.forEach((item, index) => {
+        totalUnidades += item.cantidad;
+        totalIngresos += item.ingresos;
+        
+        const top3 = index < 3;
+        
+        html += `
+            <div class="ranking-item" style="${top3 ? 'background: linear-gradient(135deg, #fff3cd, #ffffff); border-left: 4px solid #ffc107;' : ''}">
+                <div class="ranking-posicion" style="${top3 ? 'color: #ffc107; font-size: 1.8rem;' : ''}">
+                    ${index + 1}
+                </div>
+                <div class="ranking-info">
+                    <h4 style="margin: 0 0 5px 0; ${top3 ? 'color: #856404;' : 'color: #2c3e50;'}">
+                        ${item.producto}
+                        ${top3 ? '' : ''}
+                    </h4>
+                    <p style="margin: 0; color: #666; font-size: 0.9rem;">
+                        Categoría: ${item.categoria}
+                    </p>
+                </div>
+                <div class="ranking-stats">
+                    <div style="font-size: 1.3rem; font-weight: bold; color: #0b8a3e;">
+                        ${item.cantidad} unidades
+                    </div>
+                    <div style="color: #666; font-size: 0.9rem;">
+                        $${item.ingresos.toLocaleString()}
+                    </div>
+                </div>
+            </div>
+        `;
+    });
+    
+    // Resumen
+    html += `
+        <div style="margin-top: 25px; padding: 20px; background: #f8f9fa; border-radius: 8px;">
+            <div style="display: grid; grid-template-columns: repeat(auto-fit, minmax(200px, 1fr)); gap: 15px; text-align: center;">
+                <div>
+                    <div style="font-size: 1.1rem; font-weight: bold; color: #2c3e50;">Total Unidades</div>
+                    <div style="font-size: 1.5rem; color: #0b8a3e; font-weight: bold;">${totalUnidades}</div>
+                </div>
+                <div>
+                    <div style="font-size: 1.1rem; font-weight: bold; color: #2c3e50;">Total Ingresos</div>
+                    <div style="font-size: 1.5rem; color: #0b8a3e; font-weight: bold;">$${totalIngresos.toLocaleString()}</div>
+                </div>
+                <div>
+                    <div style="font-size: 1.1rem; font-weight: bold; color: #2c3e50;">Productos en Ranking</div>
+                    <div style="font-size: 1.5rem; color: #0b8a3e; font-weight: bold;">${datos.length}</div>
+                </div>
+            </div>
+        </div>
+    `;
+    
+    rankingContainer.innerHTML = html;
+}
+
+// Cargar datos al iniciar (últimos 30 días)
+window.addEventListener('load', function() {
+    const fechaFin = new Date();
+    const fechaInicio = new Date();
+    fechaInicio.setDate(fechaInicio.getDate() - 30);
+    
+    document.getElementById('fecha_inicio_productos').value = fechaInicio.toISOString().split('T')[0];
+    document.getElementById('fecha_fin_productos').value = fechaFin.toISOString().split('T')[0];
+    
+    // Cargar datos iniciales
+    setTimeout(() => cargarProductosMasVendidos(), 500);
+});
@@ -0,0 +1,179 @@
+// --- static/gerencia/js/reporte_ventas.js ---
+let graficoVentas = null;
+
+// Función para cargar datos de ventas
+async function cargarDatosVentas() {
+    const fechaInicio = document.getElementById('fecha_inicio').value;
+    const fechaFin = document.getElementById('fecha_fin').value;
+    const agrupacion = document.getElementById('agrupacion').value;
+    
+    if (!fechaInicio || !fechaFin) {
+        alert('Por favor seleccione ambas fechas');
+        return;
+    }
+    
+    try {
+        const response = await fetch(`/gerencia/api/ventas/?fecha_inicio=${fechaInicio}&fecha_fin=${fechaFin}&agrupacion=${agrupacion}`);
+        const data = await response.json();
+        
+        if (!response.ok) {
+            alert(data.error || 'Error al cargar los datos');
+            return;
+        }
+        
+        // El servidor puede usar una agrupación más gruesa si el rango es muy amplio
+        document.getElementById('agrupacion').value = data.agrupacion;
+        
+        // Actualizar gráfico
+        actualizarGrafico(data.datos);
+        
+        // Actualizar tabla
+        actualizarTabla(data.datos, data.agrupacion);
+        
+    } catch (error) {
+        console.error('Error:', error);
+        alert('Error al cargar los datos');
+    }
+}
+
+// Descarga los datos crudos del rango seleccionado
+function exportar(nombre) {
+    const fechaInicio = document.getElementById('fecha_inicio').value;
+    const fechaFin = document.getElementById('fecha_fin').value;
+    window.location.href = `/gerencia/exportar/${nombre}/?fecha_inicio=${fechaInicio}&fecha_fin=${fechaFin}`;
+}
+
+// Función para actualizar el gráfico
+function actualizarGrafico(datos) {
+    const ctx = document.getElementById('graficoVentas').getContext('2d');
+    
+    // Destruir gráfico anterior si existe
+    if (graficoVentas) {
+        graficoVentas.destroy();
+    }
+    
+    const labels = datos.map(item => item.fecha);
+    const ventas = datos.map(item => item.ventas);
+    
+    graficoVentas = new Chart(ctx, {
+        type: 'line',
+        data: {
+            labels: labels,
+            datasets: [{
+                label: 'Número de Ventas',
+                data: ventas,
+                borderColor: '#0b8a3e',
+                backgroundColor: 'rgba(11, 138, 62, 0.1)',
+                borderWidth: 3,
+                fill: true,
+                tension: 0.4
+            }]
+        },
+        options: {
+            responsive: true,
+            maintainAspectRatio: false,
+            plugins: {
+                title: {
+                    display: true,
+                    text: 'Evolución de Ventas'
+                }
+            },
+            scales: {
+                y: {
+                    beginAtZero: true,
+                    title: {
+                        display: true,
+                        text: 'Número de Ventas'
+                    },
+                    ticks: {
+                        callback: function(value) {
+                            if (Number.isInteger(value)) {
+                                return value;
+                            }
+                        },
+                        stepSize: 1
+                    }
+                },
+                x: {
+                    title: {
+                        display: true,
+                        text: 'Fechas'
+                    }
+                }
+            }
+        }
+    });
+}
+
+// Función para actualizar la tabla
+function actualizarTabla(datos, agrupacion) {
+    const tablaContainer = document.getElementById('tabla-datos');
+    
+    if (datos.length === 0) {
+        tablaContainer.innerHTML = '<div style="text-align: center; color: #666; padding: 40px;">No hay datos para el período seleccionado</div>';
+        return;
+    }
+    
+    let html = `
+        <table class="tabla-gerencia">
+            <thead>
+                <tr>
+                    <th>Fecha</th>
+                    <th>Ventas</th>
+                    <th>Unidades</th>
+                    <th>Ingresos</th>
+                </tr>
+            </thead>
+            <tbody>
+    `;
+    
+    let totalVentas = 0;
+    let totalUnidades = 0;
+    let totalIngresos = 0;
+    
+    datos.forEach(item => {
+        totalVentas += item.ventas;
+        totalUnidades += item.unidades;
+        totalIngresos += item.ingresos;
+        html += `
+            <tr>
+                <td>${item.periodo || item.fecha}</td>
+                <td><strong>${item.ventas}</strong></td>
+                <td>${item.unidades}</td>
+                <td>$${item.ingresos.toLocaleString('es-CL')}</td>
+            </tr>
+        `;
+    });
+    
+    html += `
+            </tbody>
+            <tfoot>
+                <tr style="background: #f8f9fa; font-weight: bold;">
+                    <td>TOTAL</td>
+                    <td>${totalVentas}</td>
+                    <td>${totalUnidades}</td>
+                    <td>$${totalIngresos.toLocaleString('es-CL')}</td>
+                </tr>
+            </tfoot>
+        </table>
+        
+        <div style="margin-top: 20px; color: #666;">
+            Mostrando ${datos.length} períodos (${agrupacion}) - Total de ventas: ${totalVentas}
+        </div>
+    `;
+    
+    tablaContainer.innerHTML = html;
+}
+
+// Cargar datos al iniciar (últimos 30 días)
+window.addEventListener('load', function() {
+    const fechaFin = new Date();
+    const fechaInicio = new Date();
+    fechaInicio.setDate(fechaInicio.getDate() - 30);
+    
+    document.getElementById('fecha_inicio').value = fechaInicio.toISOString().split('T')[0];
+    document.getElementById('fecha_fin').value = fechaFin.toISOString().split('T')[0];
+    
+    // Cargar datos iniciales
+    setTimeout(() => cargarDatosVentas(), 500);
+});